@@ -182,3 +182,24 @@ INSERT INTO seats (seat_id, type, is_status, near_window, corner_seat, aisle_sea
                                                                                                                                  (97, 'free', true, false, false, true, false, false, false), (98, 'free', true, false, false, true, false, false, false),
                                                                                                                                  (99, 'free', true, false, false, true, false, false, false), (100, 'free', true, false, false, true, false, false, false);
 
+-- =============================================
+-- 카메라 서버 연동 테이블 (seat_usage 생성 후 실행, 백엔드 create_tables()로도 생성됨)
+-- =============================================
+-- 카메라 이벤트 수신 기록 : 재전송된 이벤트를 event_id로 한 번만 반영
+CREATE TABLE IF NOT EXISTS camera_event_receipts (
+    event_id VARCHAR(64) PRIMARY KEY, -- "usage_id:epoch:seq"
+    usage_id BIGINT REFERENCES seat_usage(usage_id) ON DELETE CASCADE,
+    received_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+-- 유실물 캡처 메타데이터 (파일은 captures/real/YYYY/MM/DD)
+CREATE TABLE IF NOT EXISTS captures (
+    capture_id BIGSERIAL PRIMARY KEY,
+    usage_id BIGINT REFERENCES seat_usage(usage_id) ON DELETE SET NULL,
+    seat_id BIGINT,
+    path VARCHAR(255) NOT NULL, -- 웹 경로(/captures/real/...)
+    size INT NOT NULL,
+    image_key VARCHAR(64), -- 카메라 서버의 이미지 내용 hash
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS ix_captures_usage_id ON captures (usage_id);
+CREATE INDEX IF NOT EXISTS ix_captures_created_at ON captures (created_at);
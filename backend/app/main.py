@@ -13,6 +13,7 @@ from routers.admin import admin
 from routers.ml import detect, statics
 from datetime import datetime
 from models import SeatUsage, Seat
+from utils.capture_store import capture_store
 from apscheduler.schedulers.background import BackgroundScheduler
 from zoneinfo import ZoneInfo # 시간대 처리
 
@@ -47,6 +48,10 @@ def auto_checkout_job():
             
             db.commit()
             print(" -> DB 업데이트 완료")
+
+            # 3. 카메라 서버에 해당 좌석 감지 종료 요청
+            for usage in expired_usages:
+                kiosk.trigger_camera_release(usage.seat_id, usage.usage_id)
             
     except Exception as e:
         print(f"[Scheduler Error] {e}")
@@ -66,6 +71,8 @@ async def lifespan(app: FastAPI):
     # 스케줄러 시작
     scheduler = BackgroundScheduler()
     scheduler.add_job(auto_checkout_job, 'interval', seconds=30)
+    # 유실물 캡처 보관 기간 / 용량 정리
+    scheduler.add_job(capture_store.compact, 'interval', hours=1, next_run_time=datetime.now())
     scheduler.start()
 
     model_manager.load_models()
@@ -208,4 +208,28 @@ class ScheduleEvent(Base):
     description_embedding = Column(Vector(768))
 
     member = relationship("Member", back_populates="schedule_events")
-    ai_chat_logs = relationship("AIChatLog", back_populates="schedule_events")
\ No newline at end of file
+    ai_chat_logs = relationship("AIChatLog", back_populates="schedule_events")
+
+# ----------------------------------------------------------------------------------------------------------------------
+# CAMERA EVENT RECEIPTS (카메라 서버 이벤트 중복 반영 방지)
+# ----------------------------------------------------------------------------------------------------------------------
+class CameraEventReceipt(Base):
+    __tablename__ = "camera_event_receipts"
+
+    event_id = Column(String(64), primary_key=True)   # "usage_id:epoch:seq"
+    usage_id = Column(BigInteger, ForeignKey("seat_usage.usage_id", ondelete="CASCADE"), nullable=True)
+    received_at = Column(DateTime, server_default=func.now())
+
+# ----------------------------------------------------------------------------------------------------------------------
+# CAPTURES (유실물 캡처 메타데이터, 파일은 captures/real/YYYY/MM/DD)
+# ----------------------------------------------------------------------------------------------------------------------
+class Capture(Base):
+    __tablename__ = "captures"
+
+    capture_id = Column(BigInteger, primary_key=True, autoincrement=True)
+    usage_id = Column(BigInteger, ForeignKey("seat_usage.usage_id", ondelete="SET NULL"), nullable=True, index=True)
+    seat_id = Column(BigInteger, nullable=True)
+    path = Column(String(255), nullable=False)        # 웹 경로(/captures/real/...)
+    size = Column(Integer, nullable=False)
+    image_key = Column(String(64), nullable=True)     # 카메라 서버의 이미지 내용 hash
+    created_at = Column(DateTime, server_default=func.now(), index=True)
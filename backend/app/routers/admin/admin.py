@@ -11,9 +11,10 @@ from models import Member, Order, Product, SeatUsage, TODO, UserTODO, Seat
 from schemas import (
     MemberLogin, DailySalesStat, TodoCreate, TodoUpdate, TodoResponse, 
     MemberAdminResponse, MemberUpdatePhone,
-    ProductCreate, ProductUpdate, ProductResponse
+    ProductCreate, ProductUpdate, ProductResponse, CaptureResponse
 )
 from utils.auth_utils import revoke_existing_token, revoke_existing_token_by_id, password_decode, set_token_cookies
+from utils.capture_store import capture_store
 
 router = APIRouter(prefix="/api/admin", tags=["Admin"])
 
@@ -730,4 +731,18 @@ def get_member_stats(db: Session = Depends(get_db)):
         "time_members": time_members,
         "current_users": current_users,
         "non_members": non_members
-    }
\ No newline at end of file
+    }
+
+# ----------------------------------------------------------------------------------------------------------------------
+# CAPTURES (유실물 캡처)
+# ----------------------------------------------------------------------------------------------------------------------
+"""
+[GET] 이용 건별 유실물 캡처 목록 (captures 테이블 인덱스 조회)
+Query Parameter: usage_id
+"""
+@router.get("/captures", response_model=List[CaptureResponse])
+def get_usage_captures(
+    usage_id: int = Query(..., description="조회할 이용 ID"),
+    db: Session = Depends(get_db)
+):
+    return capture_store.list_by_usage(db, usage_id)
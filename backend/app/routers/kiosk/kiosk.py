@@ -7,10 +7,10 @@ from schemas import PinAuthRequest
 from datetime import datetime, timedelta
 from typing import Optional
 from sqlalchemy import cast, Date, func, distinct
+import anyio
+import httpx
 import requests
-import time
-import base64
-import os
+from utils.capture_store import capture_store
 
 router = APIRouter(prefix="/api/kiosk")
 
@@ -18,25 +18,20 @@ router = APIRouter(prefix="/api/kiosk")
 # [설정] AI 카메라 서버 설정
 # ------------------------
 CAMERA_SERVER = "http://localhost:12454"
-CAPTURE_DIR = "captures/real"
-os.makedirs(CAPTURE_DIR, exist_ok=True)
+LOST_ITEM_WAIT = 5.0  # 유실물 검사 결과 대기(초), 카메라 서버가 결과가 나오는 즉시 응답(long-poll)
 
 # ------------------------
 # [Helper] 이미지 저장 함수
 # ------------------------
-def save_base64_image(image_base64: str, seat_id: int, usage_id: int):
-    if not image_base64:
+async def save_camera_image(client: httpx.AsyncClient, image_url: str, seat_id: int, usage_id: int, image_key: str = None):
+    """카메라 서버의 JPEG를 디코딩 없이 그대로 캡처 저장소에 저장(파일 쓰기는 스레드에서)"""
+    if not image_url:
         return None
-    
-    times = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"seat{seat_id}_usage{usage_id}_{times}.jpg"
-    file_path = os.path.join(CAPTURE_DIR, filename)
 
     try:
-        image_bytes = base64.b64decode(image_base64)
-        with open(file_path, "wb") as f:
-            f.write(image_bytes)
-        return f"/{CAPTURE_DIR}/{filename}" 
+        res = await client.get(f"{CAMERA_SERVER}{image_url}", timeout=5)
+        res.raise_for_status()
+        return await capture_store.save_async(res.content, seat_id, usage_id, image_key)
     except Exception as e:
         print(f"[Error] Image save failed: {e}")
         return None
@@ -44,39 +39,53 @@ def save_base64_image(image_base64: str, seat_id: int, usage_id: int):
 # ------------------------
 # [Helper] AI 예측 요청 함수 (퇴실용)
 # ------------------------
-def capture_predict(seat_id: int, usage_id: int):
+# 카메라 요청(long-poll)은 httpx.AsyncClient로 이벤트 루프에서 처리(sync 라우트는 anyio.from_thread.run으로 호출)
+async def capture_predict(seat_id: int, usage_id: int):
     try:
-        res = requests.post(
-            f"{CAMERA_SERVER}/camera/checkout",
-            json={"seat_id": seat_id, "usage_id": usage_id},
-            timeout=5
-        )
-        
-        if res.status_code not in (200, 202):
-            return False, None, [], "Camera Error"
-
-        job_id = res.json().get("job_id", usage_id)
-
-        for _ in range(10):
-            time.sleep(0.3)
-            res_poll = requests.get(f"{CAMERA_SERVER}/camera/lost-item/result/{job_id}", timeout=2)
-            
-            if res_poll.status_code != 200:
-                continue
-
-            result_data = res_poll.json().get("result", {})
-            
-            if result_data.get("done") is True:
-                items = result_data.get("items", [])
-                image_b64 = result_data.get("image_base64")
-                
-                if items:
-                    img_path = save_base64_image(image_b64, seat_id, usage_id)
-                    return True, img_path, items, "Detected"
-                else:
-                    return False, None, [], "Clean"
-        
-        return False, None, [], "Timeout"
+        async with httpx.AsyncClient(timeout=5) as client:
+            res = await client.post(
+                f"{CAMERA_SERVER}/camera/checkout",
+                json={"seat_id": seat_id, "usage_id": usage_id}
+            )
+
+            if res.status_code not in (200, 202):
+                return False, None, [], "Camera Error"
+
+            # 카메라 스트림이 끊겨 있으면 검사 없이 바로 반환
+            if res.json().get("camera_down"):
+                return False, None, [], "Camera Down"
+
+            job_id = res.json().get("job_id", usage_id)
+
+            res_poll = await client.get(
+                f"{CAMERA_SERVER}/camera/lost-item/result/{job_id}",
+                params={"wait": LOST_ITEM_WAIT},
+                timeout=LOST_ITEM_WAIT + 2
+            )
+
+            if res_poll.status_code == 200:
+                result_data = res_poll.json().get("result") or {}
+
+                if result_data.get("done") is True:
+                    if result_data.get("camera_down"):
+                        return False, None, [], "Camera Down"
+                    if result_data.get("detection_failed"):
+                        return False, None, [], "Detection Failed"
+
+                    items = result_data.get("items", [])
+                    image_url = result_data.get("image_url")
+
+                    if items:
+                        img_path = await save_camera_image(client, image_url, seat_id, usage_id,
+                                                           result_data.get("image_key"))
+                        # 감지는 되었지만 이미지를 받지 못함(인코딩 실패 / 저장 실패)
+                        if not img_path:
+                            return True, None, items, "Detected (No Image)"
+                        return True, img_path, items, "Detected"
+                    else:
+                        return False, None, [], "Clean"
+
+            return False, None, [], "Timeout"
 
     except Exception as e:
         return False, None, [], str(e)
@@ -94,6 +103,19 @@ def trigger_camera_checkin(seat_id: int, usage_id: int):
     except Exception as e:
         print(f"[Warning] Camera check-in request failed: {e}")
 
+# ------------------------
+# [Helper] AI 자동 퇴실 알림 요청 함수 (유실물 검사 없음)
+# ------------------------
+def trigger_camera_release(seat_id: int, usage_id: int):
+    try:
+        requests.post(
+            f"{CAMERA_SERVER}/camera/release",
+            json={"seat_id": seat_id, "usage_id": usage_id},
+            timeout=2
+        )
+    except Exception as e:
+        print(f"[Warning] Camera release request failed: {e}")
+
 # ------------------------
 # 전화번호 없이 비회원 조회 또는 생성
 # ------------------------
@@ -515,7 +537,8 @@ def check_out(
 
     if not force:
         try:
-            is_detected, img_path, classes, msg = capture_predict(seat_id, usage.usage_id)
+            # DB 작업은 스레드풀에서 그대로 하고 카메라 요청(long-poll)만 이벤트 루프에서 비동기로 처리
+            is_detected, img_path, classes, msg = anyio.from_thread.run(capture_predict, seat_id, usage.usage_id)
             if is_detected:
                 web_image_url = img_path.replace("\\", "/") if img_path else ""
 
@@ -4,11 +4,8 @@ from fastapi.responses import JSONResponse
 from fastapi.params import Body
 from sqlalchemy.sql import func
 from database import get_db
-from models import Member, Product, Order, Seat, SeatUsage
-import os
-import base64
-from datetime import datetime
-import asyncio
+from models import Member, Product, Order, Seat, SeatUsage, CameraEventReceipt
+from utils.capture_store import capture_store
 import httpx
 from pydantic import BaseModel
 
@@ -17,10 +14,8 @@ router = APIRouter(prefix="/ai", tags=["Detect services"])
 
 # 카메라서버
 CAMERA_SERVER = "http://localhost:12454"
-
-# 저장폴더
-CAPTURE_DIR = "captures/real"
-os.makedirs(CAPTURE_DIR, exist_ok=True)
+# 유실물 검사 결과 대기(초) : 카메라 서버가 결과가 나오는 즉시 응답(long-poll)
+LOST_ITEM_WAIT = 5.0
 
 
 class CheckTimePayload(BaseModel):
@@ -28,27 +23,29 @@ class CheckTimePayload(BaseModel):
     usage_id: int
     minutes: int
     event_type: str | None = None
-
-# 프레임 캡처 후 저장하는 함수
-def save_base64_image_and_get_path( image_base64 : str,
-                                    seat_id : int,
-                                    usage_id : int ) :
+    detected_at: str | None = None
+    event_id: str | None = None
+
+class CheckTimeBatchPayload(BaseModel):
+    events: list[CheckTimePayload]
+
+# 카메라 서버의 크롭 이미지를 받아서 저장하는 함수
+async def save_camera_image_and_get_path( client : httpx.AsyncClient,
+                                          image_url : str,
+                                          seat_id : int,
+                                          usage_id : int,
+                                          image_key : str = None ) :
     
     # 전달된 이미지 없으면 None 반환
-    if not image_base64 :
+    if not image_url :
         return None
-    
-    # 파일 명 구성
-    times = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"seat{seat_id}_usage{usage_id}_{times}.jpg"
-    file_path = os.path.join(CAPTURE_DIR, filename)
 
-    # base64 -> bytes -> 파일 저장
-    image_bytes = base64.b64decode(image_base64)
-    with open(file_path, "wb") as f :
-        f.write(image_bytes)
+    # JPEG 바이트를 디코딩 없이 그대로 저장(파일 쓰기 / 인덱스 기록은 스레드에서)
+    response = await client.get(f"{CAMERA_SERVER}{image_url}")
+    response.raise_for_status()
+    web_path = await capture_store.save_async(response.content, seat_id, usage_id, image_key)
 
-    return f'{CAPTURE_DIR}/{filename}'
+    return web_path.lstrip("/")
 
 
 @router.post("/checkin")
@@ -95,47 +92,69 @@ async def checkout_web_to_camera(request : Request,
                                              "message" : "camera server failed",
                                              "detail" : r.text})
 
+            # 카메라 스트림이 끊겨 있으면 검사 없이 바로 응답
+            if r.json().get("camera_down") :
+                return JSONResponse(status_code=200,
+                                    content={
+                                        "detected" : False,
+                                        "img_path" : None,
+                                        "classes" : [],
+                                        "message" : "Camera Down"
+                                    })
+
             job_id = r.json().get("job_id", usage_id)
 
-            # 2) 결과 가져오기
-            # 결과 가져오는데 시간 1~2초 소요
-            for _ in range(6) :
-                await asyncio.sleep(0.3)
-                try:
-                    rr = await client.get(f"{CAMERA_SERVER}/camera/lost-item/result/{job_id}")
-                except httpx.HTTPError:
-                    continue
-                if rr.status_code != 200 :
-                    continue
-            
+            # 2) 결과 가져오기 : 검사가 끝나는 순간 응답받음(최대 LOST_ITEM_WAIT초)
+            rr = await client.get(f"{CAMERA_SERVER}/camera/lost-item/result/{job_id}",
+                                  params={"wait" : LOST_ITEM_WAIT},
+                                  timeout=LOST_ITEM_WAIT + 2)
+
             #     return_content = {
             #     "detected" : False, 
             #     "img_path" : None, 
             #     "classes" : [], 
             #     "message" : ""
             # }
-                
+
+            if rr.status_code == 200 :
                 result = rr.json().get("result", {})
 
                 if result.get("done") is True :
-                    if not result.get("image_base64") :
+                    # 유실물은 감지했지만 이미지가 없음(인코딩 실패) : 감지 결과는 그대로 전달
+                    if result.get("items") and not result.get("image_url") :
+                        return JSONResponse(status_code=200,
+                                            content={
+                                                "detected" : True,
+                                                "img_path" : None,
+                                                "classes" : result.get("items"),
+                                                "message" : "Image Unavailable"
+                                            })
+
+                    if not result.get("image_url") :
                         return JSONResponse(status_code=200,
                                             content={
                                                 "detected" : False,
                                                 "img_path" : None,
                                                 "classes" : [],
-                                                "message" : "Success"
+                                                "message" : "Camera Down" if result.get("camera_down")
+                                                            else "Detection Failed" if result.get("detection_failed")
+                                                            else "Success"
                                             })
                     
                     else :
-                        image_base64 = result.get("image_base64")
-                        img_path = save_base64_image_and_get_path(image_base64,seat_id,usage_id)
-                        
+                        # 이미지를 못 받아도(만료 등) 감지 결과는 그대로 전달
+                        try :
+                            img_path = await save_camera_image_and_get_path(client, result.get("image_url"), seat_id, usage_id,
+                                                                     result.get("image_key"))
+                        except httpx.HTTPError as exc :
+                            print(f'[checkout] 유실물 이미지 저장 실패 : {exc}')
+                            img_path = None
+
                         return JSONResponse(status_code=200, content = {
                             "detected" : True,
                             "img_path" : img_path,
                             "classes" : result.get("items"),
-                            "message" : "Success"
+                            "message" : "Success" if img_path else "Image Unavailable"
                         })
     except httpx.HTTPError as exc:
         return JSONResponse(status_code=502,
@@ -189,4 +208,43 @@ def checktime_seat(payload: CheckTimePayload, db: Session = Depends(get_db)) :
     return JSONResponse(status_code=200, content={ "status" : True, "message" : "Success"})
 
 
-    
+@router.post("/checktime/batch")
+def checktime_seat_batch(payload: CheckTimeBatchPayload, db: Session = Depends(get_db)) :
+    """카메라 서버 이벤트 전송기(EventDelivery)가 모아서 보낸 시간 업데이트를 한 트랜잭션으로 처리"""
+    results = []
+    try :
+        # 재전송된 이벤트는 event_id로 한 번만 반영
+        event_ids = [event.event_id for event in payload.events if event.event_id]
+        received = set()
+        if event_ids :
+            rows = db.query(CameraEventReceipt.event_id).filter(CameraEventReceipt.event_id.in_(event_ids)).all()
+            received = {row.event_id for row in rows}
+
+        for event in payload.events :
+            if event.event_id in received :
+                results.append({"seat_id" : event.seat_id, "usage_id" : event.usage_id, "status" : "duplicate"})
+                continue
+
+            seatusage = db.query(SeatUsage).filter(
+                SeatUsage.usage_id == int(event.usage_id),
+                SeatUsage.seat_id == int(event.seat_id),
+            ).first()
+
+            # 없는 이용 건은 건너뛰고 결과로만 알림(다시 보내도 실패하므로)
+            if not seatusage :
+                results.append({"seat_id" : event.seat_id, "usage_id" : event.usage_id, "status" : "not_found"})
+                continue
+
+            seatusage.total_in_time = (seatusage.total_in_time or 0) + int(event.minutes)
+            if event.event_id :
+                db.add(CameraEventReceipt(event_id=event.event_id, usage_id=event.usage_id))
+                received.add(event.event_id)
+            results.append({"seat_id" : event.seat_id, "usage_id" : event.usage_id, "status" : "ok"})
+
+        db.commit()
+
+    except Exception as e :
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"예기치 않은 오류 : {e}")
+
+    return JSONResponse(status_code=200, content={ "status" : True, "results" : results})
@@ -127,6 +127,14 @@ class ProductUpdate(BaseSchema):
 class ProductResponse(ProductCreate):
     product_id: int
 
+class CaptureResponse(BaseSchema):
+    capture_id: int
+    usage_id: Optional[int] = None
+    seat_id: Optional[int] = None
+    path: str               # 웹 경로(/captures/real/YYYY/MM/DD/...)
+    size: int
+    created_at: datetime
+
 # ----------------------------------------------------------------------------------------------------------------------
 # ai planner
 # ----------------------------------------------------------------------------------------------------------------------
@@ -0,0 +1,150 @@
+import asyncio
+import os
+import shutil
+import uuid
+from datetime import datetime, timedelta
+from dotenv import load_dotenv
+from sqlalchemy import func
+from database import SessionLocal
+from models import Capture
+
+load_dotenv()
+
+# ----------------------------------------------------------------------------------------------------------------------
+# 유실물 캡처 저장소
+# - 파일은 captures/real/YYYY/MM/DD/ 아래에 날짜별로 저장(임시 파일에 쓰고 교체 -> 쓰는 중인 파일은 노출 안 됨)
+# - 저장할 때 captures 테이블에 메타데이터 기록 -> 관리자 화면은 디렉터리 대신 DB로 조회
+# - compact()가 보관 기간 / 전체 용량을 넘는 캡처를 오래된 것부터 삭제(스케줄러에서 주기 실행)
+# ----------------------------------------------------------------------------------------------------------------------
+
+CAPTURE_DIR = "captures/real"
+CAPTURE_MAX_AGE_DAYS = int(os.getenv("CAPTURE_MAX_AGE_DAYS", 30))
+CAPTURE_MAX_TOTAL_MB = int(os.getenv("CAPTURE_MAX_TOTAL_MB", 2048))
+
+# compact() 시 한 번에 삭제하는 행 수
+COMPACT_BATCH = 500
+
+class CaptureStore:
+    """캡처 파일 + 메타데이터 인덱스 관리"""
+
+    def __init__(self, root: str = CAPTURE_DIR,
+                 max_age_days: int = CAPTURE_MAX_AGE_DAYS,
+                 max_total_mb: int = CAPTURE_MAX_TOTAL_MB):
+        self.root = root
+        self.max_age_days = max_age_days
+        self.max_total_bytes = max_total_mb * 1024 * 1024
+        os.makedirs(self.root, exist_ok=True)
+
+    def save(self, data: bytes, seat_id: int, usage_id: int, image_key: str = None) -> str:
+        """JPEG 바이트 저장 후 웹 경로(/captures/real/...) 반환"""
+        now = datetime.now()
+        directory = os.path.join(self.root, now.strftime("%Y"), now.strftime("%m"), now.strftime("%d"))
+        os.makedirs(directory, exist_ok=True)
+
+        filename = f"seat{seat_id}_usage{usage_id}_{now.strftime('%H%M%S')}_{uuid.uuid4().hex[:6]}.jpg"
+        file_path = os.path.join(directory, filename)
+        tmp_path = f"{file_path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, file_path)
+
+        web_path = "/" + file_path.replace("\\", "/")
+        self._index(Capture(usage_id=usage_id, seat_id=seat_id, path=web_path,
+                            size=len(data), image_key=image_key, created_at=now))
+        return web_path
+
+    async def save_async(self, data: bytes, seat_id: int, usage_id: int, image_key: str = None) -> str:
+        """이벤트 루프를 막지 않도록 파일 쓰기 / 인덱스 기록은 스레드에서 처리"""
+        return await asyncio.to_thread(self.save, data, seat_id, usage_id, image_key)
+
+    def _index(self, capture: Capture):
+        db = SessionLocal()
+        try:
+            db.add(capture)
+            db.commit()
+        except Exception as e:
+            # 인덱스에 없는 파일은 compact()의 날짜 디렉터리 정리로 삭제됨
+            print(f"[CaptureStore] 인덱스 기록 실패: {e}")
+            db.rollback()
+        finally:
+            db.close()
+
+    def list_by_usage(self, db, usage_id: int):
+        return db.query(Capture).filter(Capture.usage_id == usage_id).order_by(Capture.created_at).all()
+
+    def compact(self):
+        """보관 기간 초과 -> 전체 용량 초과 순으로 오래된 캡처 삭제"""
+        cutoff = datetime.now() - timedelta(days=self.max_age_days)
+        db = SessionLocal()
+        try:
+            expired = self._delete_where(db, Capture.created_at < cutoff)
+
+            evicted = 0
+            total = db.query(func.coalesce(func.sum(Capture.size), 0)).scalar()
+            while total > self.max_total_bytes:
+                oldest = db.query(Capture).order_by(Capture.created_at).limit(COMPACT_BATCH).all()
+                if not oldest:
+                    break
+                for capture in oldest:
+                    if total <= self.max_total_bytes:
+                        break
+                    self._remove_file(capture.path)
+                    db.delete(capture)
+                    total -= capture.size or 0
+                    evicted += 1
+                db.commit()
+        except Exception as e:
+            print(f"[CaptureStore] 정리 실패: {e}")
+            db.rollback()
+            return
+        finally:
+            db.close()
+
+        swept = self._sweep_directories(cutoff)
+        if expired or evicted or swept:
+            print(f"[CaptureStore] 정리 완료: 기간 초과 {expired}건, 용량 초과 {evicted}건, 디렉터리 {swept}개")
+
+    def _delete_where(self, db, condition) -> int:
+        deleted = 0
+        while True:
+            captures = db.query(Capture).filter(condition).limit(COMPACT_BATCH).all()
+            if not captures:
+                return deleted
+            for capture in captures:
+                self._remove_file(capture.path)
+                db.delete(capture)
+            db.commit()
+            deleted += len(captures)
+
+    def _remove_file(self, web_path: str):
+        try:
+            os.remove(web_path.lstrip("/"))
+        except FileNotFoundError:
+            pass
+
+    def _sweep_directories(self, cutoff: datetime) -> int:
+        """
+        인덱스에 없는 파일 정리 : 보관 기간이 지난 날짜 디렉터리 통째로 삭제
+        (날짜별 구조 이전에 root에 바로 저장된 파일은 수정 시각 기준으로 삭제)
+        """
+        swept = 0
+        cutoff_day = cutoff.strftime("%Y/%m/%d")
+        for entry in os.scandir(self.root):
+            if entry.is_file() and entry.stat().st_mtime < cutoff.timestamp():
+                os.remove(entry.path)
+            elif entry.is_dir() and entry.name.isdigit():
+                for month in sorted(os.scandir(entry.path), key=lambda e: e.name):
+                    if not month.is_dir():
+                        continue
+                    for day in sorted(os.scandir(month.path), key=lambda e: e.name):
+                        if day.is_dir() and f"{entry.name}/{month.name}/{day.name}" < cutoff_day:
+                            shutil.rmtree(day.path, ignore_errors=True)
+                            swept += 1
+                    if not os.listdir(month.path):
+                        os.rmdir(month.path)
+                if not os.listdir(entry.path):
+                    os.rmdir(entry.path)
+        return swept
+
+# 전역 캡처 저장소 인스턴스
+capture_store = CaptureStore()
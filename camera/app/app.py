@@ -3,7 +3,7 @@ from fastapi import FastAPI
 from contextlib import asynccontextmanager
 from fastapi.middleware.cors import CORSMiddleware
 from vision.camera_initializer import init_camera_system
-from routers import vision_api, health_api
+from routers import vision_api, health_api, metrics_api
 
 @asynccontextmanager
 async def lifespan(app : FastAPI):
@@ -32,6 +32,7 @@ app.add_middleware(
 
 app.include_router(vision_api.router)
 app.include_router(health_api.router)
+app.include_router(metrics_api.router)
 
 @app.get('/')
 def test() :
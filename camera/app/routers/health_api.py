@@ -1,5 +1,6 @@
 from fastapi import APIRouter, Request
 from fastapi.responses import JSONResponse
+from vision.model_registry import model_registry
 
 router = APIRouter(prefix="/health", tags=["health"])
 
@@ -16,14 +17,25 @@ def health_check(request : Request) :
         "status" : "ok",
         "camera_server" : "running",
         "cameras" : camera_status,
-        "event_queue_backlog" : queue_size
+        "event_queue_backlog" : queue_size,
+        "lost_item_results" : seat_manager.lost_item_results.get_status(),
+        "image_encoder" : seat_manager.image_encoder.get_status(),
+        "event_outbox" : seat_manager.outbox.get_status() if seat_manager.outbox else None,
+        "config_reload" : camera_manager.config_watcher.get_status() if camera_manager.config_watcher else None,
+        "models" : model_registry.get_status()
     })
 
 @router.get("/seat_states")
 def seat_states(request : Request) :
     seat_manager = request.app.state.seat_manager
+    camera_manager = request.app.state.camera_manager
 
-    return seat_manager.seat_states
+    # 좌석별 카메라 스트림 상태 추가(down인 좌석은 감지 / 유실물 검사가 되지 않음)
+    states = {}
+    for seat_id, state in seat_manager.seat_states.items() :
+        camera_id = camera_manager.seat_to_camera_map.get(seat_id)
+        states[seat_id] = {**state, "camera_state" : camera_manager.get_camera_state(camera_id) if camera_id else None}
+    return states
 
 @router.get("/test")
 def test(event) :
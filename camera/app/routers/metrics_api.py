@@ -0,0 +1,30 @@
+from fastapi import APIRouter, Request
+from fastapi.responses import PlainTextResponse
+from vision.metrics import metrics
+from vision.model_registry import model_registry
+
+router = APIRouter(tags=["metrics"])
+
+@router.get("/metrics")
+def prometheus_metrics(request : Request) :
+    """ Prometheus 수집용 지표(text format) """
+    camera_manager = request.app.state.camera_manager
+    seat_manager = request.app.state.seat_manager
+
+    gauges = camera_manager.get_metrics()
+    gauges["seat_event_queue_backlog"] = [({}, seat_manager.event_queue.qsize())]
+    results = seat_manager.lost_item_results.get_status()
+    gauges["lost_item_results_size"] = [({}, results["size"])]
+    gauges["lost_item_results_oldest_age_seconds"] = [({}, results["oldest_age_seconds"] or 0)]
+    gauges["lost_item_results_expired_total"] = [({}, results["expired"])]
+    gauges["lost_item_results_evicted_total"] = [({}, results["evicted"])]
+    encoder = seat_manager.image_encoder.get_status()
+    gauges["image_store_images"] = [({}, encoder["images"])]
+    gauges["image_store_bytes"] = [({}, encoder["bytes"])]
+    gauges["image_encode_queue"] = [({}, encoder["queued"])]
+    if seat_manager.outbox is not None :
+        gauges["event_outbox_backlog"] = [({}, seat_manager.outbox.stats["backlog"])]
+    gauges["model_loaded"] = [({"model" : key}, int(status["loaded"]))
+                              for key, status in model_registry.get_status().items()]
+
+    return PlainTextResponse(metrics.render(gauges), media_type="text/plain; version=0.0.4")
@@ -1,14 +1,17 @@
+from typing import Literal
 from fastapi import APIRouter
 from fastapi import Body, HTTPException
 from fastapi.requests import Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from vision.schemas.schemas import SeatEvent, SeatEventType
-import base64
+from vision.stream_supervisor import DOWN
 import httpx
 
 router=APIRouter(prefix="/camera", tags=["감지 상태 업데이트"])
 
 WEB_SERVER_HOST = "http://localhost:8000"
+# 유실물 결과 long-poll 최대 대기(초)
+MAX_RESULT_WAIT = 30.0
 
 
 @router.post("/checkin")
@@ -29,9 +32,11 @@ def check_in(request : Request,
 
     seat_manager.handle_web_checkin(seat_id, usage_id)
 
+    # 카메라가 끊겨 있어도 감지는 등록(재연결되면 이어서 감지), 상태만 같이 알려줌
     return JSONResponse(status_code=200, content={
         "status" : True,
-        "message" : f'seat {seat_id} tracking started'
+        "message" : f'seat {seat_id} tracking started',
+        "camera_state" : camera_manager.get_camera_state(camera_id)
     })
 
 @router.post("/checkout")
@@ -50,13 +55,29 @@ def checkout(request : Request,
         "message" : f'not seat {seat_id} to camera'
     })
     
-    # 결과 저장소 초기화
-    with seat_manager.result_lock :
-        seat_manager.lost_item_results[usage_id] = {
-            "done" : False,
+    # 카메라가 down이면 검사하지 않고 바로 완료 처리(웹 서버가 결과를 기다리지 않도록)
+    if camera_manager.get_camera_state(camera_id) == DOWN :
+        seat_manager.lost_item_results.put(usage_id, {
+            "done" : True,
             "seat_id" : seat_id,
-            "usage_id" : usage_id
-        }
+            "usage_id" : usage_id,
+            "items" : [],
+            "camera_down" : True
+        })
+        seat_manager.handle_web_release(seat_id, usage_id)
+        return JSONResponse(status_code=200, content={
+            "status" : True,
+            "message" : f'camera {camera_id} down, seat {seat_id} lostitem check skipped',
+            "job_id" : usage_id,
+            "camera_down" : True
+        })
+
+    # 결과 저장소 초기화
+    seat_manager.lost_item_results.put(usage_id, {
+        "done" : False,
+        "seat_id" : seat_id,
+        "usage_id" : usage_id
+    })
     
     # 유실물 감지 시작
     seat_manager.handle_web_checkout(seat_id, usage_id)
@@ -67,6 +88,29 @@ def checkout(request : Request,
         "job_id" : usage_id
     })    
 
+@router.post("/release")
+def release(request : Request,
+            seat_id : int = Body(...),
+            usage_id : int = Body(...)) :
+    """웹으로 부터 자동 퇴실 수신 받는 api(유실물 검사 없이 감지 종료)"""
+    seat_manager = request.app.state.seat_manager
+    camera_manager = request.app.state.camera_manager
+
+    camera_id = camera_manager.seat_to_camera_map.get(seat_id)
+
+    if camera_id is None :
+        return JSONResponse(status_code=400, content={
+        "status" : False,
+        "message" : f'not seat {seat_id} to camera'
+    })
+
+    seat_manager.handle_web_release(seat_id, usage_id)
+
+    return JSONResponse(status_code=200, content={
+        "status" : True,
+        "message" : f'seat {seat_id} tracking stopped'
+    })
+
 @router.post("/event")
 async def checktime_event(event: SeatEvent) :
     if event.event_type != SeatEventType.CHECK_OUT:
@@ -101,18 +145,38 @@ async def checktime_event(event: SeatEvent) :
 
 
 @router.get("/lost-item/result/{job_id}")
-def lost_item_result(request : Request, job_id : int) :
-    """ usage_id 기준 유실물 조회 """
+async def lost_item_result(request : Request, job_id : int, wait : float = 0) :
+    """
+    usage_id 기준 유실물 조회
+    wait > 0 이면 검사가 끝날 때까지 최대 wait초 대기 후 응답(long-poll), 시간 초과 시 done=False 그대로 응답
+    """
     seat_manager = request.app.state.seat_manager
+    results = seat_manager.lost_item_results
 
-    with seat_manager.result_lock :
-        result = seat_manager.lost_item_results.get(job_id)
+    if wait > 0 :
+        result = await results.wait(job_id, lambda r : r.get("done") is True, min(wait, MAX_RESULT_WAIT))
+    else :
+        result = results.get(job_id)
 
     if result is None :
         return JSONResponse(status_code=404, content={"message" : "usage_id not found"})
-    
+
     return JSONResponse(status_code=200,
                         content={
                             "status" : True,
                             "result" : result
                         })
+
+@router.get("/lost-item/image/{image_key}")
+def lost_item_image(request : Request, image_key : str, variant : Literal["full", "thumb"] = "full") :
+    """ 내용 hash 기준 유실물 크롭 이미지(JPEG 바이트 그대로, thumb은 축소본) """
+    seat_manager = request.app.state.seat_manager
+
+    image = seat_manager.image_encoder.get(image_key, variant)
+    if image is None :
+        return JSONResponse(status_code=404, content={"message" : "image not found"})
+
+    # key가 내용 hash이므로 같은 URL의 내용은 바뀌지 않음
+    return Response(content=image, media_type="image/jpeg",
+                    headers={"ETag" : f'"{image_key}-{variant}"',
+                             "Cache-Control" : "public, max-age=86400, immutable"})
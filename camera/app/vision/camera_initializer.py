@@ -1,24 +1,94 @@
 import json 
+import os
 from vision.seat_manager import SeatManager
 from vision.camera_manager import CameraManager
+from vision.camera_shards import ShardedCameraManager
+from vision.config_watcher import ConfigWatcher
+from vision.event_delivery import EventDelivery
+from vision.event_outbox import EventOutbox
+from vision.model_registry import model_registry
 
-def load_camera_config(path : str = 'vision/config/camera_config.json') :
+# 설정 / 런타임 데이터(outbox 등)는 실행 위치(camera 또는 camera/app)와 관계없이 vision 폴더 기준
+VISION_DIR = os.path.dirname(os.path.abspath(__file__))
+CONFIG_PATH = os.path.join(VISION_DIR, 'config', 'camera_config.json')
+
+def load_camera_config(path : str = CONFIG_PATH) :
     with open(path, 'r') as f :
         config = json.load(f)
 
     cameras = []
+    seat_owner = {}
     for cam in config["cameras"] :
+        # 실행 중 다시 읽을 때 잘못된 설정이 일부만 적용되지 않도록 먼저 검사
+        for key in ("camera_id", "source", "seat_rois") :
+            if key not in cam :
+                raise ValueError(f'카메라 설정에 {key} 없음 : {cam}')
+        if any(c["camera_id"] == cam["camera_id"] for c in cameras) :
+            raise ValueError(f'camera_id 중복 : {cam["camera_id"]}')
+
         seat_rois = { int(k) : tuple(v) for k, v in cam["seat_rois"].items() }
+        for seat_id, roi in seat_rois.items() :
+            if len(roi) != 4 :
+                raise ValueError(f'좌석 {seat_id} ROI 형식 오류 : {roi}')
+            if seat_id in seat_owner :
+                raise ValueError(f'좌석 {seat_id}가 {seat_owner[seat_id]}, {cam["camera_id"]}에 중복 등록')
+            seat_owner[seat_id] = cam["camera_id"]
         cam["seat_rois"] = seat_rois
         cameras.append(cam)
 
     return cameras
 
+def load_service_config(path : str = CONFIG_PATH) :
+    """cameras 외 서비스 설정(inference 등) 로드"""
+    with open(path, 'r') as f :
+        config = json.load(f)
+
+    return {k : v for k, v in config.items() if k != "cameras"}
+
 def init_camera_system() :
     configs = load_camera_config()
-    event_manager = SeatManager(camera_manager=None)
-    camera_manager = CameraManager(configs, event_manager)
+    service_config = load_service_config()
+
+    # 유실물 모델 유휴 해제 시간 설정
+    models_config = service_config.get("models", {})
+    if "lost_item_idle_timeout" in models_config :
+        model_registry.configure("lost_item", models_config["lost_item_idle_timeout"])
+
+    delivery = EventDelivery(**service_config.get("delivery", {}))
+    # outbox 경로가 상대 경로면 vision 폴더 기준(기본 vision/data/event_outbox.db)
+    outbox_config = dict(service_config.get("outbox", {}))
+    if "path" in outbox_config :
+        outbox_config["path"] = os.path.join(VISION_DIR, outbox_config["path"])
+    outbox = EventOutbox(delivery, **outbox_config)
+    event_manager = SeatManager(camera_manager=None, outbox=outbox,
+                                result_config=service_config.get("lost_item_results"),
+                                encoder_config=service_config.get("image_encoding"))
+    # sharding.processes > 0 이면 카메라를 여러 프로세스에 나눠서 실행
+    sharding_config = service_config.get("sharding", {})
+    if sharding_config.get("processes", 0) > 0 :
+        camera_manager = ShardedCameraManager(configs, event_manager,
+                                              inference_config=service_config.get("inference"),
+                                              governor_config=service_config.get("governor"),
+                                              occupancy_config=service_config.get("occupancy"),
+                                              stream_config=service_config.get("stream"),
+                                              decoder_config=service_config.get("decoder"),
+                                              models_config=models_config,
+                                              **sharding_config)
+    else :
+        camera_manager = CameraManager(configs, event_manager,
+                                       inference_config=service_config.get("inference"),
+                                       governor_config=service_config.get("governor"),
+                                       occupancy_config=service_config.get("occupancy"),
+                                       stream_config=service_config.get("stream"),
+                                       decoder_config=service_config.get("decoder"))
     event_manager.camera_manager = camera_manager
+
+    # 설정 파일이 바뀌면 카메라 / 좌석 ROI만 다시 적용(cameras 외 설정은 재시작 필요)
+    reload_config = service_config.get("reload", {})
+    if reload_config.get("enabled", False) :
+        camera_manager.config_watcher = ConfigWatcher(CONFIG_PATH, load_camera_config, camera_manager.apply_config,
+                                                      interval=reload_config.get("interval", 2.0))
+        camera_manager.config_watcher.start()
     return event_manager, camera_manager
 
             
\ No newline at end of file
@@ -1,8 +1,17 @@
+import threading
 from typing import Dict, List
 from vision.camera_worker import CameraWorker
+from vision.fps_governor import FpsGovernor
+from vision.inference_engine import InferenceEngine
+from vision.stream_supervisor import STATES
 
 class CameraManager :
-    def __init__(self, camera_configs : List[Dict], event_manager) :
+    def __init__(self, camera_configs : List[Dict], event_manager,
+                 inference_config : Dict | None = None,
+                 governor_config : Dict | None = None,
+                 occupancy_config : Dict | None = None,
+                 stream_config : Dict | None = None,
+                 decoder_config : Dict | None = None) :
         """
         camera_configs 
         [
@@ -12,36 +21,201 @@ class CameraManager :
             "seat_rois" : {
                     21 : (0.12, 0.33, 0.22, 0.50),
                     22 : (0.25, 0.33, 0.35, 0.50)
-                }
+                },
+            "inference_mode" : "full" | "roi_union" | "roi_tiles",   (선택, 기본 "full")
+            "roi_margin" : 0.2,   (선택)
+            "motion_gate" : {"enabled" : true, "threshold" : 6.0, "refresh_interval" : 5.0},   (선택, 기본 사용 안 함)
+            "detector_backend" : "torch" | "onnx" | "openvino"   (선택)
+            "occupancy" : {"dwell_seconds" : 3.0, "min_ratio" : 0.8}   (선택, occupancy_config 대신 사용)
+            "stream" : {"stall_timeout" : 10.0, ...}   (선택, stream_config 대신 사용)
+            "decoder" : {"backend" : "ffmpeg", "width" : 768, ...}   (선택, decoder_config 대신 사용)
+            "tracker" : {"enabled" : true, "detect_interval" : 3, "max_coast" : 1.0}   (선택)
             },...
         ]
+        inference_config
+        {
+            "tick_interval" : 0.1,
+            "max_batch_size" : 8
+        }
+        governor_config
+        {
+            "min_fps" : 1.0,
+            "max_fps" : 5.0,
+            "pending_boost" : 2.0,
+            "pending_max_fps" : 10.0,   (None이면 max_fps * pending_boost, tick_interval보다 빠를 수는 없음)
+            "cpu_target" : 0.7
+        }
+        occupancy_config(모든 카메라 기본 판정 설정)
+        {
+            "dwell_seconds" : 3.0,   (None이면 "threshold" 프레임 수 기준)
+            "min_ratio" : 0.8
+        }
+        stream_config(모든 카메라 기본 재연결 설정)
+        {
+            "degraded_after" : 2.0,
+            "stall_timeout" : 10.0,
+            "base_backoff" : 1.0,
+            "max_backoff" : 30.0
+        }
+        decoder_config(모든 카메라 기본 디코더 설정)
+        {
+            "backend" : "opencv" | "ffmpeg",
+            "width" : 768,   (ffmpeg : 디코딩 시 축소할 너비)
+            "mode" : "all" | "keyframes" | "fps",   (ffmpeg)
+            "fps" : 5.0,   (ffmpeg, mode="fps")
+            "threads" : 1   (ffmpeg 디코딩 스레드)
+        }
         """
 
         self.event_manager = event_manager
         self.camera_workers : Dict[str, CameraWorker] = {}
         self.seat_to_camera_map : Dict[int, str] = {}
+        self.camera_configs : Dict[str, Dict] = {}
+        self.defaults = {
+            "occupancy" : occupancy_config,
+            "stream" : stream_config,
+            "decoder" : decoder_config
+        }
+        # 좌석 명령(start_tracking 등)과 설정 교체(apply_config)가 섞이지 않도록 직렬화
+        self.lock = threading.RLock()
+        # ConfigWatcher(설정 파일 감시, camera_initializer가 연결)
+        self.config_watcher = None
+
+        # 모든 카메라가 공유하는 배치 추론 엔진
+        self.governor = FpsGovernor(**(governor_config or {}))
+        self.inference_engine = InferenceEngine(governor=self.governor, **(inference_config or {}))
 
         # camera worker 생성 및 seat mapping
         for cfg in camera_configs :
-            cam_id = cfg["camera_id"]
-            source = cfg["source"]
-            seat_rois = cfg["seat_rois"]
-
-            worker = CameraWorker(
-                camera_id=cam_id,
-                source=source,
-                seat_rois=seat_rois,
-                event_manager=event_manager
-            )
-
-            self.camera_workers[cam_id] = worker
+            worker = self._create_worker(cfg)
+            self.camera_workers[cfg["camera_id"]] = worker
+            self.camera_configs[cfg["camera_id"]] = cfg
+            self.inference_engine.register(worker)
         
             # 좌석 카메라 매핑 저장
-            for seat_id in seat_rois.keys() :
-                self.seat_to_camera_map[seat_id] = cam_id
+            for seat_id in cfg["seat_rois"].keys() :
+                self.seat_to_camera_map[seat_id] = cfg["camera_id"]
         
+        self.inference_engine.start()
         print("[CameraManager] 초기화 완료")
 
+    def _create_worker(self, cfg : Dict) -> CameraWorker :
+        return CameraWorker(
+            camera_id=cfg["camera_id"],
+            source=cfg["source"],
+            seat_rois=cfg["seat_rois"],
+            event_manager=self.event_manager,
+            inference_mode=cfg.get("inference_mode", "full"),
+            roi_margin=cfg.get("roi_margin", 0.2),
+            motion_gate=cfg.get("motion_gate"),
+            detector_backend=cfg.get("detector_backend", "torch"),
+            occupancy=cfg.get("occupancy", self.defaults["occupancy"]),
+            stream=cfg.get("stream", self.defaults["stream"]),
+            decoder=cfg.get("decoder", self.defaults["decoder"]),
+            tracker=cfg.get("tracker")
+        )
+
+    def apply_config(self, camera_configs : List[Dict]) :
+        """
+        실행 중 카메라 설정 교체(설정 파일 변경 시 ConfigWatcher가 호출)
+        - 새 카메라 : worker 생성 / 빠진 카메라 : worker 종료
+        - seat_rois만 바뀐 카메라 : 실행 중인 worker의 ROI / 판정 엔진만 교체
+        - 그 외 설정(source 등)이 바뀐 카메라 : worker 재시작(판정 상태는 이어받음)
+          source가 그대로면 기존 worker를 먼저 종료(캡처 해제)한 뒤 새로 열기(USB / 세션 1개만 허용하는 RTSP)
+        - 감지 중인 좌석은 바뀐 카메라 / worker에서 같은 usage_id로 이어서 감지
+        :return: {"added", "removed", "restarted", "rois_updated"} 카메라 id 목록
+        """
+        new_configs = {cfg["camera_id"] : cfg for cfg in camera_configs}
+        seat_map = {seat_id : cfg["camera_id"] for cfg in camera_configs for seat_id in cfg["seat_rois"].keys()}
+
+        summary = diff_camera_configs(self.camera_configs, new_configs)
+        if not any(summary.values()) :
+            return summary
+
+        reopen = [cam_id for cam_id in summary["restarted"]
+                  if self.camera_configs[cam_id]["source"] == new_configs[cam_id]["source"]]
+
+        # 스트림 열기는 오래 걸릴 수 있으므로 다른 소스는 lock 밖에서 먼저 생성
+        created = self._create_workers([cam_id for cam_id in summary["added"] + summary["restarted"]
+                                        if cam_id not in reopen], new_configs)
+
+        with self.lock :
+            # 교체 전 감지 중인 좌석 {seat_id : usage_id}
+            tracked = {seat_id : worker.usage_ids.get(seat_id)
+                       for worker in self.camera_workers.values() for seat_id in worker.active_seats}
+            old_map = self.seat_to_camera_map
+
+            # 같은 소스 : 기존 캡처를 해제한 뒤 열기(동시에 열 수 없는 장치 / 스트림)
+            for cam_id in reopen :
+                worker = self.camera_workers[cam_id]
+                worker.stop(wait=worker.grabber.supervisor.stall_timeout)
+            try :
+                created.update(self._create_workers(reopen, new_configs))
+            except Exception :
+                for worker in created.values() :
+                    worker.stop()
+                self._restore_workers(reopen, tracked)
+                raise
+
+            retired = [self.camera_workers[cam_id] for cam_id in summary["removed"] + summary["restarted"]
+                       if cam_id not in reopen]
+            for cam_id in summary["rois_updated"] :
+                self.camera_workers[cam_id].update_rois(new_configs[cam_id]["seat_rois"])
+            for cam_id in summary["removed"] :
+                self.camera_workers.pop(cam_id)
+                self.inference_engine.unregister(cam_id)
+            for cam_id, worker in created.items() :
+                previous = self.camera_workers.get(cam_id)
+                if previous is not None :
+                    worker.occupancy.inherit(previous.occupancy)
+                self.camera_workers[cam_id] = worker
+                self.inference_engine.register(worker)
+
+            self.camera_configs = new_configs
+            self.seat_to_camera_map = seat_map
+
+            # 감지 중이던 좌석을 새 worker에서 이어서 감지
+            for seat_id, usage_id in tracked.items() :
+                cam_id = seat_map.get(seat_id)
+                if cam_id is None :
+                    print(f'[CameraManager] 감지 중인 좌석 {seat_id}가 설정에서 제거되어 감지 종료')
+                    continue
+                worker = self.camera_workers[cam_id]
+                if seat_id in worker.active_seats :
+                    continue
+                # 같은 카메라(재시작)면 이어받은 판정 상태 유지, 다른 카메라로 옮겨진 좌석은 새로 판정
+                # (이전 카메라는 종료되었거나 update_rois에서 이미 감지 대상에서 빠짐)
+                worker.start_tracking(seat_id, usage_id, reset=old_map.get(seat_id) != cam_id)
+
+        for worker in retired :
+            worker.stop()
+        print(f'[CameraManager] 설정 교체 : {summary}')
+        return summary
+
+    def _create_workers(self, cam_ids : List[str], configs : Dict[str, Dict]) -> Dict[str, CameraWorker] :
+        """worker 여러 개 생성, 중간에 실패하면 이미 만든 worker(디코딩 / 유실물 스레드)는 종료 후 다시 raise"""
+        created = {}
+        try :
+            for cam_id in cam_ids :
+                created[cam_id] = self._create_worker(configs[cam_id])
+        except Exception :
+            for worker in created.values() :
+                worker.stop()
+            raise
+        return created
+
+    def _restore_workers(self, cam_ids : List[str], tracked : Dict[int, int]) :
+        """lock 안에서 호출 : 새 설정 적용에 실패해서 먼저 종료한 worker를 이전 설정으로 다시 시작"""
+        for cam_id in cam_ids :
+            previous = self.camera_workers[cam_id]
+            worker = self._create_worker(self.camera_configs[cam_id])
+            worker.occupancy.inherit(previous.occupancy)
+            self.camera_workers[cam_id] = worker
+            self.inference_engine.register(worker)
+            for seat_id, usage_id in tracked.items() :
+                if self.seat_to_camera_map.get(seat_id) == cam_id :
+                    worker.start_tracking(seat_id, usage_id, reset=False)
+
     def get_worker_by_seat(self, seat_id : int) -> CameraWorker :
         """시트에 매핑된 카메라 객체 가져오기"""
         cam_id = self.seat_to_camera_map.get(seat_id)
@@ -52,22 +226,94 @@ class CameraManager :
     
     def start_tracking(self, seat_id : int, usage_id : int) :
         """입실 이벤트 처리 : 입실 시 해당 카메라에게 탐지하도록"""
-        worker = self.get_worker_by_seat(seat_id)
-        worker.start_tracking(seat_id, usage_id)
+        with self.lock :
+            worker = self.get_worker_by_seat(seat_id)
+            worker.start_tracking(seat_id, usage_id)
     
+    def stop_tracking(self, seat_id : int) :
+        """자동 퇴실 처리 : 유실물 검사 없이 해당 좌석 감지만 종료"""
+        with self.lock :
+            worker = self.get_worker_by_seat(seat_id)
+            worker.stop_tracking(seat_id)
+
     def start_lost_item_check(self, seat_id:int, usage_id : int) :
         """퇴실 이벤트 처리 : 퇴실 시 해당 카메라에게 분실물 탐지하도록"""
-        worker = self.get_worker_by_seat(seat_id)
-        worker.start_lost_item_check(seat_id, usage_id)
+        with self.lock :
+            worker = self.get_worker_by_seat(seat_id)
+            worker.start_lost_item_check(seat_id, usage_id)
+
+    def get_camera_state(self, cam_id : str) -> str :
+        """카메라 스트림 상태(connecting / streaming / degraded / down)"""
+        return self.camera_workers[cam_id].grabber.get_state()
 
     def get_status(self) :
         status_list = []
-        for cam_id, worker in self.camera_workers.items() :
+        for cam_id, worker in list(self.camera_workers.items()) :
             status_list.append({
                 "cam_id" : cam_id,
                 "source" : worker.source,
-                "status" : worker.cap.isOpened()
+                "detector_backend" : worker.detector_backend,
+                "status" : worker.grabber.is_opened(),
+                "active_seats" : sorted(worker.active_seats),
+                **self.governor.get_camera_status(cam_id),
+                "motion_gate" : worker.motion_gate.get_status() if worker.motion_gate else None,
+                "tracker" : worker.tracker.get_status() if worker.tracker else None,
+                "grabber" : worker.grabber.get_status()
             })
         return status_list
 
-    
\ No newline at end of file
+    def get_metrics(self) :
+        """/metrics용 카메라 / 추론 엔진 상태값 {name : [(labels, value), ...]}"""
+        gauges = {}
+
+        def add(name, labels, value) :
+            gauges.setdefault(name, []).append((labels, value))
+
+        for cam_id, worker in list(self.camera_workers.items()) :
+            labels = {"camera" : cam_id}
+            grabber = worker.grabber.get_status()
+            fps = self.governor.get_camera_status(cam_id)
+
+            add("camera_up", labels, int(worker.grabber.is_opened()))
+            # 현재 상태만 1(one-hot)
+            for state in STATES :
+                add("camera_stream_state", {**labels, "state" : state}, int(grabber["stream"]["state"] == state))
+            add("camera_active_seats", labels, len(worker.active_seats))
+            add("camera_frames_grabbed_total", labels, grabber["frames_grabbed"])
+            add("camera_frames_dropped_total", labels, grabber["frames_dropped"])
+            add("camera_read_failures_total", labels, grabber["read_failures"])
+            add("camera_effective_fps", labels, fps["effective_fps"])
+            add("camera_target_fps", labels, fps["target_fps"])
+            if grabber["latest_age_ms"] is not None :
+                add("camera_latest_frame_age_seconds", labels, grabber["latest_age_ms"] / 1000)
+            if worker.motion_gate is not None :
+                add("camera_motion_skipped_roi_ratio", labels, worker.motion_gate.get_status()["skipped_roi_ratio"])
+            if worker.tracker is not None :
+                add("camera_tracks", labels, len(worker.tracker.tracks))
+
+        stats = self.inference_engine.stats
+        add("inference_ticks_total", {}, stats["ticks"])
+        add("inference_frames_total", {}, stats["frames"])
+        add("inference_images_total", {}, stats["images"])
+        add("inference_batches_total", {}, stats["batches"])
+        return gauges
+
+def diff_camera_configs(old : Dict[str, Dict], new : Dict[str, Dict]) -> Dict[str, List[str]] :
+    """
+    카메라 설정 비교({camera_id : cfg} 2개)
+    :return: {"added", "removed", "restarted"(seat_rois 외 설정 변경), "rois_updated"(seat_rois만 변경)}
+    """
+    def without_rois(cfg) :
+        return {key : value for key, value in cfg.items() if key != "seat_rois"}
+
+    summary = {"added" : [], "removed" : [], "restarted" : [], "rois_updated" : []}
+    for cam_id, cfg in new.items() :
+        previous = old.get(cam_id)
+        if previous is None :
+            summary["added"].append(cam_id)
+        elif without_rois(previous) != without_rois(cfg) :
+            summary["restarted"].append(cam_id)
+        elif previous["seat_rois"] != cfg["seat_rois"] :
+            summary["rois_updated"].append(cam_id)
+    summary["removed"] = [cam_id for cam_id in old if cam_id not in new]
+    return summary
@@ -0,0 +1,490 @@
+import atexit
+import multiprocessing
+import os
+import threading
+import time
+from typing import Dict, List
+from datetime import datetime
+import cv2
+from vision.camera_manager import CameraManager, diff_camera_configs
+from vision.metrics import metrics
+from vision.model_registry import model_registry
+from vision.schemas.schemas import SeatEvent, SeatEventType
+from vision.shared_ring import SharedRing
+from vision.stream_supervisor import DOWN
+
+##########################################################################
+# 카메라 샤드(멀티 프로세스 모드)
+# - 카메라를 processes개의 프로세스에 나눠서 실행(프로세스마다 CameraManager + InferenceEngine)
+#   -> 디코딩 / 추론이 GIL과 메모리 할당기를 프로세스별로 따로 사용
+# - 코어는 프로세스 수만큼 나눠서 torch / OpenCV 스레드 수와 FpsGovernor CPU 예산에 반영
+# - 부모 -> 샤드 : 좌석 명령(start_tracking 등)을 샤드별 명령 큐로 전달
+# - 샤드 -> 부모 : 이벤트는 결과 큐, 유실물 크롭 이미지는 샤드별 공유 메모리 링 버퍼(SharedRing)로 전달
+#   -> 부모의 SeatManager는 지금처럼 push_event / push_lost_item으로 받음
+# - 샤드 상태 / 지표는 status_interval마다 부모로 보내서 /health, /metrics에 합쳐서 표시
+# - 설정 교체(apply_config) : 기존 카메라는 원래 샤드 유지, 새 카메라는 한가한 샤드에 배정 후
+#   바뀐 샤드에만 카메라 목록 전달(샤드 안에서 CameraManager.apply_config로 적용)
+#   샤드가 적용 결과를 응답하면 성공한 샤드만 부모의 좌석 / 카메라 매핑에 반영
+#   (응답은 lock 밖에서 기다림 -> 그동안 좌석 명령은 이전 매핑으로 전달, 교체 후 옮겨진 착석 좌석은 새 샤드에 다시 전달)
+# - 샤드 프로세스가 죽으면 같은 카메라 목록으로 다시 시작(연속으로 죽으면 backoff)
+#   -> 착석 중인 좌석(seat_states OCCUPIED)은 새 샤드에 start_tracking 다시 전달
+#   -> 진행 중이던 유실물 검사 / 설정 교체 응답은 바로 실패 처리, 재시작 전까지 오는 좌석 명령은 전달하지 않음
+#   -> 죽은 샤드가 보낸 크롭을 모두 처리한 뒤 그 샤드의 링 버퍼 슬롯을 회수(쓰다 만 슬롯이 새지 않도록)
+##########################################################################
+
+class ShardedCameraManager :
+    def __init__(self, camera_configs : List[Dict], event_manager,
+                 inference_config : Dict | None = None,
+                 governor_config : Dict | None = None,
+                 occupancy_config : Dict | None = None,
+                 models_config : Dict | None = None,
+                 stream_config : Dict | None = None,
+                 decoder_config : Dict | None = None,
+                 processes : int = 2,
+                 ring_slots : int = 16,
+                 ring_slot_mb : int = 4,
+                 status_interval : float = 1.0,
+                 apply_timeout : float = 60.0,
+                 max_restart_backoff : float = 30.0) :
+        """
+        camera_configs / inference_config / governor_config / occupancy_config / stream_config / decoder_config : CameraManager와 같음
+        :param models_config: 샤드 프로세스의 model_registry 설정(lost_item_idle_timeout)
+        :param processes: 샤드 프로세스 수(카메라 수보다 많으면 카메라 수만큼)
+        :param ring_slots: 크롭 이미지 전달용 공유 메모리 슬롯 수(샤드 수로 나눠서 샤드마다 따로 사용)
+        :param ring_slot_mb: 슬롯 1개 크기(MB)
+        :param status_interval: 샤드 상태 / 지표 보고 주기(초)
+        :param apply_timeout: 설정 교체 시 샤드 응답을 기다리는 최대 시간(초)
+        :param max_restart_backoff: 샤드가 연속으로 죽을 때 재시작 간격 상한(초)
+        """
+        self.event_manager = event_manager
+        self.status_interval = status_interval
+        self.seat_to_camera_map : Dict[int, str] = {}
+        self.camera_to_shard : Dict[str, int] = {}
+        self.camera_configs : Dict[str, Dict] = {cfg["camera_id"] : cfg for cfg in camera_configs}
+        # 좌석 명령과 설정 교체(매핑 변경)가 섞이지 않도록 직렬화
+        self.lock = threading.Lock()
+        # 설정 교체끼리 직렬화(샤드 응답을 기다리는 동안에는 self.lock을 잡지 않음)
+        self.apply_lock = threading.Lock()
+        self.config_watcher = None
+        self.apply_timeout = apply_timeout
+        self.max_restart_backoff = max_restart_backoff
+        # 응답을 기다리는 샤드 명령 : request id -> [완료 Event, 오류 메시지, 샤드 번호]
+        self.replies = {}
+        self.next_request = 0
+
+        shards = self._assign(camera_configs, max(1, processes))
+        self.shard_configs = shards
+        self.threads = max(1, (os.cpu_count() or 1) // len(shards))
+        # 샤드 재시작 시 그대로 다시 전달하는 설정
+        self.shard_args = (inference_config or {}, governor_config or {}, occupancy_config, stream_config,
+                           decoder_config, models_config or {})
+
+        # CUDA / torch 스레드와 fork가 섞이지 않도록 spawn 사용
+        self.context = multiprocessing.get_context("spawn")
+        # 죽은 샤드의 슬롯만 따로 회수할 수 있도록 링 버퍼는 샤드마다 따로
+        self.rings = [SharedRing(self.context.Queue(), slots=max(1, ring_slots // len(shards)),
+                                 slot_bytes=ring_slot_mb * 1024 * 1024) for _ in shards]
+        self.results = self.context.Queue()
+        self.commands = []
+        self.processes = []
+        # shard -> (보고 시각, 카메라 상태 목록, gauge)
+        self.shard_reports = {}
+        # shard별 결과를 기다리는 유실물 검사 : usage_id -> seat_id
+        self.lost_item_jobs = [{} for _ in shards]
+        # shard별 재시작 상태 : 연속 재시작 횟수(상태 보고가 오면 0), 다음 재시작 시각, 전체 재시작 횟수
+        self.failures = [0] * len(shards)
+        self.restart_at = [None] * len(shards)
+        self.restarts = [0] * len(shards)
+        self.closed = False
+
+        for index, configs in enumerate(shards) :
+            for cfg in configs :
+                self.camera_to_shard[cfg["camera_id"]] = index
+                for seat_id in cfg["seat_rois"].keys() :
+                    self.seat_to_camera_map[seat_id] = cfg["camera_id"]
+
+            commands, process = self._start_shard(index)
+            self.commands.append(commands)
+            self.processes.append(process)
+
+        threading.Thread(target=self._receive_loop, daemon=True).start()
+        threading.Thread(target=self._watch_loop, daemon=True).start()
+        atexit.register(self.close)
+        print(f'[ShardedCameraManager] 샤드 {len(shards)}개 시작(프로세스당 스레드 {self.threads}) : '
+              f'{[[cfg["camera_id"] for cfg in configs] for configs in shards]}')
+
+    def _start_shard(self, index : int) :
+        """샤드 프로세스 시작(현재 shard_configs 기준) : (명령 큐, 프로세스)"""
+        commands = self.context.Queue()
+        process = self.context.Process(target=_shard_main, name=f'camera-shard-{index}', daemon=True,
+                                       args=(index, self.shard_configs[index], *self.shard_args,
+                                             commands, self.results, self.rings[index], self.threads, self.status_interval))
+        process.start()
+        return commands, process
+
+    def _assign(self, camera_configs, processes) :
+        """좌석 수가 많은 카메라부터 가장 한가한 샤드에 배정"""
+        shards = [[] for _ in range(min(processes, len(camera_configs)) or 1)]
+        loads = [0] * len(shards)
+        for cfg in sorted(camera_configs, key=lambda c : len(c["seat_rois"]), reverse=True) :
+            index = loads.index(min(loads))
+            shards[index].append(cfg)
+            loads[index] += max(1, len(cfg["seat_rois"]))
+        return shards
+
+    def _send(self, seat_id : int, method : str, *args) -> bool :
+        """좌석을 맡은 샤드에 명령 전달, 샤드 프로세스가 죽어 있으면 전달하지 않고 False"""
+        with self.lock :
+            cam_id = self.seat_to_camera_map.get(seat_id)
+            if cam_id is None :
+                raise ValueError(f'{seat_id}에 대응하는 카메라가 존재하지 않습니다.')
+            index = self.camera_to_shard[cam_id]
+            if not self.processes[index].is_alive() :
+                print(f'[ShardedCameraManager] shard-{index} 재시작 대기 중 : {method}({seat_id}) 전달 안 함')
+                return False
+            if method == "start_lost_item_check" :
+                self.lost_item_jobs[index][args[0]] = seat_id
+            self.commands[index].put((method, (seat_id, *args)))
+            return True
+
+    def _request(self, index : int, method : str, *args) :
+        """lock 안에서 호출 : 샤드에 응답이 필요한 명령 전달, (request id, 완료 Event) 반환"""
+        self.next_request += 1
+        request_id = self.next_request
+        self.replies[request_id] = [threading.Event(), None, index]
+        self.commands[index].put((method, args, request_id))
+        return request_id, self.replies[request_id][0]
+
+    def apply_config(self, camera_configs : List[Dict]) :
+        """
+        실행 중 카메라 설정 교체(CameraManager.apply_config와 같음, 반환값도 같은 형식)
+        적용에 실패한 샤드는 이전 설정을 유지하고, 성공한 샤드만 반영한 뒤 예외 발생
+        """
+        new_configs = {cfg["camera_id"] : cfg for cfg in camera_configs}
+        summary = diff_camera_configs(self.camera_configs, new_configs)
+        if not any(summary.values()) :
+            return summary
+
+        # 기존 카메라는 원래 샤드, 새 카메라는 좌석 수 기준으로 가장 한가한 샤드
+        shards = [[] for _ in self.processes]
+        loads = [0] * len(shards)
+        added = []
+        for cfg in camera_configs :
+            index = self.camera_to_shard.get(cfg["camera_id"])
+            if index is None :
+                added.append(cfg)
+                continue
+            shards[index].append(cfg)
+            loads[index] += max(1, len(cfg["seat_rois"]))
+        for cfg in sorted(added, key=lambda c : len(c["seat_rois"]), reverse=True) :
+            index = loads.index(min(loads))
+            shards[index].append(cfg)
+            loads[index] += max(1, len(cfg["seat_rois"]))
+
+        with self.apply_lock :
+            with self.lock :
+                # 바뀐 샤드에 전달(샤드 명령 큐 안에서는 이전 좌석 명령 다음에 적용)
+                requests = {index : self._request(index, "apply_config", configs)
+                            for index, configs in enumerate(shards) if configs != self.shard_configs[index]}
+
+            # 적용 결과는 lock 밖에서 대기 : 그 사이 좌석 명령은 이전 매핑으로 계속 전달
+            errors = {}
+            for index, (request_id, done) in requests.items() :
+                if not done.wait(self.apply_timeout) :
+                    errors[index] = f'{self.apply_timeout}초 동안 응답 없음'
+                elif self.replies[request_id][1] is not None :
+                    errors[index] = self.replies[request_id][1]
+                self.replies.pop(request_id, None)
+
+            with self.lock :
+                self._swap_config(shards, errors)
+
+        if errors :
+            raise RuntimeError(f'샤드 설정 적용 실패(해당 샤드는 이전 설정 유지) : {errors}')
+        print(f'[ShardedCameraManager] 설정 교체 : {summary}')
+        return summary
+
+    def _swap_config(self, shards, errors) :
+        """lock 안에서 호출 : 적용에 성공한 샤드의 카메라 목록으로 좌석 / 카메라 매핑 교체"""
+        # 실패한 샤드는 이전 카메라 목록 그대로
+        applied = [self.shard_configs[index] if index in errors else configs for index, configs in enumerate(shards)]
+        camera_to_shard = {cfg["camera_id"] : index for index, configs in enumerate(applied) for cfg in configs}
+        seat_map = {seat_id : cfg["camera_id"] for configs in applied for cfg in configs
+                    for seat_id in cfg["seat_rois"].keys()}
+
+        # 다른 샤드로 옮겨진 좌석 : 이전 샤드는 apply_config에서 감지 종료, 새 샤드에서 이어서 감지
+        for seat_id, cam_id in seat_map.items() :
+            old_cam = self.seat_to_camera_map.get(seat_id)
+            if old_cam is None or self.camera_to_shard[old_cam] == camera_to_shard[cam_id] :
+                continue
+            current = self.event_manager.seat_states.get(seat_id)
+            if current and current["status"] == "OCCUPIED" :
+                self.commands[camera_to_shard[cam_id]].put(("start_tracking", (seat_id, current["usage_id"])))
+
+        self.shard_configs = applied
+        self.camera_configs = {cfg["camera_id"] : cfg for configs in applied for cfg in configs}
+        self.camera_to_shard = camera_to_shard
+        self.seat_to_camera_map = seat_map
+
+    def start_tracking(self, seat_id : int, usage_id : int) :
+        """입실 이벤트 처리 : 입실 시 해당 카메라에게 탐지하도록(샤드 재시작 중이면 재시작 후 seat_states로 전달)"""
+        self._send(seat_id, "start_tracking", usage_id)
+
+    def stop_tracking(self, seat_id : int) :
+        """자동 퇴실 처리 : 유실물 검사 없이 해당 좌석 감지만 종료"""
+        self._send(seat_id, "stop_tracking")
+
+    def start_lost_item_check(self, seat_id : int, usage_id : int) :
+        """퇴실 이벤트 처리 : 퇴실 시 해당 카메라에게 분실물 탐지하도록(샤드 재시작 중이면 카메라 down으로 완료)"""
+        if not self._send(seat_id, "start_lost_item_check", usage_id) :
+            self._fail_lost_item_jobs({usage_id : seat_id})
+
+    def _fail_lost_item_jobs(self, jobs : Dict[int, int]) :
+        """결과를 받을 수 없는 유실물 검사를 카메라 down으로 바로 완료(웹 서버가 타임아웃까지 기다리지 않도록)"""
+        for usage_id, seat_id in jobs.items() :
+            self.event_manager.push_event(SeatEvent(
+                seat_id=seat_id,
+                event_type=SeatEventType.LOST_ITEM,
+                detected_at=datetime.now(),
+                usage_id=usage_id,
+                camera_id=self.seat_to_camera_map.get(seat_id),
+                items=[],
+                camera_down=True
+            ))
+
+    def _watch_loop(self) :
+        """죽은 샤드 프로세스 감시 / 재시작"""
+        while not self.closed :
+            time.sleep(self.status_interval)
+            for index in range(len(self.processes)) :
+                if self.closed or self.processes[index].is_alive() :
+                    continue
+                now = time.monotonic()
+                if self.restart_at[index] is None :
+                    self._on_shard_died(index, now)
+                elif now >= self.restart_at[index] :
+                    self._restart_shard(index)
+
+    def _on_shard_died(self, index : int, now : float) :
+        """샤드가 죽은 것을 처음 확인 : 기다리는 응답 / 유실물 검사 실패 처리 후 재시작 시각 결정"""
+        delay = min(self.max_restart_backoff, self.status_interval * 2 ** self.failures[index])
+        print(f'[ShardedCameraManager] shard-{index} 종료(exit code {self.processes[index].exitcode}), '
+              f'{delay:.1f}초 후 재시작')
+        self.restart_at[index] = now + delay
+
+        # 설정 교체 응답을 기다리는 중이면 바로 실패(apply_config가 apply_timeout까지 기다리지 않도록)
+        for reply in list(self.replies.values()) :
+            if reply[2] == index :
+                reply[1] = f'shard-{index} 프로세스 종료'
+                reply[0].set()
+
+        with self.lock :
+            jobs, self.lost_item_jobs[index] = self.lost_item_jobs[index], {}
+        self._fail_lost_item_jobs(jobs)
+
+    def _restart_shard(self, index : int) :
+        """같은 카메라 목록으로 샤드 다시 시작 후 착석 중인 좌석 감지 재개"""
+        self._reclaim_ring(index)
+        with self.lock :
+            self.commands[index], self.processes[index] = self._start_shard(index)
+            self.failures[index] += 1
+            self.restarts[index] += 1
+            self.restart_at[index] = None
+
+            tracked = 0
+            for seat_id, cam_id in self.seat_to_camera_map.items() :
+                if self.camera_to_shard[cam_id] != index :
+                    continue
+                current = self.event_manager.seat_states.get(seat_id)
+                if current and current["status"] == "OCCUPIED" :
+                    self.commands[index].put(("start_tracking", (seat_id, current["usage_id"])))
+                    tracked += 1
+        metrics.inc("camera_shard_restarts_total", shard=str(index))
+        print(f'[ShardedCameraManager] shard-{index} 재시작(착석 중인 좌석 {tracked}개 감지 재개)')
+
+    def _reclaim_ring(self, index : int) :
+        """
+        죽은 샤드가 꺼내 간 링 버퍼 슬롯 회수(슬롯을 채우다 죽으면 반납되지 않음)
+        - 결과 큐에 부모가 직접 응답을 넣고, _receive_loop가 그 앞의 메시지(죽은 샤드가 보낸 크롭)를 모두 처리하면 reset
+        - 시간 안에 처리되지 않으면 아직 반납될 슬롯이 있을 수 있으므로 회수하지 않음(중복 등록 방지)
+        """
+        with self.lock :
+            self.next_request += 1
+            request_id = self.next_request
+            self.replies[request_id] = [threading.Event(), None, None]
+        self.results.put(("reply", request_id, None))
+        drained = self.replies[request_id][0].wait(self.apply_timeout)
+        self.replies.pop(request_id, None)
+        if not drained :
+            print(f'[ShardedCameraManager] shard-{index} 링 버퍼 회수 건너뜀 : 결과 큐 처리 지연')
+            return
+
+        ring = self.rings[index]
+        try :
+            leaked = ring.slots - ring.free.qsize()
+        except NotImplementedError :
+            # macOS는 Queue.qsize 미지원
+            leaked = None
+        ring.reset(self.context.Queue())
+        if leaked :
+            print(f'[ShardedCameraManager] shard-{index} 링 버퍼 슬롯 {leaked}개 회수')
+
+    def get_camera_state(self, cam_id : str) -> str :
+        """샤드가 마지막으로 보고한 스트림 상태(샤드가 죽었거나 보고가 끊기면 down)"""
+        index = self.camera_to_shard[cam_id]
+        reported_at, status, _ = self.shard_reports.get(index, (None, [], {}))
+        if not self.processes[index].is_alive() or reported_at is None \
+                or time.monotonic() - reported_at > self.status_interval * 5 :
+            return DOWN
+        for camera in status :
+            if camera["cam_id"] == cam_id :
+                return camera["grabber"]["stream"]["state"]
+        return DOWN
+
+    def _receive_loop(self) :
+        """샤드에서 온 이벤트 / 크롭 이미지 / 상태 보고 처리"""
+        while True :
+            try :
+                message = self.results.get()
+            except (EOFError, OSError) :
+                # 종료 중 결과 큐가 닫힘(부모도 _reclaim_ring에서 결과 큐에 쓰므로 종료 시 파이프가 정리됨)
+                return
+            try :
+                kind = message[0]
+                if kind == "event" :
+                    self._on_lost_item_result(message[1])
+                    self.event_manager.push_event(message[1])
+
+                elif kind == "lost_item" :
+                    _, index, event, held, image = message
+                    self._on_lost_item_result(event)
+                    if held is None :
+                        self.event_manager.push_lost_item(event, image)
+                        continue
+                    # push_lost_item이 복사하므로 바로 슬롯 반납
+                    slot, shape, dtype = held
+                    ring = self.rings[index]
+                    try :
+                        self.event_manager.push_lost_item(event, ring.read(slot, shape, dtype))
+                    finally :
+                        ring.release(slot)
+
+                elif kind == "reply" :
+                    # 샤드 명령 응답 또는 _reclaim_ring이 넣은 표시
+                    _, request_id, error = message
+                    reply = self.replies.get(request_id)
+                    if reply is not None :
+                        reply[1] = error
+                        reply[0].set()
+
+                elif kind == "status" :
+                    _, index, status, gauges, snapshot = message
+                    self.shard_reports[index] = (time.monotonic(), status, gauges)
+                    # 상태를 보고할 만큼 떠 있으면 연속 재시작 backoff 초기화
+                    self.failures[index] = 0
+                    metrics.set_remote(f'shard-{index}', snapshot)
+            except Exception as exc :
+                print(f'[ShardedCameraManager] 샤드 메시지 처리 중 오류 : {exc}')
+
+    def _on_lost_item_result(self, event) :
+        """유실물 결과가 도착한 검사는 대기 목록에서 제거"""
+        if event.event_type == SeatEventType.LOST_ITEM :
+            for jobs in self.lost_item_jobs :
+                jobs.pop(event.usage_id, None)
+
+    def close(self) :
+        """샤드 종료 후 공유 메모리 해제"""
+        if self.closed :
+            return
+        self.closed = True
+        for process in self.processes :
+            if process.is_alive() :
+                process.terminate()
+        for process in self.processes :
+            process.join(timeout=5)
+        for ring in self.rings :
+            ring.close()
+
+    def get_status(self) :
+        status_list = []
+        for index, process in enumerate(self.processes) :
+            _, status, _ = self.shard_reports.get(index, (None, [], {}))
+            for camera in status :
+                status_list.append({**camera, "shard" : index, "shard_alive" : process.is_alive(),
+                                    "shard_restarts" : self.restarts[index]})
+        return status_list
+
+    def get_metrics(self) :
+        """샤드별 gauge 합치기(카메라 라벨이 없는 값은 shard 라벨을 붙여서 구분)"""
+        gauges = {}
+        now = time.monotonic()
+        for index, process in enumerate(self.processes) :
+            shard = {"shard" : str(index)}
+            gauges.setdefault("camera_shard_up", []).append((shard, int(process.is_alive())))
+
+            reported_at, _, shard_gauges = self.shard_reports.get(index, (None, [], {}))
+            if reported_at is None :
+                continue
+            gauges.setdefault("camera_shard_report_age_seconds", []).append((shard, round(now - reported_at, 3)))
+            for name, samples in shard_gauges.items() :
+                for labels, value in samples :
+                    gauges.setdefault(name, []).append((labels if "camera" in labels else {**labels, **shard}, value))
+        return gauges
+
+class _ShardEventSink :
+    """샤드 프로세스 안에서 SeatManager 대신 이벤트를 받아 부모로 전달"""
+    def __init__(self, index : int, results, ring : SharedRing) :
+        self.index = index
+        self.results = results
+        self.ring = ring
+
+    def push_event(self, event) :
+        self.results.put(("event", event))
+
+    def push_lost_item(self, event, image) :
+        held = self.ring.write(image)
+        if held is None :
+            # 빈 슬롯이 없거나 슬롯보다 큰 이미지는 큐로 직접 전달(큐는 나중에 pickle하므로 복사)
+            self.results.put(("lost_item", self.index, event, None, image.copy()))
+            return
+        self.results.put(("lost_item", self.index, event, held, None))
+
+def _shard_main(index, camera_configs, inference_config, governor_config, occupancy_config, stream_config,
+                decoder_config, models_config, commands, results, ring, threads, status_interval) :
+    """샤드 프로세스 진입점 : CameraManager 실행 후 부모 명령 처리"""
+    # 프로세스끼리 코어를 나눠 쓰도록 스레드 수 제한
+    cv2.setNumThreads(threads)
+    try :
+        import torch
+        torch.set_num_threads(threads)
+    except ImportError :
+        pass
+
+    if "lost_item_idle_timeout" in models_config :
+        model_registry.configure("lost_item", models_config["lost_item_idle_timeout"])
+
+    manager = CameraManager(camera_configs, _ShardEventSink(index, results, ring),
+                            inference_config=inference_config,
+                            governor_config={**governor_config, "cpu_count" : threads},
+                            occupancy_config=occupancy_config,
+                            stream_config=stream_config,
+                            decoder_config=decoder_config)
+
+    def report_loop() :
+        while True :
+            results.put(("status", index, manager.get_status(), manager.get_metrics(), metrics.snapshot()))
+            time.sleep(status_interval)
+
+    threading.Thread(target=report_loop, daemon=True).start()
+
+    while True :
+        # (method, args) 또는 응답이 필요한 명령은 (method, args, request id)
+        method, args, *request = commands.get()
+        error = None
+        try :
+            getattr(manager, method)(*args)
+        except Exception as exc :
+            error = str(exc)
+            print(f'[camera-shard-{index}] {method}{args} 처리 중 오류 : {exc}')
+        if request :
+            results.put(("reply", request[0], error))
@@ -1,12 +1,20 @@
 import cv2
+import numpy as np
 import threading
 import time
-from base64 import b64encode
 from datetime import datetime
-from ultralytics import YOLO
+from vision.frame_grabber import FrameGrabber
+from vision.metrics import metrics
+from vision.model_registry import model_registry
+from vision.motion_gate import MotionGate
+from vision.occupancy_engine import OccupancyEngine
+from vision.person_tracker import PersonTracker
 from vision.schemas.schemas import SeatEvent, SeatEventType
-from vision.seat_state_machine import SeatStateMachine
-from vision.utils.detectors import detect_person_boxes, detect_loss_items
+from vision.utils.detectors import detect_loss_items_batch
+from vision.utils.roi_crops import union_region, tile_regions
+
+# 분석 지연 히스토그램 버킷(초)
+LAG_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0)
 
 ##########################################################################
 # 카메라 객체
@@ -14,133 +22,445 @@ from vision.utils.detectors import detect_person_boxes, detect_loss_items
 # - 프레임 캡쳐
 ##########################################################################
 class CameraWorker :
-    def __init__(self, camera_id, source, seat_rois, event_manager) :
+    def __init__(self, camera_id, source, seat_rois, event_manager,
+                 inference_mode = "full", roi_margin = 0.2, motion_gate = None,
+                 detector_backend = "torch", occupancy = None, stream = None, decoder = None,
+                 tracker = None) :
         """
         :param camera_id: 카메라 고유 id
         :param source: 영상 소스
         :param seat_rois: {seat_id : (x1, y1, x2, y2)}
         :param event_manager: SeatEventManager
+        :param inference_mode: "full"(전체 프레임) | "roi_union"(ROI 합집합) | "roi_tiles"(ROI 묶음별 크롭)
+        :param roi_margin: 크롭 시 ROI 확장 비율
+        :param motion_gate: MotionGate 설정 dict({"enabled", "threshold", "refresh_interval", "downscale_width"}), None이면 사용 안 함
+        :param detector_backend: 사람 / 유실물 모델 추론 백엔드 "torch" | "onnx" | "openvino"
+        :param occupancy: OccupancyEngine 판정 설정 dict({"threshold"} 또는 {"dwell_seconds", "min_ratio"}), None이면 기본값
+        :param stream: StreamSupervisor 재연결 설정 dict({"degraded_after", "stall_timeout", "base_backoff", "max_backoff"})
+        :param decoder: 디코더 설정 dict({"backend" : "opencv" | "ffmpeg", "width", "mode", "fps", ...}), None이면 opencv
+        :param tracker: PersonTracker 설정 dict({"enabled", "detect_interval", "iou_threshold", "max_coast"}), None이면 사용 안 함
         """
         # 카메라 기본 정보
         self.camera_id = camera_id
         self.source = source
-        self.cap = cv2.VideoCapture(source)
+        # 디코딩은 FrameGrabber 스레드가 담당(최신 프레임만 유지)
+        self.grabber = FrameGrabber(source, camera_id=camera_id, stream=stream, decoder=decoder)
         self.event_manager = event_manager # 카메라 이벤트를 처리하기 위한 이벤트 관리 객체
         self.seat_rois = seat_rois
 
-        # 좌석 별 상태머신 설정
-        self.state_machines = {}
-        for seat_id, roi in seat_rois.items():
-            pixel_roi = self._to_pixel_roi(roi)
-            self.state_machines[seat_id] = SeatStateMachine(seat_id, pixel_roi)
+        # 좌석 상태 판정(모든 좌석을 배열로 관리)
+        self.occupancy_config = occupancy or {}
+        self.occupancy = OccupancyEngine({seat_id : self._to_pixel_roi(roi) for seat_id, roi in seat_rois.items()},
+                                         **self.occupancy_config)
+        self.roi_frame_size = None
+        # 좌석 ROI 교체(update_rois) 횟수 : 교체 전에 시작한 추론 결과는 버림
+        self.rois_version = 0
+        self.cycle_version = 0
+
+        # 추론 영역 설정
+        self.inference_mode = inference_mode
+        self.roi_margin = roi_margin
+        self.region_cache = (None, None)
+
+        # 화면 변화가 있는 좌석만 추론(모션 게이트)
+        motion_gate = dict(motion_gate or {})
+        self.motion_gate = MotionGate(**motion_gate) if motion_gate.pop("enabled", False) else None
+        self.infer_mask = self.occupancy.mask([])
+
+        # 사람 추적(감지는 N 프레임마다, 사이 프레임은 예측 bbox로 판정)
+        tracker = dict(tracker or {})
+        self.tracker = PersonTracker(camera_id=camera_id, **tracker) if tracker.pop("enabled", False) else None
 
         # 자리마다 usage_id 저장
         self.usage_ids = {seat_id : None for seat_id in seat_rois.keys()}
 
-        # 모드 플래그
-        self.tracking_enabled = False
-        self.lost_item_mode = False
-        self.lost_item_target_seat_id = None
+        # 감지 중인 좌석(비어 있으면 추론 없이 디코딩만 하는 heartbeat 모드)
+        self.active_seats = set()
+        self.active_mask = self.occupancy.mask([])
+        self.active_lock = threading.Lock()
+
+        # 추론 엔진이 마지막으로 가져간 프레임 번호 / 잡고 있는 버퍼
+        self.consumed_seq = 0
+        self.inference_slot = None
+        self.inference_frame_time = None
 
-        # Yolo 모델
-        self.person_model = YOLO("app/vision/models/yolo11n.pt")
-        self.lost_item_model = YOLO("app/vision/models/semi_yolo_model.pt")
+        # 유실물 검사 요청 큐(쌓인 요청은 같은 프레임으로 한 번에 추론)
+        self.lost_item_jobs = []
+        self.lost_item_lock = threading.Lock()
+        self.lost_item_requested = threading.Event()
 
-        # 메인 루프 시작
+        # Yolo 모델은 InferenceEngine(사람) / model_registry(유실물)가 백엔드별로 공유
+        self.detector_backend = detector_backend
+
+        # 디코딩 / 메인 루프 시작
+        self.running = True
+        self.grabber.set_heartbeat(True)
+        self.grabber.start()
         threading.Thread(target=self._loop, daemon=True).start()
 
-    def start_tracking(self, seat_id, usage_id) :
-        """입실 요청 시 checkin-out 탐지 플래그 업데이트"""
-        self.tracking_enabled = True
+    def stop(self, wait : float | None = None) :
+        """
+        카메라 제거 시 : 디코딩 / 유실물 루프 종료, 남은 유실물 검사 요청은 검사 불가로 완료 처리
+        :param wait: 캡처 해제까지 기다릴 최대 시간(초), 같은 장치를 바로 다시 열 때 사용
+        """
+        self.running = False
+        with self.active_lock :
+            # 진행 중인 추론 결과도 버림
+            self.active_seats.clear()
+            self.active_mask = self.occupancy.mask([])
+            self.rois_version += 1
+        self.grabber.stop(wait)
+        self.lost_item_requested.set()
+
+    def update_rois(self, seat_rois) :
+        """
+        설정 변경 시 좌석 ROI 교체(좌석 추가 / 삭제 포함)
+        새 OccupancyEngine을 만들어서 남아 있는 좌석의 판정 상태를 이어받은 뒤 한 번에 교체
+        :return: 감지 중이었는데 설정에서 빠진 좌석 목록
+        """
+        occupancy = OccupancyEngine({seat_id : self._to_pixel_roi(roi, self.roi_frame_size)
+                                     for seat_id, roi in seat_rois.items()}, **self.occupancy_config)
+        changed = [seat_id for seat_id, roi in seat_rois.items() if self.seat_rois.get(seat_id) != roi]
+
+        with self.active_lock :
+            occupancy.inherit(self.occupancy)
+            removed = sorted(self.active_seats - seat_rois.keys())
+            self.active_seats -= set(removed)
+            self.seat_rois = seat_rois
+            self.occupancy = occupancy
+            self.active_mask = occupancy.mask(self.active_seats)
+            self.infer_mask = occupancy.mask([])
+            self.region_cache = (None, None)
+            self.usage_ids = {seat_id : self.usage_ids.get(seat_id) for seat_id in seat_rois.keys()}
+            self.rois_version += 1
+            if not self.active_seats :
+                self.grabber.set_heartbeat(True)
+
+        # ROI가 바뀐 좌석은 다음 프레임에서 바로 추론
+        if self.motion_gate is not None :
+            for seat_id in changed + removed :
+                self.motion_gate.forget(seat_id)
+        print(f'[{self.camera_id}] 좌석 ROI 교체(변경 {changed}, 감지 중 제거 {removed})')
+        return removed
+
+    @property
+    def cap(self) :
+        """현재 캡처 객체(재연결 시 FrameGrabber가 교체)"""
+        return self.grabber.cap
+
+    @property
+    def frames_per_detection(self) :
+        """감지 1번으로 판정하는 프레임 수(추적기 사용 시 detect_interval)"""
+        return self.tracker.detect_interval if self.tracker is not None else 1
+
+    @property
+    def tracking_enabled(self) :
+        """감지 중인 좌석이 하나라도 있는지"""
+        return bool(self.active_seats)
+
+    def start_tracking(self, seat_id, usage_id, reset = True) :
+        """
+        입실 요청 시 해당 좌석을 감지 대상에 추가
+        :param reset: False면 판정 상태 유지(설정 교체로 worker가 재시작되어 이어서 감지할 때)
+        """
         self.usage_ids[seat_id] = usage_id
+        with self.active_lock :
+            if reset :
+                self.occupancy.reset(seat_id)
+            self.active_seats.add(seat_id)
+            self.active_mask = self.occupancy.mask(self.active_seats)
+            self.grabber.set_heartbeat(False)
         print(f'[{self.camera_id}] Tracking Start(seat {seat_id}, usage {usage_id})')
 
+    def stop_tracking(self, seat_id) :
+        """퇴실 / 자동 퇴실 시 해당 좌석만 감지 대상에서 제거"""
+        with self.active_lock :
+            self.active_seats.discard(seat_id)
+            self.active_mask = self.occupancy.mask(self.active_seats)
+            self.occupancy.reset(seat_id)
+            # 감지할 좌석이 없으면 heartbeat 모드
+            if not self.active_seats :
+                self.grabber.set_heartbeat(True)
+        if self.motion_gate is not None :
+            self.motion_gate.forget(seat_id)
+        print(f'[{self.camera_id}] Tracking Stop(seat {seat_id})')
+
     def start_lost_item_check(self, seat_id, usage_id) :
-        """퇴실 요청 시 유실물 탐지 플래그 업데이트"""
-        self.tracking_enabled = False
-        self.lost_item_mode = True
-        self.lost_item_target_seat_id = seat_id
+        """퇴실 요청 시 해당 좌석 감지 종료 후 유실물 검사 요청 추가"""
+        self.stop_tracking(seat_id)
         self.usage_ids[seat_id] = usage_id
+        # 요청 이후에 들어온 프레임으로 검사
+        job = {"seat_id" : seat_id, "usage_id" : usage_id, "after_seq" : self.grabber.latest_seq}
+        with self.lost_item_lock :
+            self.lost_item_jobs.append(job)
+        self.grabber.request_frame()
+        self.lost_item_requested.set()
 
     def _loop(self) :
-        """ 메인 루프 """
+        """ 메인 루프 : 착석 / 이탈 감지는 InferenceEngine이 처리하고 여기서는 유실물만 처리 """
         while True :
-            ret, frame = self.cap.read()
-            if not ret :
-                time.sleep(0.01)
+            self.lost_item_requested.wait()
+            self.lost_item_requested.clear()
+
+            # 쌓인 요청을 모두 꺼내서 같은 프레임으로 처리
+            with self.lost_item_lock :
+                jobs, self.lost_item_jobs = self.lost_item_jobs, []
+            if not self.running :
+                self._fail_lost_item_jobs(jobs)
+                return
+            if not jobs :
                 continue
 
-            # 착석 / 이탈 감지(연속)
-            if self.tracking_enabled :
-                person_boxes = detect_person_boxes(self.person_model, frame)
+            after_seq = max(job["after_seq"] for job in jobs)
+            held = self.grabber.wait_for_frame(after_seq, timeout=5)
+            if held is None :
+                print(f'[{self.camera_id}] 유실물 감지용 프레임 수신 실패(seat {[job["seat_id"] for job in jobs]})')
+                self._fail_lost_item_jobs(jobs)
+                continue
 
-                for seat_id, machine in self.state_machines.items() :
-                    event = machine.update(person_boxes)
+            slot, _, frame = held
+            finished = []
+            try :
+                with metrics.measure("lost_item", self.camera_id) :
+                    self._run_lost_item_detection(frame, jobs, finished)
+                metrics.inc("camera_lost_item_runs_total", camera=self.camera_id)
+                metrics.inc("camera_lost_item_jobs_total", len(jobs), camera=self.camera_id)
+            except Exception as exc :
+                print(f'[{self.camera_id}] 유실물 감지 중 오류 : {exc}')
+                # 결과를 아직 보내지 않은 요청은 검사 실패로 완료 처리
+                self._fail_lost_item_jobs([job for job in jobs if not any(job is done for done in finished)],
+                                          camera_down=False)
+            finally :
+                self.grabber.release(slot)
 
-                    if event :
-                        event.camera_id = self.camera_id
-                        event.usage_id = self.usage_ids.get(seat_id)
-                        self.event_manager.push_event(event)
-            
-            # 유실물 감지(one-shot)
-            if self.lost_item_mode :
-                self._run_lost_item_detection(frame)
-                self.lost_item_mode = False
+    def _fail_lost_item_jobs(self, jobs, camera_down = True) :
+        """
+        결과를 기다리는 웹 서버가 타임아웃까지 기다리지 않도록 검사 불가로 바로 완료 처리
+        :param camera_down: True면 프레임을 받지 못함(스트림 끊김 / 카메라 제거), False면 검사 중 오류
+        """
+        for job in jobs :
+            self.event_manager.push_event(SeatEvent(
+                seat_id=job["seat_id"],
+                event_type=SeatEventType.LOST_ITEM,
+                detected_at=datetime.now(),
+                usage_id=job["usage_id"],
+                camera_id=self.camera_id,
+                items=[],
+                camera_down=camera_down,
+                detection_failed=not camera_down
+            ))
 
-    # 유실물 감지 로직
-    def _run_lost_item_detection(self, frame) :
-        seat_id = self.lost_item_target_seat_id
-        if seat_id is None :
-            print(f'[{self.camera_id}] lost_item_target_seat_id 없음')
+    def take_frame_for_inference(self) :
+        """추론 엔진이 호출 : 아직 분석하지 않은 최신 프레임 반환(없으면 None), 복사 없이 버퍼를 잡아둠"""
+        if not self.tracking_enabled :
+            return None
+
+        held = self.grabber.acquire(after_seq=self.consumed_seq)
+        if held is None :
+            return None
+
+        self.inference_slot, self.consumed_seq, frame = held
+        self.inference_frame_time = self.grabber.frame_time(self.inference_slot)
+
+        with self.active_lock :
+            self.cycle_version = self.rois_version
+            # 실제 프레임 해상도 기준으로 픽셀 ROI 보정
+            frame_size = frame.shape[:2]
+            if frame_size != self.roi_frame_size :
+                self.occupancy.set_rois({seat_id : self._to_pixel_roi(roi, frame_size)
+                                         for seat_id, roi in self.seat_rois.items()})
+                self.roi_frame_size = frame_size
+                self.region_cache = (None, None)
+
+        return frame
+
+    def needs_inference(self, frame) :
+        """
+        추론 엔진이 호출 : 모션 게이트로 이번 프레임에서 추론할 좌석 선택
+        변화가 없는 좌석은 "변화 없음"으로 상태머신 업데이트, 추론할 좌석이 없으면 False
+        추적기 사용 시 감지 주기가 아닌 프레임은 예측 bbox로 판정하고 False
+        """
+        with self.active_lock :
+            # 프레임을 가져온 뒤 ROI가 교체되었으면 이번 프레임은 건너뜀
+            if self.cycle_version != self.rois_version :
+                return False
+            active = self.active_mask.copy()
+            occupancy = self.occupancy
+
+        if self.motion_gate is None :
+            self.infer_mask = active
+            if not active.any() :
+                return False
+            if self.tracker is not None and not self.tracker.detection_due(self._frame_time()) :
+                self._update_from_tracks()
+                return False
+            return True
+
+        # 입/퇴실 판정 중인 좌석은 항상 추론
+        active_ids = [occupancy.seat_ids[i] for i in np.flatnonzero(active)]
+        forced = set(occupancy.pending_seats(active))
+        selected = self.motion_gate.select(frame, active_ids, occupancy.rois[active], time.monotonic(), forced)
+        self.infer_mask = occupancy.mask(selected)
+
+        if selected :
+            return True
+
+        self._step_occupancy(lambda occupancy, active : occupancy.update_unchanged(active, self.inference_frame_time))
+        return False
+
+    def inference_regions(self, frame_shape) :
+        """
+        추론 엔진이 호출 : 이번 프레임에서 추론할 영역 목록
+        :return: [(x1, y1, x2, y2), ...] | None(전체 프레임)
+        """
+        if self.inference_mode == "full" :
+            return None
+
+        with self.active_lock :
+            # ROI가 교체된 프레임은 결과를 버리므로 전체 프레임으로 처리
+            if self.cycle_version != self.rois_version :
+                return None
+            occupancy = self.occupancy
+            infer_mask = self.infer_mask
+
+        # 추론 좌석 / 해상도가 그대로면 이전 계산 재사용
+        key = (infer_mask.tobytes(), frame_shape[:2])
+        if self.region_cache[0] == key :
+            return self.region_cache[1]
+
+        rois = occupancy.rois[infer_mask].tolist()
+        if self.inference_mode == "roi_tiles" :
+            regions = tile_regions(rois, frame_shape, self.roi_margin)
+        else :
+            regions = union_region(rois, frame_shape, self.roi_margin)
+
+        self.region_cache = (key, regions)
+        return regions
+
+    def release_inference_frame(self) :
+        """추론 엔진이 호출 : 분석이 끝난 버퍼 반납"""
+        if self.inference_slot is not None :
+            self.grabber.release(self.inference_slot)
+            self.inference_slot = None
+
+    def has_pending_transition(self) :
+        """입/퇴실 판정 중(counter > 0)인 좌석이 있는지"""
+        with self.active_lock :
+            active = self.active_mask.copy()
+            occupancy = self.occupancy
+        return occupancy.has_pending(active)
+
+    def on_person_boxes(self, person_boxes) :
+        """
+        추론 엔진이 호출 : 감지 중인 좌석만 착석 / 이탈 감지(연속)
+        :param person_boxes: (B, 4) 사람 bbox 배열
+        """
+        with self.active_lock :
+            # 추론 중에 ROI가 교체되었으면 결과를 버림(새 엔진과 좌석 순서가 다를 수 있음)
+            if self.cycle_version != self.rois_version :
+                return
+            infer_mask = self.infer_mask
+
+        if self.tracker is not None :
+            # 감지 bbox로 추적 갱신, 잠깐 감지되지 않은 사람도 예측 bbox로 포함
+            regions = self.region_cache[1] if self.inference_mode != "full" else None
+            person_boxes = self.tracker.update(person_boxes, self._frame_time(), regions)
+
+        self._step_occupancy(lambda occupancy, active :
+                             occupancy.update(person_boxes, active, infer_mask, self.inference_frame_time))
+
+        # 프레임 디코딩 ~ 판정 완료까지 지연
+        if self.inference_frame_time is not None :
+            metrics.observe("camera_analysis_lag_seconds", time.monotonic() - self.inference_frame_time,
+                            buckets=LAG_BUCKETS, camera=self.camera_id)
+
+    def _update_from_tracks(self) :
+        """감지하지 않는 프레임 : 추적기 예측 bbox로 감지 중인 좌석 판정"""
+        boxes = self.tracker.predict(self._frame_time())
+        self._step_occupancy(lambda occupancy, active :
+                             occupancy.update(boxes, active, active, self.inference_frame_time))
+
+    def _step_occupancy(self, step) :
+        """
+        판정 갱신 step(occupancy, active)을 active_lock 안에서 실행
+        - 입실 / 퇴실의 occupancy.reset과 섞이지 않도록(이전 이용자의 판정 상태가 되살아나지 않음)
+        - 지금 감지 중인 좌석만 갱신(프레임을 가져온 뒤 감지 종료된 좌석 제외)
+        - 프레임을 가져온 뒤 ROI가 교체되었으면 건너뜀
+        """
+        with self.active_lock :
+            if self.cycle_version != self.rois_version :
+                return
+            with metrics.measure("roi_match", self.camera_id) :
+                events = step(self.occupancy, self.active_mask)
+        self._emit_events(events)
+
+    def _frame_time(self) :
+        return self.inference_frame_time if self.inference_frame_time is not None else time.monotonic()
+
+    def _emit_events(self, events) :
+        """상태가 바뀐 좌석의 이벤트만 전달"""
+        if not events :
             return
-        
-        roi = self.seat_rois[seat_id]
-        if roi is None :
-            print(f'[{self.camera_id}] ROI 존재하지 않음')
+        with metrics.measure("emit", self.camera_id) :
+            for event in events :
+                event.camera_id = self.camera_id
+                event.usage_id = self.usage_ids.get(event.seat_id)
+                self.event_manager.push_event(event)
+                metrics.inc("camera_events_total", camera=self.camera_id, type=event.event_type.value)
+
+    # 유실물 감지 로직
+    def _run_lost_item_detection(self, frame, jobs, finished) :
+        """
+        요청된 좌석 ROI 크롭들을 한 번에 추론하고 요청마다 LOST_ITEM 이벤트 전달
+        :param finished: 이벤트를 전달한 요청을 추가할 목록(중간에 오류가 나면 나머지만 실패 처리)
+        """
+        frame_size = frame.shape[:2]
+
+        targets = []
+        for job in jobs :
+            roi = self.seat_rois.get(job["seat_id"])
+            if roi is None :
+                print(f'[{self.camera_id}] ROI 존재하지 않음(seat {job["seat_id"]})')
+                self._fail_lost_item_jobs([job], camera_down=False)
+                finished.append(job)
+                continue
+            x1, y1, x2, y2 = self._to_pixel_roi(roi, frame_size)
+            targets.append((job, (x1, y1), frame[y1:y2, x1:x2]))
+        if not targets :
             return
 
-        h, w, _ = frame.shape
+        with model_registry.use("lost_item", self.detector_backend) as lost_item_model :
+            items_per_crop = detect_loss_items_batch(lost_item_model, [crop for _, _, crop in targets])
 
-        # 정규화된 ROI라면 픽셀로 변환
-        if max(roi) <= 1.0:
-            x1 = int(roi[0] * w)
-            y1 = int(roi[1] * h)
-            x2 = int(roi[2] * w)
-            y2 = int(roi[3] * h)
-        else:
-            x1, y1, x2, y2 = map(int, roi)
-
-        crop = frame[y1:y2, x1:x2]
-
-        items = detect_loss_items(self.lost_item_model, crop)
-        print(items)
-        # 전체 좌표로 역변환
-        for item in items:
-            bx1, by1, bx2, by2 = item["box"]
-            item["box"] = (bx1 + x1, by1 + y1, bx2 + x2, by2 + y2)
-        
-        # 이미지를 외부로 전달하기 위해 base64 encode
-        image_base64 = None
-        if len(items) > 0 :
-            ok, buf = cv2.imencode(".jpg", crop)
-            if ok :
-                image_base64 = b64encode(buf).decode("utf-8")
-
-        event = SeatEvent(
-            seat_id=seat_id,
-            event_type=SeatEventType.LOST_ITEM,
-            detected_at=datetime.now(),
-            usage_id=self.usage_ids.get(seat_id),
-            camera_id=self.camera_id,
-            items=items,
-            image_base64=image_base64
-        )
-
-        self.event_manager.push_event(event)
-    def _to_pixel_roi(self, roi):
+        for (job, (x1, y1), crop), items in zip(targets, items_per_crop) :
+            # 전체 좌표로 역변환
+            for item in items :
+                bx1, by1, bx2, by2 = item["box"]
+                item["box"] = (bx1 + x1, by1 + y1, bx2 + x1, by2 + y1)
+
+            event = SeatEvent(
+                seat_id=job["seat_id"],
+                event_type=SeatEventType.LOST_ITEM,
+                detected_at=datetime.now(),
+                usage_id=job["usage_id"],
+                camera_id=self.camera_id,
+                items=items
+            )
+
+            if len(items) == 0 :
+                self.event_manager.push_event(event)
+            else :
+                # 크롭 이미지와 같이 전달(인코딩 후 이벤트 처리)
+                self.event_manager.push_lost_item(event, crop)
+            finished.append(job)
+
+    def _to_pixel_roi(self, roi, frame_size=None):
         if max(roi) <= 1.0:
-            width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-            height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+            if frame_size is not None:
+                height, width = frame_size
+            else:
+                width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+                height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
             if not width or not height:
                 # 기본 FHD에 맞춰 임시 변환
                 width, height = 1920, 1080
@@ -149,4 +469,6 @@ class CameraWorker :
             x2 = int(roi[2] * width)
             y2 = int(roi[3] * height)
             return (x1, y1, x2, y2)
-        return tuple(map(int, roi))
+        # 디코딩 단계에서 축소한 경우(FFmpegCapture) 원본 해상도 기준 픽셀 ROI도 같은 배율로 축소
+        scale = getattr(self.cap, "output_scale", 1.0)
+        return tuple(int(v * scale) for v in roi)
@@ -0,0 +1,87 @@
+import os
+import threading
+import time
+
+##########################################################################
+# 설정 파일 감시
+# - interval마다 파일 수정 시각 / 크기를 확인하고 바뀌었으면 다시 읽어서 on_change(설정) 호출
+#   (camera_manager.apply_config : 바뀐 카메라 / 좌석 ROI만 교체)
+# - 읽기 실패(저장 중인 파일, 잘못된 JSON 등)는 기존 설정 유지, 파일이 다시 바뀌면 재시도
+##########################################################################
+
+class ConfigWatcher :
+    def __init__(self, path : str, loader, on_change, interval : float = 2.0) :
+        """
+        :param path: 감시할 설정 파일 경로
+        :param loader: loader(path) -> 설정(load_camera_config)
+        :param on_change: on_change(설정) -> 변경 요약, 파일이 바뀌었을 때 호출
+        :param interval: 확인 주기(초)
+        """
+        self.path = path
+        self.loader = loader
+        self.on_change = on_change
+        self.interval = interval
+
+        # 마지막으로 적용한 / 실패한 파일 (수정 시각, 크기)
+        self.applied = self._signature()
+        self.failed = None
+        self.running = False
+        self.last_error = None
+        self.last_summary = None
+        self.last_reload_at = None
+        self.stats = {
+            "reloads" : 0,
+            "failures" : 0
+        }
+
+    def start(self) :
+        """감시 루프 시작(백그라운드 실행)"""
+        self.running = True
+        threading.Thread(target=self._loop, daemon=True).start()
+
+    def stop(self) :
+        self.running = False
+
+    def _signature(self) :
+        try :
+            stat = os.stat(self.path)
+        except OSError :
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _loop(self) :
+        while self.running :
+            time.sleep(self.interval)
+            self.check()
+
+    def check(self) :
+        """파일이 바뀌었으면 다시 읽어서 적용"""
+        signature = self._signature()
+        if signature is None or signature in (self.applied, self.failed) :
+            return
+
+        try :
+            config = self.loader(self.path)
+            self.last_summary = self.on_change(config)
+        except Exception as exc :
+            self.failed = signature
+            self.last_error = str(exc)
+            self.stats["failures"] += 1
+            print(f'[ConfigWatcher] {self.path} 적용 실패(기존 설정 유지) : {exc}')
+            return
+
+        self.applied = signature
+        self.failed = None
+        self.last_error = None
+        self.last_reload_at = time.time()
+        self.stats["reloads"] += 1
+
+    def get_status(self) :
+        return {
+            "path" : self.path,
+            "interval" : self.interval,
+            "last_reload_at" : self.last_reload_at,
+            "last_summary" : self.last_summary,
+            "last_error" : self.last_error,
+            **self.stats
+        }
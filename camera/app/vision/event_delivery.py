@@ -0,0 +1,189 @@
+import asyncio
+import random
+import threading
+import time
+import httpx
+from vision.metrics import metrics
+
+##########################################################################
+# 이벤트 전송기
+# - SeatManager 이벤트 루프와 분리된 별도 스레드의 asyncio 루프에서 전송
+# - 카메라 서버(/camera/event)를 거치지 않고 웹서버(/ai/checktime/batch)로 바로 전송
+# - keep-alive 연결 풀(httpx.AsyncClient) 재사용
+# - batch_window 동안 모인 이벤트를 한 번에 전송
+# - 실패한 배치는 지수 backoff로 재시도(재시도 중에도 새 이벤트는 계속 전송)
+# - 400 / 422(잘못된 이벤트)는 배치를 반씩 나눠 다시 보내서 문제 이벤트만 버림
+#   그 외 4xx(404 / 401 / 403 등 배포 / 설정 문제)는 재시도, 포기해도 outbox에 남음
+##########################################################################
+
+# 전송 배치 크기 히스토그램 버킷
+DELIVERY_BATCH_BUCKETS = (1, 2, 5, 10, 20, 50, 100)
+
+# 1회 전송 결과
+SENT = "sent"         # 웹서버가 받음
+RETRY = "retry"       # 연결 실패 / 5xx / 429 / 그 외 4xx : 같은 배치 재시도
+INVALID = "invalid"   # 400 / 422 : 배치 안에 웹서버가 처리할 수 없는 이벤트가 있음
+INVALID_STATUS = (400, 422)
+
+class EventDelivery :
+    def __init__(self, backend_url : str = "http://localhost:8000",
+                 batch_window : float = 0.2,
+                 max_batch_size : int = 50,
+                 max_retries : int = 8,
+                 base_backoff : float = 0.5,
+                 max_backoff : float = 30.0,
+                 max_in_flight : int = 4,
+                 timeout : float = 3.0) :
+        """
+        :param backend_url: 웹서버 주소
+        :param batch_window: 첫 이벤트 이후 배치로 묶어서 기다리는 시간(초)
+        :param max_batch_size: 한 번에 보내는 최대 이벤트 수
+        :param max_retries: 배치당 최대 재시도 횟수(넘으면 버림)
+        :param base_backoff: 첫 재시도 대기(초), 재시도마다 2배
+        :param max_backoff: 재시도 대기 상한(초)
+        :param max_in_flight: 동시에 전송 / 재시도 중인 배치 수 상한
+        :param timeout: 요청 타임아웃(초)
+        """
+        self.url = f'{backend_url.rstrip("/")}/ai/checktime/batch'
+        self.batch_window = batch_window
+        self.max_batch_size = max_batch_size
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.max_in_flight = max_in_flight
+        self.timeout = timeout
+
+        # 전송 결과 콜백(EventOutbox가 설정) : 웹서버가 받음(처리할 수 없어 버린 이벤트 포함) / 재시도 포기
+        self.on_delivered = None
+        self.on_dropped = None
+
+        self.loop = None
+        self.queue = None
+        self.ready = threading.Event()
+        self.stats = {
+            "submitted" : 0,
+            "delivered" : 0,
+            "rejected" : 0,
+            "dropped" : 0,
+            "retries" : 0,
+            "batches" : 0,
+            "in_flight" : 0
+        }
+
+    def start(self) :
+        """전송 루프 시작(백그라운드 실행)"""
+        threading.Thread(target=self._run, daemon=True).start()
+        self.ready.wait()
+
+    def submit(self, payload : dict) :
+        """다른 스레드에서 호출 : 전송할 이벤트 추가(바로 반환)"""
+        self.stats["submitted"] += 1
+        self.loop.call_soon_threadsafe(self.queue.put_nowait, (payload, time.monotonic()))
+
+    def _run(self) :
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.queue = asyncio.Queue()
+        self.ready.set()
+        self.loop.run_until_complete(self._deliver_loop())
+
+    async def _deliver_loop(self) :
+        limits = httpx.Limits(max_connections=self.max_in_flight, max_keepalive_connections=self.max_in_flight)
+        slots = asyncio.Semaphore(self.max_in_flight)
+        async with httpx.AsyncClient(timeout=self.timeout, limits=limits) as client :
+            while True :
+                batch = await self._collect()
+                await slots.acquire()
+                task = asyncio.create_task(self._send_with_retry(client, batch))
+                task.add_done_callback(lambda _ : slots.release())
+
+    async def _collect(self) :
+        """첫 이벤트를 기다린 뒤 batch_window 동안(최대 max_batch_size개) 모음"""
+        batch = [await self.queue.get()]
+        deadline = self.loop.time() + self.batch_window
+        while len(batch) < self.max_batch_size :
+            remaining = deadline - self.loop.time()
+            if remaining <= 0 :
+                break
+            try :
+                batch.append(await asyncio.wait_for(self.queue.get(), remaining))
+            except asyncio.TimeoutError :
+                break
+        return batch
+
+    async def _send_with_retry(self, client, batch) :
+        self.stats["in_flight"] += 1
+        try :
+            for attempt in range(self.max_retries + 1) :
+                if attempt :
+                    self.stats["retries"] += 1
+                    metrics.inc("camera_event_delivery_retries_total")
+                    await asyncio.sleep(self._backoff(attempt))
+                result = await self._send(client, batch)
+                if result == SENT :
+                    if self.on_delivered is not None :
+                        self.on_delivered([payload for payload, _ in batch])
+                    return
+                if result == INVALID :
+                    await self._isolate_invalid(client, batch)
+                    return
+
+            self.stats["dropped"] += len(batch)
+            metrics.inc("camera_event_delivery_dropped_total", len(batch))
+            print(f'[EventDelivery] {len(batch)}건 전송 포기(재시도 {self.max_retries}회 초과)')
+            if self.on_dropped is not None :
+                self.on_dropped([payload for payload, _ in batch])
+        finally :
+            self.stats["in_flight"] -= 1
+
+    async def _isolate_invalid(self, client, batch) :
+        """거부된 배치 : 이벤트 1건이면 버리고(outbox에서 삭제), 아니면 반씩 나눠 다시 전송"""
+        if len(batch) == 1 :
+            self.stats["rejected"] += 1
+            metrics.inc("camera_event_delivery_rejected_total")
+            print(f'[EventDelivery] 웹 서버가 처리할 수 없는 이벤트 버림 : {batch[0][0]}')
+            # 다시 보내도 실패하므로 재전송 대상에서 제외
+            if self.on_delivered is not None :
+                self.on_delivered([batch[0][0]])
+            return
+        half = len(batch) // 2
+        await self._send_with_retry(client, batch[:half])
+        await self._send_with_retry(client, batch[half:])
+
+    def _backoff(self, attempt : int) -> float :
+        """지수 backoff + jitter"""
+        delay = min(self.max_backoff, self.base_backoff * 2 ** (attempt - 1))
+        return delay * random.uniform(0.5, 1.0)
+
+    async def _send(self, client, batch) -> str :
+        """배치 1회 전송 : SENT | RETRY | INVALID"""
+        try :
+            response = await client.post(self.url, json={"events" : [payload for payload, _ in batch]})
+        except httpx.HTTPError as exc :
+            print(f'[EventDelivery] 웹 서버 전달 실패 : {exc}')
+            return RETRY
+
+        if response.status_code in INVALID_STATUS :
+            print(f'[EventDelivery] 웹 서버가 배치 거부({len(batch)}건) : {response.status_code} {response.text}')
+            return INVALID
+
+        # 웹서버는 이벤트별 결과를 200으로 돌려주므로 그 외 오류는 배포 / 설정 문제 : 버리지 않고 재시도
+        if response.status_code >= 400 :
+            print(f'[EventDelivery] 웹 서버 응답 오류 : {response.status_code}')
+            return RETRY
+
+        now = time.monotonic()
+        self.stats["batches"] += 1
+        metrics.observe("event_delivery_batch_size", len(batch), buckets=DELIVERY_BATCH_BUCKETS)
+        self.stats["delivered"] += len(batch)
+        metrics.inc("camera_event_delivery_delivered_total", len(batch))
+        for _, submitted in batch :
+            metrics.observe("event_delivery_seconds", now - submitted)
+        return SENT
+
+    def get_status(self) :
+        return {
+            "url" : self.url,
+            "queued" : self.queue.qsize() if self.queue is not None else 0,
+            **self.stats
+        }
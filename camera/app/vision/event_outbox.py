@@ -0,0 +1,178 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from vision.metrics import metrics
+
+# 기본 DB 경로 : vision/data/event_outbox.db(camera/.gitignore에서 제외)
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "event_outbox.db")
+
+##########################################################################
+# 이벤트 outbox(SQLite WAL)
+# - 웹서버로 보낼 이벤트를 먼저 로컬 DB에 기록(commit)한 뒤 전송기(EventDelivery)에 넘김
+# - 기록은 writer 스레드가 commit_interval 동안 모아서 한 트랜잭션으로 처리(group commit)
+#   -> 호출하는 쪽(SeatManager 이벤트 루프)은 리스트에 넣고 바로 반환
+# - 웹서버가 받으면(ack) 삭제, 서버 / 웹서버 재시작 시 남은 이벤트를 순서대로 재전송
+# - event_id("usage_id:epoch:seq")로 웹서버가 중복 반영을 막음(idempotent)
+#   epoch는 DB 생성 시 한 번 만들어지므로 DB를 지워도 이전 event_id와 겹치지 않음
+##########################################################################
+
+class EventOutbox :
+    def __init__(self, delivery, path : str = DEFAULT_PATH,
+                 commit_interval : float = 0.02, redeliver_delay : float = 60.0) :
+        """
+        :param delivery: EventDelivery
+        :param path: SQLite 파일 경로
+        :param commit_interval: group commit 대기 시간(초)
+        :param redeliver_delay: 재시도를 모두 실패한 이벤트를 다시 전송하기까지의 대기(초)
+        """
+        self.delivery = delivery
+        self.path = path
+        self.commit_interval = commit_interval
+        self.redeliver_delay = redeliver_delay
+
+        # writer 스레드에 넘길 작업(추가할 payload / 삭제할 seq)
+        self.cond = threading.Condition()
+        self.pending = []
+        self.acked = []
+
+        self.epoch = None
+        self.ready = threading.Event()
+        self.stats = {
+            "appended" : 0,
+            "acked" : 0,
+            "replayed" : 0,
+            "redelivered" : 0,
+            "commits" : 0,
+            "backlog" : 0
+        }
+
+        # 전송 결과를 outbox로 받음
+        delivery.on_delivered = self.ack
+        delivery.on_dropped = self._redeliver_later
+
+    def start(self) :
+        """writer 시작 -> 전송기 시작 -> 남아 있던 이벤트 재전송"""
+        threading.Thread(target=self._writer_loop, daemon=True).start()
+        self.ready.wait()
+        self.delivery.start()
+        self._replay()
+
+    def append(self, payload : dict) :
+        """전송할 이벤트 추가(기록 / 전송은 writer 스레드가 처리)"""
+        with self.cond :
+            self.pending.append(payload)
+            self.cond.notify()
+
+    def ack(self, payloads) :
+        """전송기가 호출 : 웹서버가 받은 이벤트 삭제 요청"""
+        with self.cond :
+            self.acked.extend(self._seq(p) for p in payloads)
+            self.cond.notify()
+
+    def _seq(self, payload) -> int :
+        return int(payload["event_id"].rsplit(":", 1)[1])
+
+    def _event_id(self, payload, seq) -> str :
+        return f'{payload.get("usage_id")}:{self.epoch}:{seq}'
+
+    def _connect(self) :
+        directory = os.path.dirname(self.path)
+        if directory :
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=FULL")
+        conn.execute("""CREATE TABLE IF NOT EXISTS outbox (
+                            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                            payload TEXT NOT NULL,
+                            created_at REAL NOT NULL)""")
+        conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('epoch', ?)", (uuid.uuid4().hex[:12],))
+        conn.commit()
+        self.epoch = conn.execute("SELECT value FROM meta WHERE key = 'epoch'").fetchone()[0]
+        return conn
+
+    def _writer_loop(self) :
+        conn = self._connect()
+        self.stats["backlog"] = conn.execute("SELECT COUNT(*) FROM outbox").fetchone()[0]
+        self.ready.set()
+
+        while True :
+            with self.cond :
+                self.cond.wait_for(lambda : self.pending or self.acked)
+            # 잠깐 기다렸다가 그 사이 들어온 것까지 한 번에 commit
+            time.sleep(self.commit_interval)
+            with self.cond :
+                pending, self.pending = self.pending, []
+                acked, self.acked = self.acked, []
+
+            started = time.perf_counter()
+            try :
+                committed = self._commit(conn, pending, acked)
+            except sqlite3.Error as exc :
+                # 기록 실패 시 다음 commit에서 다시 시도
+                print(f'[EventOutbox] 기록 실패 : {exc}')
+                with self.cond :
+                    self.pending[:0] = pending
+                    self.acked.extend(acked)
+                time.sleep(1.0)
+                continue
+            metrics.observe("event_outbox_commit_seconds", time.perf_counter() - started)
+
+            # 기록이 끝난 이벤트만 전송
+            for payload in committed :
+                self.delivery.submit(payload)
+
+    def _commit(self, conn, pending, acked) :
+        committed = []
+        now = time.time()
+        with conn :
+            for payload in pending :
+                cursor = conn.execute("INSERT INTO outbox (payload, created_at) VALUES (?, ?)",
+                                      (json.dumps(payload, ensure_ascii=False), now))
+                committed.append({**payload, "event_id" : self._event_id(payload, cursor.lastrowid)})
+            if acked :
+                conn.executemany("DELETE FROM outbox WHERE seq = ?", [(seq,) for seq in acked])
+
+        self.stats["appended"] += len(pending)
+        self.stats["acked"] += len(acked)
+        self.stats["commits"] += 1
+        self.stats["backlog"] += len(pending) - len(acked)
+        return committed
+
+    def _replay(self) :
+        """재시작 시 전송되지 않은 이벤트를 기록 순서대로 재전송"""
+        conn = sqlite3.connect(self.path)
+        try :
+            rows = conn.execute("SELECT seq, payload FROM outbox ORDER BY seq").fetchall()
+        finally :
+            conn.close()
+
+        for seq, payload in rows :
+            payload = json.loads(payload)
+            self.delivery.submit({**payload, "event_id" : self._event_id(payload, seq)})
+        self.stats["replayed"] += len(rows)
+        if rows :
+            print(f'[EventOutbox] 미전송 이벤트 {len(rows)}건 재전송')
+
+    def _redeliver_later(self, payloads) :
+        """전송기가 재시도를 포기한 이벤트 : outbox에 남아 있으므로 잠시 후 다시 전송"""
+        def redeliver() :
+            self.stats["redelivered"] += len(payloads)
+            for payload in payloads :
+                self.delivery.submit(payload)
+
+        timer = threading.Timer(self.redeliver_delay, redeliver)
+        timer.daemon = True
+        timer.start()
+
+    def get_status(self) :
+        return {
+            "path" : self.path,
+            "epoch" : self.epoch,
+            **self.stats,
+            "delivery" : self.delivery.get_status()
+        }
@@ -0,0 +1,194 @@
+import re
+import shutil
+import subprocess
+import threading
+import cv2
+import numpy as np
+
+##########################################################################
+# FFmpeg 프레임 소스(cv2.VideoCapture 대신 FrameGrabber가 사용)
+# - ffmpeg 서브 프로세스가 디코딩 + 축소(scale)까지 하고 BGR raw 프레임을 pipe로 전달
+#   -> 분석에 쓰지 않는 원본 해상도 변환 / 복사를 디코딩 단계에서 생략
+# - mode : "all"(모든 프레임) | "keyframes"(키프레임만 디코딩) | "fps"(B 프레임은 건너뛰고 고정 fps로 줄여서 출력)
+# - read(buf)는 pipe에서 미리 할당된 버퍼로 바로 읽음(매 프레임 할당 없음)
+# - FrameGrabber가 쓰는 VideoCapture 메서드(read / grab / isOpened / get / set / release)만 제공
+##########################################################################
+
+MODES = ("all", "keyframes", "fps")
+
+# ffmpeg -i 출력에서 영상 스트림 해상도 / fps 추출
+STREAM_PATTERN = re.compile(r"Stream #.*?Video: .*?(\d{2,5})x(\d{2,5})")
+FPS_PATTERN = re.compile(r"(\d+(?:\.\d+)?) fps")
+
+class FFmpegCapture :
+    def __init__(self, source, width : int | None = 768,
+                 mode : str = "all",
+                 fps : float = 5.0,
+                 threads : int = 1,
+                 hwaccel : str | None = None,
+                 realtime : bool = False,
+                 timeout : float = 10.0,
+                 ffmpeg : str = "ffmpeg") :
+        """
+        :param source: 파일 경로 / rtsp 등 ffmpeg 입력
+        :param width: 출력 너비(px, 비율 유지), None이거나 원본보다 크면 원본 크기
+        :param mode: "all" | "keyframes" | "fps"
+        :param fps: mode="fps"일 때 출력 fps
+        :param threads: ffmpeg 디코딩 스레드 수
+        :param hwaccel: ffmpeg -hwaccel 값("auto", "cuda" 등), None이면 사용 안 함
+        :param realtime: 파일 입력을 원래 속도로 재생(-re, 테스트용)
+        :param timeout: 네트워크 입력 open / read timeout(초), 넘으면 ffmpeg가 종료되어 read() 실패
+        :param ffmpeg: ffmpeg 실행 파일 경로
+        """
+        if mode not in MODES :
+            raise ValueError(f'지원하지 않는 mode : {mode}')
+        self.source = str(source)
+        self.mode = mode
+        self.target_width = width
+        self.fps = fps
+        self.threads = threads
+        self.hwaccel = hwaccel
+        self.realtime = realtime
+        self.timeout = timeout
+        self.ffmpeg = ffmpeg
+
+        self.proc = None
+        self.width = 0
+        self.height = 0
+        self.source_fps = 0.0
+        # 원본 해상도 대비 출력 배율(원본 기준 픽셀 ROI 변환용)
+        self.output_scale = 1.0
+        self.last_error = None
+        self.scratch = None
+        self._start()
+
+    def _input_args(self) :
+        args = [self.ffmpeg, "-hide_banner", "-nostdin"]
+        if "://" in self.source :
+            # 네트워크 입력이 멈추면 timeout 후 종료(microseconds, rtsp는 socket timeout 옵션 이름이 다름)
+            timeout_us = str(int(self.timeout * 1_000_000))
+            if self.source.startswith("rtsp") :
+                args += ["-rtsp_transport", "tcp", "-timeout", timeout_us]
+            else :
+                args += ["-rw_timeout", timeout_us]
+        if self.hwaccel :
+            args += ["-hwaccel", self.hwaccel]
+        if self.mode == "keyframes" :
+            # 키프레임이 아닌 프레임은 디코더가 건너뜀
+            args += ["-skip_frame", "nokey"]
+        elif self.mode == "fps" :
+            # 어차피 fps 필터에서 버릴 프레임 : 다른 프레임이 참조하지 않는 B 프레임은 디코딩 생략
+            args += ["-skip_frame", "bidir"]
+        if self.realtime :
+            args += ["-re"]
+        return args + ["-threads", str(self.threads), "-i", self.source]
+
+    def _probe(self) :
+        """ffmpeg -i 출력으로 원본 해상도 / fps 확인(ffprobe 없이)"""
+        try :
+            result = subprocess.run(self._input_args(), capture_output=True, text=True,
+                                    timeout=self.timeout + 5)
+        except (OSError, subprocess.TimeoutExpired) as exc :
+            self.last_error = str(exc)
+            return None
+        match = STREAM_PATTERN.search(result.stderr)
+        if match is None :
+            self.last_error = result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "영상 스트림 없음"
+            return None
+        fps = FPS_PATTERN.search(result.stderr[match.start():].split("\n", 1)[0])
+        return int(match.group(1)), int(match.group(2)), float(fps.group(1)) if fps else 0.0
+
+    def _start(self) :
+        if shutil.which(self.ffmpeg) is None :
+            self.last_error = f'{self.ffmpeg} 실행 파일 없음'
+            print(f'[FFmpegCapture] {self.last_error}')
+            return
+        probed = self._probe()
+        if probed is None :
+            print(f'[FFmpegCapture] {self.source} 열기 실패 : {self.last_error}')
+            return
+        source_width, source_height, self.source_fps = probed
+
+        # 출력 크기(비율 유지, yuv 변환을 위해 짝수)
+        self.width, self.height = source_width, source_height
+        if self.target_width and self.target_width < source_width :
+            self.width = self.target_width - self.target_width % 2
+            self.height = max(2, round(source_height * self.width / source_width / 2) * 2)
+        self.output_scale = self.width / source_width
+        self.scratch = np.empty((self.height, self.width, 3), dtype=np.uint8)
+
+        filters = []
+        if self.mode == "fps" :
+            filters.append(f'fps={self.fps}')
+        if (self.width, self.height) != (source_width, source_height) :
+            filters.append(f'scale={self.width}:{self.height}:flags=fast_bilinear')
+
+        args = self._input_args() + ["-an", "-sn", "-dn"]
+        if filters :
+            args += ["-vf", ",".join(filters)]
+        if self.mode == "keyframes" :
+            # 키프레임 시각 그대로 출력(빈 시간을 중복 프레임으로 채우지 않음)
+            args += ["-vsync", "0"]
+        args += ["-pix_fmt", "bgr24", "-f", "rawvideo", "-loglevel", "error", "pipe:1"]
+
+        self.proc = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.PIPE, bufsize=0)
+        threading.Thread(target=self._drain_stderr, args=(self.proc,), daemon=True).start()
+
+    def _drain_stderr(self, proc) :
+        """ffmpeg 오류 메시지 보관(pipe가 차서 ffmpeg가 멈추지 않도록 계속 읽음)"""
+        for line in proc.stderr :
+            self.last_error = line.decode(errors="replace").strip()
+            print(f'[FFmpegCapture] {self.last_error}')
+
+    def _read_into(self, view : memoryview) -> bool :
+        """프레임 1장 크기만큼 pipe에서 읽기(EOF / 종료 시 False)"""
+        if self.proc is None :
+            return False
+        got = 0
+        total = len(view)
+        while got < total :
+            n = self.proc.stdout.readinto(view[got:])
+            if not n :
+                return False
+            got += n
+        return True
+
+    def read(self, image : np.ndarray | None = None) :
+        """cv2.VideoCapture.read와 같음 : 크기가 맞는 image가 있으면 그 버퍼에 바로 읽음"""
+        if image is None or image.shape != (self.height, self.width, 3) or image.dtype != np.uint8 \
+                or not image.flags["C_CONTIGUOUS"] :
+            image = np.empty((self.height, self.width, 3), dtype=np.uint8)
+        if not self._read_into(memoryview(image).cast("B")) :
+            return False, None
+        return True, image
+
+    def grab(self) :
+        """프레임 1장을 버림(pipe는 비워야 하므로 내부 버퍼로 읽기)"""
+        if self.scratch is None :
+            return False
+        return self._read_into(memoryview(self.scratch).cast("B"))
+
+    def isOpened(self) :
+        return self.proc is not None and self.proc.poll() is None
+
+    def get(self, prop) :
+        if prop == cv2.CAP_PROP_FRAME_WIDTH :
+            return float(self.width)
+        if prop == cv2.CAP_PROP_FRAME_HEIGHT :
+            return float(self.height)
+        if prop == cv2.CAP_PROP_FPS :
+            return float(self.fps if self.mode == "fps" else self.source_fps)
+        return 0.0
+
+    def set(self, prop, value) :
+        # 버퍼 크기 등은 pipe 방식이라 해당 없음
+        return False
+
+    def release(self) :
+        if self.proc is None :
+            return
+        if self.proc.poll() is None :
+            self.proc.kill()
+        self.proc.wait()
+        self.proc.stdout.close()
+        self.proc = None
@@ -0,0 +1,185 @@
+import os
+import threading
+import time
+
+##########################################################################
+# FPS 조절기
+# - 카메라별 추론 비용(프레임당 초)과 호스트 CPU 사용률을 측정
+# - 전체 CPU 예산(cpu_target) 안에서 카메라별 분석 FPS를 min_fps ~ max_fps 사이로 조절
+# - 입/퇴실 판정 중인 좌석(counter > 0)이 있는 카메라는 더 높은 FPS
+#   (max_fps 제한 후에 pending_boost를 곱하고 pending_max_fps까지 허용 : scale이 1이어도 올라감)
+##########################################################################
+
+class FpsGovernor :
+    def __init__(self,
+                 min_fps : float = 1.0,
+                 max_fps : float = 10.0,
+                 pending_boost : float = 2.0,
+                 pending_max_fps : float | None = None,
+                 cpu_target : float = 0.7,
+                 update_interval : float = 1.0,
+                 cpu_count : int | None = None) :
+        """
+        :param min_fps: 카메라별 최소 분석 FPS
+        :param max_fps: 카메라별 최대 분석 FPS
+        :param pending_boost: 판정 중인 좌석이 있는 카메라의 FPS 배수
+        :param pending_max_fps: 판정 중인 카메라의 최대 분석 FPS, None이면 max_fps * pending_boost
+        :param cpu_target: 목표 호스트 CPU 사용률(0~1)
+        :param update_interval: FPS 재계산 주기(초)
+        :param cpu_count: 이 조절기가 쓸 수 있는 코어 수(카메라 샤드 프로세스는 나눠 가진 몫), None이면 전체
+        """
+        self.min_fps = min_fps
+        self.max_fps = max_fps
+        self.pending_boost = pending_boost
+        self.pending_max_fps = pending_max_fps or max_fps * pending_boost
+        self.cpu_target = cpu_target
+        self.update_interval = update_interval
+        self.cpu_count = cpu_count or os.cpu_count() or 1
+
+        # 전체 부하 배율(0~1) : 1이면 max_fps, 0이면 min_fps
+        self.scale = 1.0
+        self.host_cpu = 0.0
+        self.last_update = 0.0
+        self.last_cpu_sample = self._read_cpu_times()
+
+        # camera_id -> 측정값
+        self.costs = {}           # 프레임당 추론 시간 EMA(초)
+        self.last_analyzed = {}   # 마지막 분석 시각
+        self.effective_fps = {}   # 실제 분석 FPS EMA
+        self.target_fps = {}      # 현재 목표 FPS
+        self.pending = {}         # 판정 중인 좌석 존재 여부
+
+        self.lock = threading.Lock()
+
+    def is_due(self, camera_id : str, now : float) -> bool :
+        """해당 카메라를 이번 tick에 분석해야 하는지"""
+        with self.lock :
+            fps = self.target_fps.get(camera_id, self.max_fps)
+            last = self.last_analyzed.get(camera_id)
+        return last is None or now - last >= 1.0 / fps
+
+    def record(self, camera_id : str, cost : float, now : float, pending : bool) :
+        """
+        추론 결과 기록
+        :param cost: 이 카메라 프레임 1장에 든 추론 시간(초)
+        :param pending: 입/퇴실 판정 중인 좌석이 있는지
+        """
+        with self.lock :
+            prev_cost = self.costs.get(camera_id)
+            self.costs[camera_id] = cost if prev_cost is None else prev_cost * 0.8 + cost * 0.2
+
+            self._mark_analyzed(camera_id, now)
+
+            # 판정 중 상태가 바뀌면 바로 반영
+            if self.pending.get(camera_id) != pending :
+                self.pending[camera_id] = pending
+                self.target_fps[camera_id] = self._camera_fps(camera_id)
+
+    def mark_skipped(self, camera_id : str, now : float) :
+        """모션 게이트로 추론을 건너뛴 프레임도 분석한 것으로 기록(비용은 갱신하지 않음)"""
+        with self.lock :
+            self._mark_analyzed(camera_id, now)
+
+    def forget(self, camera_id : str) :
+        """카메라 제거 시 측정값 삭제"""
+        with self.lock :
+            for values in (self.costs, self.last_analyzed, self.effective_fps, self.target_fps, self.pending) :
+                values.pop(camera_id, None)
+
+    def _mark_analyzed(self, camera_id : str, now : float) :
+        """lock 안에서 호출 : 분석 시각 / 실제 FPS 갱신"""
+        # 쉬고 있다가 다시 분석을 시작한 경우는 FPS 측정에서 제외
+        last = self.last_analyzed.get(camera_id)
+        if last is not None and 0 < now - last <= 2.0 / self.min_fps :
+            fps = 1.0 / (now - last)
+            prev_fps = self.effective_fps.get(camera_id)
+            self.effective_fps[camera_id] = fps if prev_fps is None else prev_fps * 0.8 + fps * 0.2
+        self.last_analyzed[camera_id] = now
+
+    def maybe_update(self, now : float) :
+        """update_interval마다 CPU 사용률을 보고 카메라별 목표 FPS 재계산"""
+        if now - self.last_update < self.update_interval :
+            return
+        self.last_update = now
+
+        self.host_cpu = self._host_cpu_usage()
+
+        # 목표보다 높으면 비율만큼 줄이고, 낮으면 천천히 올림
+        if self.host_cpu > self.cpu_target :
+            self.scale *= max(0.5, self.cpu_target / self.host_cpu)
+        elif self.host_cpu < self.cpu_target * 0.9 :
+            self.scale = min(1.0, self.scale * 1.1 + 0.01)
+
+        with self.lock :
+            for camera_id in self.costs :
+                self.target_fps[camera_id] = self._camera_fps(camera_id)
+
+    def _camera_fps(self, camera_id : str) -> float :
+        """lock 안에서 호출 : 카메라 목표 FPS 계산"""
+        fps = self.min_fps + (self.max_fps - self.min_fps) * self.scale
+
+        # 추론 비용 기준 상한 : CPU 예산을 카메라 수로 나눈 만큼만 사용
+        cost = self.costs.get(camera_id)
+        if cost :
+            share = self.cpu_target * self.cpu_count / max(1, len(self.costs))
+            fps = min(fps, share / cost)
+
+        fps = max(self.min_fps, min(self.max_fps, fps))
+
+        # 판정 중인 좌석은 비용 상한 / max_fps를 넘어서 분석(판정이 끝나면 바로 원래 FPS로 돌아감)
+        if self.pending.get(camera_id) :
+            fps = min(fps * self.pending_boost, max(self.pending_max_fps, fps))
+
+        return fps
+
+    def _read_cpu_times(self) :
+        """/proc/stat 의 (idle, total), 없으면 None"""
+        try :
+            with open("/proc/stat", "r") as f :
+                values = [int(v) for v in f.readline().split()[1:]]
+            return values[3] + values[4], sum(values)
+        except (OSError, ValueError, IndexError) :
+            return None
+
+    def _host_cpu_usage(self) -> float :
+        """직전 측정 이후 호스트 CPU 사용률(0~1)"""
+        sample = self._read_cpu_times()
+        prev, self.last_cpu_sample = self.last_cpu_sample, sample
+
+        if sample is not None and prev is not None and sample[1] > prev[1] :
+            idle = sample[0] - prev[0]
+            total = sample[1] - prev[1]
+            return 1.0 - idle / total
+
+        # /proc/stat이 없는 환경은 load average로 대체
+        try :
+            return min(1.0, os.getloadavg()[0] / (os.cpu_count() or 1))
+        except OSError :
+            return 0.0
+
+    def get_status(self) :
+        with self.lock :
+            cameras = {}
+            for camera_id in self.costs :
+                cameras[camera_id] = {
+                    "target_fps" : round(self.target_fps.get(camera_id, self.max_fps), 2),
+                    "effective_fps" : round(self.effective_fps.get(camera_id, 0.0), 2),
+                    "inference_ms" : round(self.costs[camera_id] * 1000, 2),
+                    "pending" : self.pending.get(camera_id, False)
+                }
+        return {
+            "min_fps" : self.min_fps,
+            "max_fps" : self.max_fps,
+            "pending_max_fps" : self.pending_max_fps,
+            "cpu_target" : self.cpu_target,
+            "host_cpu" : round(self.host_cpu, 3),
+            "scale" : round(self.scale, 3),
+            "cameras" : cameras
+        }
+
+    def get_camera_status(self, camera_id : str) :
+        with self.lock :
+            return {
+                "target_fps" : round(self.target_fps.get(camera_id, self.max_fps), 2),
+                "effective_fps" : round(self.effective_fps.get(camera_id, 0.0), 2)
+            }
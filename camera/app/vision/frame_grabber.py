@@ -0,0 +1,243 @@
+import cv2
+import threading
+import time
+import numpy as np
+from vision.ffmpeg_capture import FFmpegCapture
+from vision.metrics import metrics
+from vision.stream_supervisor import StreamSupervisor
+
+##########################################################################
+# 프레임 그래버
+# - 디코딩을 별도 스레드로 분리해서 OpenCV 내부 버퍼가 쌓이지 않도록 계속 읽음
+# - 미리 할당한 NumPy 버퍼 풀에 직접 디코딩(cap.read(buf))해서 매 프레임 할당 방지
+# - 가장 최신 프레임만 노출하고 소비되지 않은 이전 프레임은 버림
+# - 소비자는 acquire()로 버퍼를 잡고(복사 없음) 다 쓰면 release()
+# - heartbeat 모드에서는 grab()으로 스트림만 비우고 주기적으로만 프레임 변환
+# - 읽기 실패 / 멈춤은 StreamSupervisor가 판정 : stall_timeout 동안 프레임이 없으면 닫고 backoff 후 다시 열기
+#   (read()가 무한정 막히지 않도록 열 때 open / read timeout을 stall_timeout으로 설정)
+# - decoder backend="ffmpeg"이면 cv2.VideoCapture 대신 FFmpegCapture(축소 / 키프레임 디코딩) 사용
+##########################################################################
+
+class FrameGrabber :
+    def __init__(self, source, pool_size : int = 4, heartbeat_interval : float = 1.0, camera_id : str = "",
+                 stream : dict | None = None, decoder : dict | None = None) :
+        """
+        :param source: 영상 소스(cv2.VideoCapture 인자) 또는 read / grab을 제공하는 캡처 객체(재생 벤치마크 등)
+        :param pool_size: 프레임 버퍼 개수(쓰는 중 1 + 최신 1 + 소비자 보유분)
+        :param heartbeat_interval: heartbeat 모드에서 프레임을 꺼내는 주기(초)
+        :param camera_id: 지표 라벨
+        :param stream: StreamSupervisor 설정 dict({"degraded_after", "stall_timeout", "base_backoff", "max_backoff"})
+        :param decoder: 디코더 설정 dict({"backend" : "opencv" | "ffmpeg", 나머지는 FFmpegCapture 인자}), None이면 opencv
+        """
+        self.source = source
+        self.camera_id = camera_id
+        self.decoder = dict(decoder or {})
+        self.decoder_backend = self.decoder.pop("backend", "opencv")
+        self.supervisor = StreamSupervisor(camera_id, **(stream or {}))
+        # 캡처 객체를 직접 받은 경우는 다시 열 수 없으므로 재연결 없이 계속 읽기만 시도
+        self.reopenable = not hasattr(source, "grab")
+        self.cap = self._open()
+
+        self.pool_size = max(3, pool_size)
+        self.buffers = [None] * self.pool_size
+        self.ref_counts = [0] * self.pool_size
+        # 버퍼별 디코딩 완료 시각(monotonic), 분석 지연 계산용
+        self.frame_times = [0.0] * self.pool_size
+
+        # 최신 프레임 정보
+        self.cond = threading.Condition()
+        self.latest_slot = None
+        self.latest_seq = 0
+        self.latest_ts = None
+        self.latest_taken = True
+
+        # heartbeat 모드
+        self.heartbeat = False
+        self.heartbeat_interval = heartbeat_interval
+        self.force_retrieve = False
+        self.last_retrieve = 0.0
+
+        self.running = False
+        self.stopped = threading.Event()
+        self.thread = None
+        self.stats = {
+            "frames_grabbed" : 0,
+            "frames_dropped" : 0,
+            "read_failures" : 0
+        }
+
+    def start(self) :
+        """디코딩 루프 시작(백그라운드 실행)"""
+        self.running = True
+        self.thread = threading.Thread(target=self._loop, daemon=True)
+        self.thread.start()
+
+    def stop(self, wait : float | None = None) :
+        """
+        디코딩 루프 종료(루프가 끝나면 캡처 해제)
+        :param wait: 캡처 해제까지 기다릴 최대 시간(초), None이면 기다리지 않음
+        """
+        self.running = False
+        self.stopped.set()
+        if wait is not None and self.thread is not None :
+            self.thread.join(wait)
+
+    def set_heartbeat(self, enabled : bool) :
+        """감지할 좌석이 없으면 True : 디코딩만 하고 프레임은 가끔만 꺼냄"""
+        self.heartbeat = enabled
+
+    def request_frame(self) :
+        """heartbeat 모드여도 다음 프레임은 바로 꺼내도록 요청"""
+        self.force_retrieve = True
+
+    def _open(self) :
+        """캡처 열기(드라이버 버퍼 최소 + open / read timeout, 지원하지 않는 백엔드는 무시)"""
+        if not self.reopenable :
+            cap = self.source
+        elif self.decoder_backend == "ffmpeg" :
+            cap = FFmpegCapture(self.source, timeout=self.supervisor.stall_timeout, **self.decoder)
+        else :
+            timeout_ms = int(self.supervisor.stall_timeout * 1000)
+            cap = cv2.VideoCapture(self.source, cv2.CAP_ANY,
+                                   [cv2.CAP_PROP_OPEN_TIMEOUT_MSEC, timeout_ms,
+                                    cv2.CAP_PROP_READ_TIMEOUT_MSEC, timeout_ms])
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        return cap
+
+    def _reconnect(self) :
+        """down 판정 후 호출 : 다시 열릴 때까지 지수 backoff + jitter로 재시도"""
+        while self.running :
+            delay = self.supervisor.backoff()
+            print(f'[{self.camera_id}] {delay:.1f}초 후 스트림 다시 열기')
+            if self.stopped.wait(delay) :
+                return
+            if self.reopenable :
+                self.cap.release()
+                self.cap = self._open()
+            opened = self.cap.isOpened()
+            self.supervisor.on_reconnect(opened, time.monotonic())
+            if opened :
+                return
+
+    def _on_read_failure(self) :
+        self.stats["read_failures"] += 1
+        if self.supervisor.on_failure(time.monotonic()) :
+            self._reconnect()
+        else :
+            time.sleep(0.01)
+
+    def _free_slot(self) :
+        """최신 프레임도 아니고 누구도 잡고 있지 않은 버퍼 번호"""
+        with self.cond :
+            for slot in range(self.pool_size) :
+                if slot != self.latest_slot and self.ref_counts[slot] == 0 :
+                    return slot
+        return None
+
+    def _loop(self) :
+        """ 디코딩 루프 """
+        while self.running :
+            # heartbeat 모드 : 스트림만 비우고 주기가 되었을 때만 프레임 변환
+            if self.heartbeat and not self.force_retrieve \
+                    and time.monotonic() - self.last_retrieve < self.heartbeat_interval :
+                if self.cap.grab() :
+                    self.supervisor.on_frame(time.monotonic())
+                else :
+                    self._on_read_failure()
+                continue
+
+            slot = self._free_slot()
+            if slot is None :
+                # 모든 버퍼를 소비자가 잡고 있으면 스트림만 비우고 프레임은 버림
+                if self.cap.grab() :
+                    self.stats["frames_dropped"] += 1
+                    self.supervisor.on_frame(time.monotonic())
+                else :
+                    self._on_read_failure()
+                continue
+
+            buf = self.buffers[slot]
+            # 새 프레임을 기다리는 시간은 빼고 디코딩에 쓴 CPU 시간만 기록
+            started = time.thread_time()
+            ret, frame = self.cap.read(buf) if buf is not None else self.cap.read()
+            if not ret :
+                self._on_read_failure()
+                continue
+            self.force_retrieve = False
+            self.last_retrieve = time.monotonic()
+            self.supervisor.on_frame(self.last_retrieve)
+            self.frame_times[slot] = self.last_retrieve
+            metrics.observe("camera_stage_seconds", time.thread_time() - started, stage="decode", camera=self.camera_id)
+
+            # 첫 프레임 / 해상도 변경 시에만 새로 할당된 배열을 풀에 등록
+            if frame is not buf :
+                self.buffers[slot] = frame
+                for other in range(self.pool_size) :
+                    if self.buffers[other] is None :
+                        self.buffers[other] = np.empty_like(frame)
+
+            with self.cond :
+                if not self.latest_taken and not self.heartbeat :
+                    self.stats["frames_dropped"] += 1
+                self.latest_slot = slot
+                self.latest_seq += 1
+                self.latest_ts = time.time()
+                self.latest_taken = False
+                self.cond.notify_all()
+
+            self.stats["frames_grabbed"] += 1
+
+        # 직접 연 캡처만 해제(외부에서 받은 캡처 객체는 만든 쪽이 관리)
+        if self.reopenable :
+            self.cap.release()
+
+    def acquire(self, after_seq : int = 0) :
+        """
+        after_seq 이후의 최신 프레임을 복사 없이 잡아서 반환
+        :return: (slot, seq, frame) | None
+        """
+        with self.cond :
+            if self.latest_slot is None or self.latest_seq <= after_seq :
+                return None
+            return self._hold_latest()
+
+    def wait_for_frame(self, after_seq : int = 0, timeout : float | None = None) :
+        """after_seq 이후의 프레임이 들어올 때까지 대기 후 acquire"""
+        with self.cond :
+            ok = self.cond.wait_for(lambda : self.latest_slot is not None and self.latest_seq > after_seq,
+                                    timeout=timeout)
+            if not ok :
+                return None
+            return self._hold_latest()
+
+    def _hold_latest(self) :
+        slot = self.latest_slot
+        self.ref_counts[slot] += 1
+        self.latest_taken = True
+        return slot, self.latest_seq, self.buffers[slot]
+
+    def frame_time(self, slot : int) -> float :
+        """버퍼에 담긴 프레임의 디코딩 완료 시각(monotonic)"""
+        return self.frame_times[slot]
+
+    def release(self, slot : int) :
+        """acquire로 잡은 버퍼 반납"""
+        with self.cond :
+            self.ref_counts[slot] -= 1
+
+    def is_opened(self) :
+        return self.cap.isOpened()
+
+    def get_state(self) -> str :
+        """스트림 상태(connecting / streaming / degraded / down)"""
+        return self.supervisor.current_state()
+
+    def get_status(self) :
+        return {
+            "stream" : self.supervisor.get_status(),
+            "decoder" : self.decoder_backend,
+            "heartbeat" : self.heartbeat,
+            "latest_seq" : self.latest_seq,
+            "latest_age_ms" : round((time.time() - self.latest_ts) * 1000, 1) if self.latest_ts else None,
+            **self.stats
+        }
@@ -0,0 +1,194 @@
+import hashlib
+import queue
+import threading
+import time
+from collections import OrderedDict
+import cv2
+import numpy as np
+from vision.metrics import metrics
+
+##########################################################################
+# 유실물 크롭 이미지 인코더
+# - JPEG 인코딩을 추론 스레드가 아닌 별도 스레드에서 처리(submit 후 바로 반환)
+# - 원본(quality) + 키오스크 표시용 축소본(thumbnail_width / thumbnail_quality) 2종 생성
+# - 크롭 픽셀 전체의 sha256을 키로 사용(URL은 immutable로 캐시되므로 내용이 조금이라도 다르면 다른 키)
+#   -> 완전히 같은 크롭이 다시 들어오면 인코딩 / 저장은 한 번만
+# - reuse_similar(기본 사용)면 크기가 같고 축소한 픽셀 차이가 similar_threshold 이하인 크롭은 이전 JPEG를 재사용해서 인코딩 생략
+#   -> 센서 노이즈만 다른 같은 장면은 축소(평균)하면서 차이가 거의 사라지므로 같은 이미지로 처리
+#   -> 작은 물건이라도 새로 생기면 그 자리 칸의 값이 크게 바뀌므로 새로 인코딩(칸별 최대 차이로 비교)
+# - 저장은 max_images개까지(오래 안 쓴 것부터 삭제)
+##########################################################################
+
+# 이미지 크기(byte) 히스토그램 버킷(1KB ~ 1MB)
+IMAGE_BYTES_BUCKETS = (1024, 4096, 16384, 32768, 65536, 131072, 262144, 524288, 1048576)
+
+# 비슷한 크롭 판별용 축소 크기(FINGERPRINT_SIZE x FINGERPRINT_SIZE 칸의 평균 픽셀로 비교)
+FINGERPRINT_SIZE = 32
+
+VARIANTS = ("full", "thumb")
+
+class ImageEncoder :
+    def __init__(self, quality : int = 85,
+                 thumbnail_width : int = 320,
+                 thumbnail_quality : int = 70,
+                 max_images : int = 1000,
+                 reuse_similar : bool = True,
+                 similar_threshold : int = 8) :
+        """
+        :param quality: 원본 JPEG 품질(0~100)
+        :param thumbnail_width: 축소본 최대 너비(px), 원본이 더 작으면 원본 크기 유지
+        :param thumbnail_quality: 축소본 JPEG 품질(0~100)
+        :param max_images: 보관할 최대 이미지 수
+        :param reuse_similar: 비슷한 크롭은 이전 JPEG 재사용(인코딩 생략, 작은 차이는 무시됨)
+        :param similar_threshold: 비슷한 크롭으로 볼 축소 픽셀의 최대 차이(0~255)
+        """
+        self.quality = quality
+        self.thumbnail_width = thumbnail_width
+        self.thumbnail_quality = thumbnail_quality
+        self.max_images = max_images
+        self.reuse_similar = reuse_similar
+        self.similar_threshold = similar_threshold
+
+        self.jobs = queue.Queue()
+        # key -> {"full" : bytes, "thumb" : bytes}, 최근 사용 순서 유지
+        self.images = OrderedDict()
+        # reuse_similar : 인코딩한 key -> (크롭 크기, 축소 픽셀)
+        self.similar = {}
+        self.lock = threading.Lock()
+        self.stats = {
+            "submitted" : 0,
+            "encoded" : 0,
+            "deduplicated" : 0,
+            "reused_similar" : 0,
+            "failed" : 0,
+            "evicted" : 0
+        }
+
+    def start(self) :
+        """인코딩 스레드 시작(백그라운드 실행)"""
+        threading.Thread(target=self._encode_loop, daemon=True).start()
+
+    def submit(self, image, callback, camera : str = "") :
+        """
+        추론 스레드에서 호출 : 인코딩 요청 후 바로 반환
+        :param image: BGR 이미지(호출 후 바뀌지 않는 배열이어야 함)
+        :param callback: 인코딩 완료 시 callback(key) 호출(실패 시 key=None)
+        """
+        self.stats["submitted"] += 1
+        self.jobs.put((image, callback, camera))
+
+    def get(self, key : str, variant : str = "full") :
+        """저장된 JPEG 바이트(없으면 None)"""
+        with self.lock :
+            entry = self.images.get(key)
+            if entry is None :
+                return None
+            self.images.move_to_end(key)
+            return entry[variant]
+
+    def sizes(self, key : str) :
+        """variant별 byte 수(없으면 0)"""
+        with self.lock :
+            entry = self.images.get(key)
+            return {variant : len(entry[variant]) if entry else 0 for variant in VARIANTS}
+
+    def _encode_loop(self) :
+        while True :
+            image, callback, camera = self.jobs.get()
+            try :
+                key = self._encode(image, camera)
+            except Exception as exc :
+                print(f'[ImageEncoder] 인코딩 실패 : {exc}')
+                self.stats["failed"] += 1
+                key = None
+            callback(key)
+
+    def _encode(self, image, camera) :
+        key = self._content_key(image)
+        fingerprint = self._fingerprint(image) if self.reuse_similar else None
+        with self.lock :
+            entry = self.images.get(key)
+            if entry is not None :
+                self.images.move_to_end(key)
+                self.stats["deduplicated"] += 1
+                metrics.inc("image_encode_deduplicated_total", camera=camera)
+            elif fingerprint is not None and (similar := self._find_similar(fingerprint)) is not None :
+                # 비슷한 크롭의 JPEG를 새 key로 같이 보관(인코딩 생략)
+                # 비교 기준은 처음 인코딩한 크롭만 유지(조금씩 바뀌는 크롭이 계속 이어 붙지 않도록)
+                self.images.move_to_end(similar)
+                entry = self.images[similar]
+                self._store(key, entry, None)
+                self.stats["reused_similar"] += 1
+
+        if entry is None :
+            entry = {
+                "full" : self._jpeg(image, self.quality, "full", camera),
+                "thumb" : self._jpeg(self._thumbnail(image), self.thumbnail_quality, "thumb", camera)
+            }
+            with self.lock :
+                self._store(key, entry, fingerprint)
+            self.stats["encoded"] += 1
+
+        # 이벤트 1건이 참조하는 이미지 크기(중복이어도 같은 바이트를 내려줌)
+        for variant in VARIANTS :
+            metrics.observe("lost_item_image_bytes", len(entry[variant]),
+                            buckets=IMAGE_BYTES_BUCKETS, variant=variant, camera=camera)
+        return key
+
+    def _store(self, key, entry, fingerprint) :
+        """lock 안에서 호출 : 저장 후 max_images 초과분 삭제(오래 안 쓴 것부터)"""
+        self.images[key] = entry
+        if fingerprint is not None :
+            self.similar[key] = fingerprint
+        while len(self.images) > self.max_images :
+            evicted, _ = self.images.popitem(last=False)
+            self.stats["evicted"] += 1
+            self.similar.pop(evicted, None)
+
+    def _find_similar(self, fingerprint) :
+        """lock 안에서 호출 : 크기가 같고 축소 픽셀 차이가 similar_threshold 이하인 저장된 key(없으면 None)"""
+        shape, small = fingerprint
+        for key, (other_shape, other) in self.similar.items() :
+            if other_shape == shape and np.abs(small - other).max() <= self.similar_threshold :
+                return key
+        return None
+
+    def _content_key(self, image) -> str :
+        """크롭 크기 + 픽셀 전체의 sha256(이미지 URL key)"""
+        digest = hashlib.sha256(f'{image.shape}'.encode())
+        digest.update(np.ascontiguousarray(image).data)
+        return digest.hexdigest()
+
+    def _fingerprint(self, image) :
+        """비슷한 크롭 판별용 : (크롭 크기, 칸별 평균 픽셀(INTER_AREA 축소, 뺄셈용 int16))"""
+        small = cv2.resize(image, (FINGERPRINT_SIZE, FINGERPRINT_SIZE), interpolation=cv2.INTER_AREA)
+        return image.shape, small.astype(np.int16)
+
+    def _thumbnail(self, image) :
+        height, width = image.shape[:2]
+        if width <= self.thumbnail_width :
+            return image
+        scale = self.thumbnail_width / width
+        return cv2.resize(image, (self.thumbnail_width, max(1, round(height * scale))),
+                          interpolation=cv2.INTER_AREA)
+
+    def _jpeg(self, image, quality, variant, camera) -> bytes :
+        started = time.perf_counter()
+        ok, buf = cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, quality])
+        metrics.observe("image_encode_seconds", time.perf_counter() - started, variant=variant, camera=camera)
+        if not ok :
+            raise RuntimeError(f'{variant} JPEG 인코딩 실패')
+        return buf.tobytes()
+
+    def get_status(self) :
+        with self.lock :
+            # reuse_similar로 여러 key가 같은 JPEG를 공유하면 한 번만 계산
+            entries = {id(entry) : entry for entry in self.images.values()}.values()
+            stored_bytes = sum(len(entry[variant]) for entry in entries for variant in VARIANTS)
+            return {
+                "images" : len(self.images),
+                "max_images" : self.max_images,
+                "bytes" : stored_bytes,
+                "queued" : self.jobs.qsize(),
+                **self.stats
+            }
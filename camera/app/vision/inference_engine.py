@@ -0,0 +1,195 @@
+import threading
+import time
+import numpy as np
+from typing import Dict
+from vision.fps_governor import FpsGovernor
+from vision.metrics import metrics
+from vision.model_registry import model_registry
+from vision.utils.detectors import detect_person_boxes_batch
+from vision.utils.roi_crops import crop_imgsz, offset_boxes
+
+# 배치 크기 히스토그램 버킷
+BATCH_BUCKETS = (1, 2, 4, 8, 16, 32)
+
+##########################################################################
+# 공용 추론 엔진
+# - 프로세스 전체에서 사람 감지 모델은 백엔드별로 1개만 로드
+# - 일정 주기(tick)마다 각 카메라의 최신 프레임(또는 ROI 크롭)을 모아 배치 추론
+# - 카메라별 결과(bbox)를 각 CameraWorker에게 다시 전달
+# - 카메라별 분석 주기는 FpsGovernor가 결정
+##########################################################################
+
+class InferenceEngine :
+    def __init__(self, tick_interval : float = 0.1, max_batch_size : int = 8, imgsz : int = 768,
+                 governor : FpsGovernor | None = None) :
+        """
+        :param tick_interval: 배치 추론 주기(초)
+        :param max_batch_size: 한 번의 forward에 넣을 최대 이미지 수
+        :param imgsz: 전체 프레임 추론 크기(ROI 크롭은 크기 비율만큼 줄여서 추론)
+        :param governor: 카메라별 분석 FPS 조절기
+        """
+        self.tick_interval = tick_interval
+        self.max_batch_size = max_batch_size
+        self.imgsz = imgsz
+        self.governor = governor or FpsGovernor(max_fps=1.0 / tick_interval)
+
+        # 사람 감지 모델(백엔드별로 모든 카메라 공유)
+        self.person_models = {}
+
+        # 등록된 카메라 워커
+        self.workers : Dict[str, object] = {}
+        self.lock = threading.Lock()
+
+        self.running = False
+        self.stats = {
+            "ticks" : 0,
+            "batches" : 0,
+            "frames" : 0,
+            "images" : 0,
+            "last_batch_size" : 0,
+            "last_inference_ms" : 0.0
+        }
+
+    def register(self, worker) :
+        """추론 대상 카메라 등록(카메라 백엔드 모델이 없으면 미리 로드)"""
+        backend = worker.detector_backend
+        if backend not in self.person_models :
+            self.person_models[backend] = model_registry.get("person", backend)
+
+        with self.lock :
+            self.workers[worker.camera_id] = worker
+
+    def unregister(self, camera_id : str) :
+        """추론 대상 카메라 제거"""
+        with self.lock :
+            self.workers.pop(camera_id, None)
+        self.governor.forget(camera_id)
+
+    def start(self) :
+        """추론 루프 시작(백그라운드 실행)"""
+        self.running = True
+        threading.Thread(target=self._loop, daemon=True).start()
+
+    def stop(self) :
+        self.running = False
+
+    def _loop(self) :
+        """ 메인 루프 : tick 주기로 배치 추론 """
+        while self.running :
+            started = time.monotonic()
+            try :
+                self._tick()
+            except Exception as exc :
+                print(f"[InferenceEngine] 추론 중 오류: {exc}")
+
+            elapsed = time.monotonic() - started
+            time.sleep(max(0.0, self.tick_interval - elapsed))
+
+    def _tick(self) :
+        """각 카메라의 최신 프레임 수집 -> 배치 추론 -> 결과 분배"""
+        with self.lock :
+            workers = list(self.workers.values())
+
+        now = time.monotonic()
+        self.governor.maybe_update(now)
+
+        jobs = []
+        for worker in workers :
+            # 아직 분석 주기가 안 된 카메라는 건너뜀
+            if not self.governor.is_due(worker.camera_id, now) :
+                continue
+            frame = worker.take_frame_for_inference()
+            if frame is None :
+                continue
+
+            # 화면 변화가 없으면 추론 생략
+            with metrics.measure("motion_gate", worker.camera_id) :
+                needed = worker.needs_inference(frame)
+            if not needed :
+                worker.release_inference_frame()
+                self.governor.mark_skipped(worker.camera_id, now)
+                continue
+            jobs.append((worker, frame))
+
+        self.stats["ticks"] += 1
+        if not jobs :
+            return
+
+        try :
+            # 카메라별 추론 입력 구성(전체 프레임 또는 ROI 크롭, 크롭은 복사 없는 view)
+            items = []
+            for index, (worker, frame) in enumerate(jobs) :
+                started = time.perf_counter()
+                regions = worker.inference_regions(frame.shape)
+                metrics.observe("camera_stage_seconds", time.perf_counter() - started,
+                                stage="preprocess", camera=worker.camera_id)
+                if regions is None :
+                    items.append((index, frame, None, self.imgsz))
+                    continue
+                for region in regions :
+                    x1, y1, x2, y2 = region
+                    if x2 <= x1 or y2 <= y1 :
+                        continue
+                    items.append((index, frame[y1:y2, x1:x2], region, crop_imgsz(region, frame.shape, self.imgsz)))
+
+            boxes = [[] for _ in jobs]   # job별 (K, 4) 배열 목록
+            costs = [0.0 for _ in jobs]
+            self._run_batches(jobs, items, boxes, costs)
+            finished = time.monotonic()
+
+            # 카메라별 결과 분배
+            for index, (worker, _) in enumerate(jobs) :
+                # 배치 추론 시간 중 이 카메라 몫
+                metrics.observe("camera_stage_seconds", costs[index], stage="inference", camera=worker.camera_id)
+                person_boxes = np.concatenate(boxes[index]) if boxes[index] else np.empty((0, 4), dtype=np.float32)
+                worker.on_person_boxes(person_boxes)
+                # 추적기가 사이 프레임을 예측으로 판정하면 분석 프레임당 비용은 감지 주기로 나눈 값
+                self.governor.record(worker.camera_id, costs[index] / worker.frames_per_detection, finished,
+                                     worker.has_pending_transition())
+            self.stats["frames"] += len(jobs)
+        finally :
+            # 프레임 버퍼 반납
+            for worker, _ in jobs :
+                worker.release_inference_frame()
+
+    def _run_batches(self, jobs, items, boxes, costs) :
+        """같은 백엔드 / imgsz끼리 묶어서 배치 추론하고 프레임 좌표 bbox / 비용을 job별로 누적"""
+        groups = {}
+        for item in items :
+            backend = jobs[item[0]][0].detector_backend
+            groups.setdefault((backend, item[3]), []).append(item)
+
+        for (backend, imgsz), group in groups.items() :
+            model = self.person_models[backend]
+            for i in range(0, len(group), self.max_batch_size) :
+                chunk = group[i:i + self.max_batch_size]
+                images = [image for _, image, _, _ in chunk]
+
+                started = time.monotonic()
+                boxes_per_image = detect_person_boxes_batch(model, images, imgsz=imgsz)
+                elapsed = time.monotonic() - started
+                self.stats["last_inference_ms"] = round(elapsed * 1000, 2)
+                self.stats["last_batch_size"] = len(images)
+                self.stats["batches"] += 1
+                self.stats["images"] += len(images)
+                metrics.observe("inference_batch_seconds", elapsed, backend=backend)
+                metrics.observe("inference_batch_images", len(images), buckets=BATCH_BUCKETS, backend=backend)
+
+                for (index, _, region, _), image_boxes in zip(chunk, boxes_per_image) :
+                    if region is not None :
+                        image_boxes = offset_boxes(image_boxes, region)
+                    boxes[index].append(image_boxes)
+                    costs[index] += elapsed / len(chunk)
+
+    def get_status(self) :
+        with self.lock :
+            cameras = list(self.workers.keys())
+        return {
+            "tick_interval" : self.tick_interval,
+            "max_batch_size" : self.max_batch_size,
+            "imgsz" : self.imgsz,
+            "backends" : sorted(self.person_models.keys()),
+            "cameras" : cameras,
+            "governor" : self.governor.get_status(),
+            **self.stats
+        }
@@ -0,0 +1,177 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+
+##########################################################################
+# 런타임 지표(Prometheus text format)
+# - 단계별(decode / motion_gate / preprocess / inference / roi_match / emit / lost_item) 소요 시간 히스토그램
+# - 카운터(이벤트 수 등)는 발생 지점에서 증가
+# - 프레임 수 / 드롭 / FPS 같은 상태값은 /metrics 요청 시점에 수집해서 gauge로 출력
+# - 카메라 샤드 프로세스의 값은 snapshot()으로 받아서 set_remote()로 등록 -> 출력 시 합산
+##########################################################################
+
+# 초 단위 버킷(1ms ~ 5s)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+HELP = {
+    "camera_stage_seconds" : "Time spent per pipeline stage",
+    "camera_analysis_lag_seconds" : "Frame capture to analysis completion lag",
+    "inference_batch_seconds" : "Batched person inference time per forward",
+    "inference_batch_images" : "Images per batched forward",
+    "camera_events_total" : "Seat events emitted",
+    "camera_lost_item_runs_total" : "Lost item detection runs(one frame, batched over requested seats)",
+    "camera_lost_item_jobs_total" : "Lost item check requests served",
+    "event_delivery_seconds" : "Seat event submit to backend acknowledgement",
+    "event_delivery_batch_size" : "Seat events per delivery request",
+    "camera_event_delivery_delivered_total" : "Seat events accepted by the backend",
+    "camera_event_delivery_rejected_total" : "Seat events dropped after the backend rejected them (400/422, isolated one by one)",
+    "camera_event_delivery_dropped_total" : "Seat events dropped after exhausting retries",
+    "camera_event_delivery_retries_total" : "Delivery batch retries",
+    "event_outbox_commit_seconds" : "Outbox group commit time",
+    "camera_shard_restarts_total" : "Camera shard processes restarted after exiting",
+    "image_encode_seconds" : "Lost item crop JPEG encode time per variant",
+    "image_encode_deduplicated_total" : "Lost item crops served from an already encoded image",
+    "lost_item_image_bytes" : "Encoded lost item image bytes per event",
+}
+
+class _Histogram :
+    def __init__(self, buckets) :
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value : float) :
+        index = bisect.bisect_left(self.buckets, value)
+        if index < len(self.counts) :
+            self.counts[index] += 1
+        self.sum += value
+        self.count += 1
+
+def _escape(value) -> str :
+    """라벨 값 escape(Prometheus text format : 역슬래시, 큰따옴표, 줄바꿈)"""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _labels(labels : dict) :
+    if not labels :
+        return ""
+    text = ",".join(f'{k}="{_escape(v)}"' for k, v in sorted(labels.items()))
+    return "{" + text + "}"
+
+class MetricsRegistry :
+    def __init__(self) :
+        # name -> {labels(tuple) -> _Histogram | float}
+        self.histograms = {}
+        self.histogram_buckets = {}
+        self.counters = {}
+        # source -> 다른 프로세스의 snapshot()
+        self.remote = {}
+        self.lock = threading.Lock()
+
+    def observe(self, name : str, value : float, buckets = DEFAULT_BUCKETS, **labels) :
+        """히스토그램에 값 1개 추가"""
+        key = tuple(sorted(labels.items()))
+        with self.lock :
+            series = self.histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None :
+                self.histogram_buckets.setdefault(name, buckets)
+                histogram = series[key] = _Histogram(self.histogram_buckets[name])
+            histogram.observe(value)
+
+    def inc(self, name : str, value : float = 1, **labels) :
+        """카운터 증가"""
+        key = tuple(sorted(labels.items()))
+        with self.lock :
+            series = self.counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    @contextmanager
+    def measure(self, stage : str, camera : str) :
+        """with 블록 소요 시간을 camera_stage_seconds{stage, camera}로 기록"""
+        started = time.perf_counter()
+        try :
+            yield
+        finally :
+            self.observe("camera_stage_seconds", time.perf_counter() - started, stage=stage, camera=camera)
+
+    def snapshot(self) :
+        """현재 값 전체(pickle 가능한 dict), 카메라 샤드 프로세스가 주기적으로 부모에게 전달"""
+        with self.lock :
+            return self._snapshot()
+
+    def set_remote(self, source, snapshot) :
+        """다른 프로세스의 snapshot 등록(누적값이므로 source별 최신 것으로 교체)"""
+        with self.lock :
+            self.remote[source] = snapshot
+
+    def _merged(self) :
+        """lock 안에서 호출 : 이 프로세스 값 + 다른 프로세스 값 합산"""
+        merged = self._snapshot()
+        for remote in self.remote.values() :
+            for name, series in remote["histograms"].items() :
+                target = merged["histograms"].setdefault(name, {})
+                for key, (buckets, counts, total, count) in series.items() :
+                    if key not in target :
+                        target[key] = (buckets, list(counts), total, count)
+                        continue
+                    _, merged_counts, merged_total, merged_count = target[key]
+                    target[key] = (buckets, [a + b for a, b in zip(merged_counts, counts)],
+                                   merged_total + total, merged_count + count)
+            for name, series in remote["counters"].items() :
+                target = merged["counters"].setdefault(name, {})
+                for key, value in series.items() :
+                    target[key] = target.get(key, 0) + value
+        return merged
+
+    def _snapshot(self) :
+        """lock 안에서 호출"""
+        return {
+            "histograms" : {name : {key : (h.buckets, list(h.counts), h.sum, h.count)
+                                    for key, h in series.items()}
+                            for name, series in self.histograms.items()},
+            "counters" : {name : dict(series) for name, series in self.counters.items()}
+        }
+
+    def render(self, gauges = None) :
+        """
+        Prometheus text format 출력
+        :param gauges: {name : [(labels dict, value), ...]} 요청 시점에 수집한 값
+        """
+        lines = []
+        with self.lock :
+            merged = self._merged()
+
+        for name, series in sorted(merged["histograms"].items()) :
+            self._header(lines, name, "histogram")
+            for key, (buckets, counts, total, count) in series.items() :
+                labels = dict(key)
+                cumulative = 0
+                for bound, bucket_count in zip(buckets, counts) :
+                    cumulative += bucket_count
+                    lines.append(f'{name}_bucket{_labels({**labels, "le" : bound})} {cumulative}')
+                lines.append(f'{name}_bucket{_labels({**labels, "le" : "+Inf"})} {count}')
+                lines.append(f'{name}_sum{_labels(labels)} {total:.6f}')
+                lines.append(f'{name}_count{_labels(labels)} {count}')
+
+        for name, series in sorted(merged["counters"].items()) :
+            self._header(lines, name, "counter")
+            for key, value in series.items() :
+                lines.append(f'{name}{_labels(dict(key))} {value}')
+
+        for name, samples in (gauges or {}).items() :
+            # 누적값은 이름 규칙(_total)대로 counter로 표시
+            self._header(lines, name, "counter" if name.endswith("_total") else "gauge")
+            for labels, value in samples :
+                lines.append(f'{name}{_labels(labels)} {value}')
+
+        return "\n".join(lines) + "\n"
+
+    def _header(self, lines, name, kind) :
+        if name in HELP :
+            lines.append(f'# HELP {name} {HELP[name]}')
+        lines.append(f'# TYPE {name} {kind}')
+
+# 전역 지표 인스턴스
+metrics = MetricsRegistry()
@@ -0,0 +1,166 @@
+import gc
+import os
+import threading
+import time
+from contextlib import contextmanager
+from vision.utils.detectors import load_detector
+
+##########################################################################
+# 모델 레지스트리
+# - 모델은 처음 사용할 때 로드(lazy)하고 모든 카메라가 공유
+# - 같은 모델이라도 추론 백엔드(torch / onnx / openvino)별로 따로 관리
+# - idle_timeout이 지정된 모델은 일정 시간 사용하지 않으면 메모리에서 해제
+# - 로드 / 언로드 횟수를 /health로 노출
+##########################################################################
+
+# 가중치 경로는 실행 위치(camera 또는 camera/app)와 관계없이 vision 폴더 기준
+MODELS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "models")
+PERSON_MODEL_PATH = os.path.join(MODELS_DIR, "yolo11n.pt")
+LOST_ITEM_MODEL_PATH = os.path.join(MODELS_DIR, "semi_yolo_model.pt")
+
+class ModelRegistry :
+    def __init__(self, reap_interval : float = 10.0) :
+        """
+        :param reap_interval: 유휴 모델 검사 주기(초)
+        """
+        self.reap_interval = reap_interval
+
+        # name -> {"path" : str, "idle_timeout" : float | None}
+        self.specs = {}
+        # key("name:backend") -> 모델 / 사용 정보
+        self.models = {}
+        self.last_used = {}
+        self.in_use = {}
+        self.counters = {}
+
+        self.lock = threading.Lock()
+        self.load_locks = {}
+        self.reaper_started = False
+
+    def register(self, name : str, path : str, idle_timeout : float | None = None) :
+        """
+        :param name: 모델 이름
+        :param path: 가중치(.pt) 경로
+        :param idle_timeout: 미사용 시 해제까지의 시간(초), None이면 해제하지 않음
+        """
+        with self.lock :
+            self.specs[name] = {"path" : path, "idle_timeout" : idle_timeout}
+
+    def configure(self, name : str, idle_timeout : float | None) :
+        """설정 파일 값으로 유휴 해제 시간 변경"""
+        with self.lock :
+            self.specs[name]["idle_timeout"] = idle_timeout
+
+    def put(self, name : str, backend : str, model) :
+        """이미 만들어진 모델 등록(재생 벤치마크의 대체 검출기 등)"""
+        with self.lock :
+            key = self._key(name, backend)
+            self.models[key] = model
+            self.last_used[key] = time.monotonic()
+
+    def _key(self, name : str, backend : str) :
+        key = f'{name}:{backend}'
+        if key not in self.counters :
+            self.load_locks[key] = threading.Lock()
+            self.in_use[key] = 0
+            self.counters[key] = {"loads" : 0, "unloads" : 0, "hits" : 0}
+        return key
+
+    def get(self, name : str, backend : str = "torch") :
+        """모델 반환(없으면 로드). 유휴 해제 대상 모델은 use()를 사용"""
+        with self.lock :
+            key = self._key(name, backend)
+        model = self._load_if_needed(name, backend, key)
+        with self.lock :
+            self.last_used[key] = time.monotonic()
+        return model
+
+    @contextmanager
+    def use(self, name : str, backend : str = "torch") :
+        """사용 중에는 언로드되지 않도록 잡아두고 모델 반환"""
+        with self.lock :
+            key = self._key(name, backend)
+            self.in_use[key] += 1
+        try :
+            yield self.get(name, backend)
+        finally :
+            with self.lock :
+                self.in_use[key] -= 1
+                self.last_used[key] = time.monotonic()
+
+    def _load_if_needed(self, name : str, backend : str, key : str) :
+        with self.lock :
+            model = self.models.get(key)
+            if model is not None :
+                self.counters[key]["hits"] += 1
+                return model
+            spec = self.specs[name]
+
+        # 같은 모델을 동시에 두 번 로드하지 않도록 모델별 lock
+        with self.load_locks[key] :
+            with self.lock :
+                model = self.models.get(key)
+                if model is not None :
+                    # 기다리는 동안 다른 스레드가 로드 완료 : 이미 있는 모델을 쓴 것이므로 hit
+                    self.counters[key]["hits"] += 1
+                    return model
+
+            started = time.monotonic()
+            model = load_detector(spec["path"], backend)
+            print(f'[ModelRegistry] {key} 로드 완료 ({time.monotonic() - started:.2f}s)')
+
+            with self.lock :
+                self.models[key] = model
+                self.counters[key]["loads"] += 1
+                need_reaper = spec["idle_timeout"] is not None and not self.reaper_started
+                if need_reaper :
+                    self.reaper_started = True
+
+        if need_reaper :
+            threading.Thread(target=self._reap_loop, daemon=True).start()
+
+        return model
+
+    def _reap_loop(self) :
+        """유휴 모델 해제 루프"""
+        while True :
+            time.sleep(self.reap_interval)
+            now = time.monotonic()
+            unloaded = []
+
+            with self.lock :
+                for key, model in list(self.models.items()) :
+                    name = key.split(":")[0]
+                    idle_timeout = self.specs[name]["idle_timeout"]
+                    if idle_timeout is None or self.in_use[key] > 0 :
+                        continue
+                    if now - self.last_used.get(key, now) < idle_timeout :
+                        continue
+
+                    del self.models[key]
+                    self.counters[key]["unloads"] += 1
+                    unloaded.append(key)
+
+            if unloaded :
+                gc.collect()
+                print(f'[ModelRegistry] 유휴 모델 해제 : {unloaded}')
+
+    def get_status(self) :
+        with self.lock :
+            now = time.monotonic()
+            status = {}
+            for key, counters in self.counters.items() :
+                name = key.split(":")[0]
+                last_used = self.last_used.get(key)
+                status[key] = {
+                    "loaded" : key in self.models,
+                    "idle_timeout" : self.specs[name]["idle_timeout"],
+                    "idle_seconds" : round(now - last_used, 1) if last_used else None,
+                    **counters
+                }
+            return status
+
+# 전역 모델 레지스트리 인스턴스
+model_registry = ModelRegistry()
+model_registry.register("person", PERSON_MODEL_PATH)
+model_registry.register("lost_item", LOST_ITEM_MODEL_PATH, idle_timeout=300)
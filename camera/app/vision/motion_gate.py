@@ -0,0 +1,114 @@
+import cv2
+import threading
+import numpy as np
+
+##########################################################################
+# 모션 게이트
+# - 추론 전에 좌석 ROI별 화면 변화량을 싸게 계산(축소 흑백 프레임 차분)
+# - 마지막으로 추론했을 때의 화면(reference)과 비교해서 천천히 변하는 것도 감지
+# - ROI 합계는 integral image로 모든 ROI를 한 번에(vectorized) 계산
+# - 변화가 threshold를 넘거나 refresh_interval이 지난 ROI만 추론 대상으로 선택
+##########################################################################
+
+class MotionGate :
+    def __init__(self, threshold : float = 6.0, refresh_interval : float = 5.0, downscale_width : int = 160) :
+        """
+        :param threshold: ROI 평균 밝기 차이(0~255) 기준값
+        :param refresh_interval: 변화가 없어도 다시 추론하는 주기(초)
+        :param downscale_width: 차분 계산용 축소 프레임 너비
+        """
+        self.threshold = threshold
+        self.refresh_interval = refresh_interval
+        self.downscale_width = downscale_width
+
+        self.reference = None
+        self.last_inferred = {}   # seat_id -> 마지막 추론 시각
+
+        self.lock = threading.Lock()
+        self.stats = {
+            "frames_checked" : 0,
+            "frames_skipped" : 0,
+            "rois_checked" : 0,
+            "rois_inferred" : 0
+        }
+
+    def _downscale(self, frame) :
+        height, width = frame.shape[:2]
+        small_w = min(self.downscale_width, width)
+        small_h = max(1, round(height * small_w / width))
+        small = cv2.resize(frame, (small_w, small_h), interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(small, cv2.COLOR_BGR2GRAY) if small.ndim == 3 else small
+
+    def select(self, frame, seat_ids, rois, now : float, forced = ()) :
+        """
+        :param seat_ids: 검사할 좌석 번호 목록
+        :param rois: seat_ids 순서의 픽셀 ROI 목록 [(x1, y1, x2, y2), ...]
+        :param forced: 변화와 상관없이 추론할 좌석
+        :return: 추론이 필요한 seat_id 집합
+        """
+        if not seat_ids :
+            return set()
+
+        small = self._downscale(frame)
+        small_h, small_w = small.shape
+        scale = small_w / frame.shape[1]
+
+        # 축소 좌표계 ROI (N, 4)
+        boxes = np.floor(np.asarray(rois, dtype=np.float32) * scale).astype(np.int32)
+        boxes[:, [0, 2]] = np.clip(boxes[:, [0, 2]], 0, small_w)
+        boxes[:, [1, 3]] = np.clip(boxes[:, [1, 3]], 0, small_h)
+        # 최소 1픽셀 넓이 보장
+        boxes[:, 0] = np.minimum(boxes[:, 0], small_w - 1)
+        boxes[:, 1] = np.minimum(boxes[:, 1], small_h - 1)
+        boxes[:, 2] = np.maximum(boxes[:, 2], boxes[:, 0] + 1)
+        boxes[:, 3] = np.maximum(boxes[:, 3], boxes[:, 1] + 1)
+        x1, y1, x2, y2 = boxes[:, 0], boxes[:, 1], boxes[:, 2], boxes[:, 3]
+
+        with self.lock :
+            if self.reference is None or self.reference.shape != small.shape :
+                # 기준 화면이 없으면 전부 추론
+                self.reference = small.copy()
+                changed = np.ones(len(seat_ids), dtype=bool)
+            else :
+                # ROI별 평균 차이 = integral image 네 꼭짓점 계산
+                integral = cv2.integral(cv2.absdiff(small, self.reference))
+                sums = integral[y2, x2] - integral[y1, x2] - integral[y2, x1] + integral[y1, x1]
+                means = sums / ((x2 - x1) * (y2 - y1))
+
+                last = np.array([self.last_inferred.get(seat_id, -np.inf) for seat_id in seat_ids])
+                forced_mask = np.array([seat_id in forced for seat_id in seat_ids], dtype=bool)
+                changed = (means > self.threshold) | (now - last >= self.refresh_interval) | forced_mask
+
+            selected = set()
+            for index in np.flatnonzero(changed) :
+                seat_id = seat_ids[index]
+                selected.add(seat_id)
+                self.last_inferred[seat_id] = now
+                # 추론하는 ROI는 기준 화면 갱신
+                self.reference[y1[index]:y2[index], x1[index]:x2[index]] = \
+                    small[y1[index]:y2[index], x1[index]:x2[index]]
+
+            self.stats["frames_checked"] += 1
+            self.stats["rois_checked"] += len(seat_ids)
+            self.stats["rois_inferred"] += len(selected)
+            if not selected :
+                self.stats["frames_skipped"] += 1
+
+        return selected
+
+    def forget(self, seat_id : int) :
+        """감지 종료된 좌석은 다음 입실 때 바로 추론하도록 기록 삭제"""
+        with self.lock :
+            self.last_inferred.pop(seat_id, None)
+
+    def get_status(self) :
+        with self.lock :
+            rois_checked = self.stats["rois_checked"]
+            frames_checked = self.stats["frames_checked"]
+            return {
+                "threshold" : self.threshold,
+                "refresh_interval" : self.refresh_interval,
+                "skipped_roi_ratio" : round(1 - self.stats["rois_inferred"] / rois_checked, 3) if rois_checked else 0.0,
+                "skipped_frame_ratio" : round(self.stats["frames_skipped"] / frames_checked, 3) if frames_checked else 0.0,
+                **self.stats
+            }
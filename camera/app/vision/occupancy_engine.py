@@ -0,0 +1,185 @@
+import time
+import numpy as np
+from datetime import datetime
+from vision.schemas.schemas import SeatEvent, SeatEventType
+
+##########################################################################
+# 점유 판정 엔진(카메라 1대 = 엔진 1개, 좌석 착석 / 이탈 판정은 여기에서만 구현)
+# - 좌석별 상태머신 대신 모든 좌석을 배열로 관리
+# - ROI (N, 4) x 사람 bbox (B, 4) 겹침 행렬을 한 번에 계산
+# - 좌석별 상태 / 카운터도 배열로 갱신하고 상태가 바뀐 좌석만 이벤트 생성
+# - 판정 규칙
+#   dwell_seconds 지정 시 : 시간 기준(dwell_seconds 이상, 추론 결과의 min_ratio 이상이 반대 상태)
+#   -> 분석 FPS와 관계없이 같은 시간이 지나야 입/퇴실 판정(FPS를 낮춰도 판정 의미 유지)
+#   dwell_seconds 미지정 시 : 기존 방식(연속 threshold 프레임)
+# - 스레드 안전하지 않음 : CameraWorker가 update / reset을 active_lock 안에서 호출
+##########################################################################
+
+UNKNOWN = -1
+
+class OccupancyEngine :
+    def __init__(self, seat_rois : dict, threshold : int = 20,
+                 dwell_seconds : float | None = None, min_ratio : float = 0.8) :
+        """
+        :param seat_rois: {seat_id : (x1, y1, x2, y2)} 픽셀 좌표
+        :param threshold: 안정화 프레임 수(dwell_seconds가 없을 때만 사용)
+        :param dwell_seconds: 입/퇴실 판정에 필요한 시간(초), None이면 프레임 수 기준
+        :param min_ratio: 판정 시간 동안 반대 상태로 나와야 하는 추론 결과 비율(0~1)
+                          반대 결과가 (1 - min_ratio) * dwell_seconds 보다 오래 이어지면 판정 취소
+        """
+        self.seat_ids = list(seat_rois.keys())
+        self.index = {seat_id : i for i, seat_id in enumerate(self.seat_ids)}
+        self.threshold = threshold
+        self.dwell_seconds = dwell_seconds
+        self.min_ratio = min_ratio
+        self.max_gap = (1.0 - min_ratio) * dwell_seconds if dwell_seconds is not None else None
+
+        size = len(self.seat_ids)
+        self.rois = np.array([seat_rois[seat_id] for seat_id in self.seat_ids], dtype=np.float32).reshape(size, 4)
+        self.occupied = np.zeros(size, dtype=bool)
+        # 판정 중 반대 상태로 나온 추론 결과 수(프레임 기준이면 연속 프레임 수)
+        self.counters = np.zeros(size, dtype=np.int32)
+        # 시간 기준 판정 : 판정 시작 시각 / 판정 중 전체 추론 결과 수 / 마지막으로 반대 상태가 나온 시각
+        self.pending_since = np.zeros(size, dtype=np.float64)
+        self.samples = np.zeros(size, dtype=np.int32)
+        self.last_changing = np.zeros(size, dtype=np.float64)
+        # 마지막 추론 결과(-1 : 없음, 0 : 없음, 1 : 있음)
+        self.last_inside = np.full(size, UNKNOWN, dtype=np.int8)
+
+    def mask(self, seat_ids) :
+        """seat_id 목록 -> bool 마스크"""
+        mask = np.zeros(len(self.seat_ids), dtype=bool)
+        for seat_id in seat_ids :
+            mask[self.index[seat_id]] = True
+        return mask
+
+    def roi(self, seat_id : int) :
+        return tuple(self.rois[self.index[seat_id]].tolist())
+
+    def set_rois(self, seat_rois : dict) :
+        """해상도가 바뀌었을 때 픽셀 ROI 교체"""
+        for seat_id, roi in seat_rois.items() :
+            self.rois[self.index[seat_id]] = roi
+
+    def inherit(self, previous : "OccupancyEngine") :
+        """설정 변경으로 엔진을 새로 만들 때 양쪽에 있는 좌석의 판정 상태 이어받기"""
+        for seat_id, i in self.index.items() :
+            j = previous.index.get(seat_id)
+            if j is None :
+                continue
+            for name in ("occupied", "counters", "pending_since", "samples", "last_changing", "last_inside") :
+                getattr(self, name)[i] = getattr(previous, name)[j]
+
+    def counter(self, seat_id : int) -> int :
+        return int(self.counters[self.index[seat_id]])
+
+    def state(self, seat_id : int) -> str :
+        return "OCCUPIED" if self.occupied[self.index[seat_id]] else "EMPTY"
+
+    def reset(self, seat_id : int) :
+        """입실 / 퇴실 시 상태 초기화"""
+        i = self.index[seat_id]
+        self.occupied[i] = False
+        self.counters[i] = 0
+        self.samples[i] = 0
+        self.last_inside[i] = UNKNOWN
+
+    def overlap(self, boxes) :
+        """
+        ROI x bbox 겹침 행렬
+        :param boxes: (B, 4) 사람 bbox
+        :return: (N, B) bool
+        """
+        boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, 4)
+        x1, y1, x2, y2 = (self.rois[:, k:k + 1] for k in range(4))
+        bx1, by1, bx2, by2 = (boxes[:, k] for k in range(4))
+        # 겹치지 않는 조건이 모두 False이면 겹침
+        return ~((bx2 < x1) | (bx1 > x2) | (by2 < y1) | (by1 > y2))
+
+    def update(self, boxes, active, inferred = None, timestamp : float | None = None) :
+        """
+        :param boxes: (B, 4) 이번 프레임 사람 bbox
+        :param active: 감지 중인 좌석 bool 마스크
+        :param inferred: 이번에 추론한 좌석 bool 마스크(None이면 active 전체), 나머지는 마지막 결과 재사용
+        :param timestamp: 프레임 시각(monotonic, 초), None이면 현재 시각
+        :return: 상태가 바뀐 좌석의 SeatEvent 리스트
+        """
+        if inferred is None :
+            inferred = active
+        inferred = inferred & active
+
+        inside = self.last_inside.copy()
+        if inferred.any() :
+            inside[inferred] = self.overlap(boxes)[inferred].any(axis=1)
+        return self._step(inside, active, timestamp)
+
+    def update_unchanged(self, active, timestamp : float | None = None) :
+        """화면 변화가 없어 추론을 건너뛴 경우 : 마지막 결과로 업데이트"""
+        return self._step(self.last_inside.copy(), active, timestamp)
+
+    def _step(self, inside, active, timestamp = None) :
+        now = datetime.now()
+
+        # 추론 결과가 한 번도 없는 좌석은 제외
+        stepped = active & (inside != UNKNOWN)
+        self.last_inside[stepped] = inside[stepped]
+        inside = inside == 1
+
+        # EMPTY인데 사람 있음 / OCCUPIED인데 사람 없음
+        changing = stepped & (inside != self.occupied)
+        if self.dwell_seconds is None :
+            # 연속 프레임 수 : 카운터 증가, 아니면 초기화
+            self.counters[changing] += 1
+            self.counters[stepped & ~changing] = 0
+            fired = changing & (self.counters >= self.threshold)
+        else :
+            fired = self._step_dwell(stepped, changing, time.monotonic() if timestamp is None else timestamp)
+
+        if not fired.any() :
+            return []
+
+        self.occupied[fired] = ~self.occupied[fired]
+        self.counters[fired] = 0
+        self.samples[fired] = 0
+
+        events = []
+        for i in np.flatnonzero(fired) :
+            event_type = SeatEventType.CHECK_IN if self.occupied[i] else SeatEventType.CHECK_OUT
+            events.append(SeatEvent(seat_id=self.seat_ids[i],
+                                    event_type=event_type,
+                                    detected_at=now))
+        return events
+
+    def _step_dwell(self, stepped, changing, timestamp) :
+        """시간 기준 판정 : 판정 시간이 지났고 반대 상태 비율이 min_ratio 이상인 좌석"""
+        # 처음 반대 상태가 나온 좌석은 판정 시작
+        starting = changing & (self.counters == 0)
+        self.pending_since[starting] = timestamp
+        self.samples[starting] = 0
+
+        pending = stepped & ((self.counters > 0) | starting)
+        self.samples[pending] += 1
+        self.counters[changing] += 1
+        self.last_changing[changing] = timestamp
+
+        # 원래 상태로 돌아온 시간이 허용치보다 길면 판정 취소
+        cancelled = pending & ~changing & (timestamp - self.last_changing > self.max_gap)
+        self.counters[cancelled] = 0
+        self.samples[cancelled] = 0
+
+        # 판정 시간이 지났는데 비율이 모자라면(오래된 판정) 지금부터 다시 판정
+        elapsed = changing & (timestamp - self.pending_since >= self.dwell_seconds)
+        enough = self.counters >= self.min_ratio * self.samples
+        stale = elapsed & ~enough
+        self.pending_since[stale] = timestamp
+        self.counters[stale] = 1
+        self.samples[stale] = 1
+
+        return elapsed & enough
+
+    def has_pending(self, active) -> bool :
+        """입/퇴실 판정 중(counter > 0)인 좌석이 있는지"""
+        return bool((self.counters[active] > 0).any())
+
+    def pending_seats(self, active) :
+        return [self.seat_ids[i] for i in np.flatnonzero(active & (self.counters > 0))]
@@ -0,0 +1,190 @@
+import numpy as np
+from vision.metrics import metrics
+
+##########################################################################
+# 사람 추적기(SORT 방식, 카메라 1대 = 1개)
+# - 사람 bbox마다 Kalman 필터(중심 x, y / 너비 / 높이 + 중심 속도) 유지
+# - 감지는 detect_interval 프레임마다만 실행하고 그 사이 프레임은 예측 bbox로 좌석 판정
+#   -> 같은 CPU로 판정 갱신 횟수를 늘림
+# - 감지 프레임 : 예측 bbox와 감지 bbox를 IoU 순으로 매칭(greedy)
+#   매칭 안 된 추적은 max_coast초 동안 예측 bbox를 계속 내보냄(ByteTrack처럼 lost 상태 유지)
+#   -> 순간적인 감지 누락으로 좌석 판정이 흔들리지 않음
+# - 감지 결과에 점수가 없어서 ByteTrack의 낮은 점수 2차 매칭은 사용하지 않음
+##########################################################################
+
+# 측정(감지 bbox) / 속도 잡음(px 기준 표준편차)
+MEASUREMENT_STD = 8.0
+VELOCITY_STD = 20.0
+
+class _Track :
+    """추적 1개 : 상태 [cx, cy, w, h, vx, vy], 공분산 P"""
+    def __init__(self, track_id : int, box, timestamp : float) :
+        self.track_id = track_id
+        x1, y1, x2, y2 = box
+        self.x = np.array([(x1 + x2) / 2, (y1 + y2) / 2, x2 - x1, y2 - y1, 0.0, 0.0])
+        self.P = np.diag([MEASUREMENT_STD, MEASUREMENT_STD, MEASUREMENT_STD, MEASUREMENT_STD,
+                          VELOCITY_STD * 10, VELOCITY_STD * 10]) ** 2
+        self.predicted_at = timestamp
+        self.updated_at = timestamp
+        self.hits = 1
+
+    def predict(self, timestamp : float) :
+        dt = max(0.0, timestamp - self.predicted_at)
+        if dt == 0.0 :
+            return
+        F = np.eye(6)
+        F[0, 4] = F[1, 5] = dt
+        # 속도 변화(가속)를 잡음으로 : dt가 길수록 불확실성 증가
+        Q = np.diag([0.0, 0.0, MEASUREMENT_STD, MEASUREMENT_STD, VELOCITY_STD, VELOCITY_STD]) ** 2 * dt
+        self.x = F @ self.x
+        self.x[2:4] = np.maximum(self.x[2:4], 1.0)
+        self.P = F @ self.P @ F.T + Q
+        self.predicted_at = timestamp
+
+    def update(self, box, timestamp : float) :
+        x1, y1, x2, y2 = box
+        z = np.array([(x1 + x2) / 2, (y1 + y2) / 2, x2 - x1, y2 - y1])
+        H = np.eye(4, 6)
+        R = np.eye(4) * MEASUREMENT_STD ** 2
+        S = H @ self.P @ H.T + R
+        K = self.P @ H.T @ np.linalg.inv(S)
+        self.x = self.x + K @ (z - H @ self.x)
+        self.P = (np.eye(6) - K @ H) @ self.P
+        self.updated_at = timestamp
+        self.hits += 1
+
+    def box(self) :
+        cx, cy, w, h = self.x[:4]
+        return cx - w / 2, cy - h / 2, cx + w / 2, cy + h / 2
+
+class PersonTracker :
+    def __init__(self, detect_interval : int = 3,
+                 iou_threshold : float = 0.3,
+                 max_coast : float = 1.0,
+                 camera_id : str = "") :
+        """
+        :param detect_interval: 감지 주기(분석 프레임 수), 1이면 매 프레임 감지(추적은 누락 보정만)
+        :param iou_threshold: 예측 bbox - 감지 bbox 매칭 최소 IoU
+        :param max_coast: 감지되지 않은 추적을 유지하는 시간(초), 마지막 감지 후 이 시간이 지나면 바로 감지
+        :param camera_id: 지표 라벨
+        """
+        self.detect_interval = max(1, detect_interval)
+        self.iou_threshold = iou_threshold
+        self.max_coast = max_coast
+        self.camera_id = camera_id
+
+        self.tracks = []
+        self.next_id = 1
+        self.frames_since_detection = 0
+        self.last_detection = None
+        self.stats = {
+            "detected_frames" : 0,
+            "propagated_frames" : 0,
+            "tracks_created" : 0,
+            "coasted_boxes" : 0
+        }
+
+    def detection_due(self, timestamp : float) -> bool :
+        """이번 프레임에 감지를 실행해야 하는지"""
+        if self.last_detection is None or timestamp - self.last_detection >= self.max_coast :
+            return True
+        return self.frames_since_detection + 1 >= self.detect_interval
+
+    def predict(self, timestamp : float) -> np.ndarray :
+        """감지 없는 프레임 : 모든 추적의 예측 bbox (K, 4)"""
+        self.frames_since_detection += 1
+        self.stats["propagated_frames"] += 1
+        metrics.inc("tracker_frames_total", camera=self.camera_id, kind="propagated")
+        for track in self.tracks :
+            track.predict(timestamp)
+        return self._boxes(self.tracks)
+
+    def update(self, boxes, timestamp : float, regions = None) -> np.ndarray :
+        """
+        감지 프레임 : 감지 bbox로 추적 갱신
+        :param boxes: (B, 4) 감지 bbox
+        :param regions: 이번에 추론한 영역 목록(None이면 전체 프레임)
+                        영역 밖 추적은 감지할 수 없으므로 마지막 위치에 멈춰 두고(속도 0) max_coast가 지나면 삭제
+        :return: 매칭된 추적 + 유지 중인(coast) 추적의 bbox (K, 4)
+        """
+        self.frames_since_detection = 0
+        self.last_detection = timestamp
+        self.stats["detected_frames"] += 1
+        metrics.inc("tracker_frames_total", camera=self.camera_id, kind="detected")
+
+        boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, 4)
+        for track in self.tracks :
+            if not _inside_regions(track.box(), regions) :
+                # 보이지 않는 곳에서 예측 bbox가 계속 움직여 다른 좌석 ROI로 들어가지 않도록 멈춤
+                track.x[4:] = 0.0
+            track.predict(timestamp)
+
+        matched, unmatched_boxes = self._match(boxes)
+        for track, index in matched :
+            track.update(boxes[index], timestamp)
+
+        matched_tracks = {id(track) for track, _ in matched}
+        alive = []
+        coasted = 0
+        for track in self.tracks :
+            if id(track) not in matched_tracks :
+                if timestamp - track.updated_at > self.max_coast :
+                    continue
+                coasted += 1
+            alive.append(track)
+
+        for index in unmatched_boxes :
+            alive.append(_Track(self.next_id, boxes[index], timestamp))
+            self.next_id += 1
+            self.stats["tracks_created"] += 1
+
+        self.tracks = alive
+        self.stats["coasted_boxes"] += coasted
+        return self._boxes(self.tracks)
+
+    def _match(self, boxes) :
+        """IoU가 큰 쌍부터 매칭 : ([(track, box index)], 매칭 안 된 box index 목록)"""
+        if not self.tracks or len(boxes) == 0 :
+            return [], list(range(len(boxes)))
+
+        ious = _iou_matrix(self._boxes(self.tracks), boxes)
+        matched = []
+        while True :
+            t, d = np.unravel_index(np.argmax(ious), ious.shape)
+            if ious[t, d] < self.iou_threshold :
+                break
+            matched.append((self.tracks[t], d))
+            ious[t, :] = -1.0
+            ious[:, d] = -1.0
+        used = {d for _, d in matched}
+        return matched, [d for d in range(len(boxes)) if d not in used]
+
+    def _boxes(self, tracks) -> np.ndarray :
+        if not tracks :
+            return np.empty((0, 4), dtype=np.float32)
+        return np.array([track.box() for track in tracks], dtype=np.float32)
+
+    def get_status(self) :
+        return {
+            "detect_interval" : self.detect_interval,
+            "tracks" : len(self.tracks),
+            **self.stats
+        }
+
+def _iou_matrix(a, b) :
+    """(T, 4) x (D, 4) IoU 행렬"""
+    x1 = np.maximum(a[:, None, 0], b[None, :, 0])
+    y1 = np.maximum(a[:, None, 1], b[None, :, 1])
+    x2 = np.minimum(a[:, None, 2], b[None, :, 2])
+    y2 = np.minimum(a[:, None, 3], b[None, :, 3])
+    inter = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+    area_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+    area_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    return inter / np.maximum(area_a[:, None] + area_b[None, :] - inter, 1e-6)
+
+def _inside_regions(box, regions) -> bool :
+    """bbox 중심이 추론 영역 안에 있는지(regions가 None이면 전체 프레임)"""
+    if regions is None :
+        return True
+    cx, cy = (box[0] + box[2]) / 2, (box[1] + box[3]) / 2
+    return any(x1 <= cx < x2 and y1 <= cy < y2 for x1, y1, x2, y2 in regions)
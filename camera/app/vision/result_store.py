@@ -0,0 +1,114 @@
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+
+##########################################################################
+# 결과 저장소(유실물 검사 결과 등)
+# - 키별 결과를 ttl 동안만 보관하고 max_size를 넘으면 오래된 것부터 삭제
+# - 저장 / 조회할 때 만료된 항목을 같이 정리(별도 스레드 없음)
+# - 크기 / 가장 오래된 항목 나이 / 삭제 수를 /health, /metrics로 노출
+# - wait()로 결과가 저장되는 순간까지 비동기로 대기(long-poll)
+##########################################################################
+
+class ResultStore :
+    def __init__(self, ttl : float = 600.0, max_size : int = 1000) :
+        """
+        :param ttl: 결과 보관 시간(초), 마지막 저장 시각 기준
+        :param max_size: 최대 보관 개수
+        """
+        self.ttl = ttl
+        self.max_size = max_size
+
+        # key -> (저장 시각(monotonic), 값), 저장 순서 유지
+        self.items = OrderedDict()
+        # key -> [(event loop, future)] : put() 시 깨울 대기자
+        self.waiters = {}
+        self.lock = threading.Lock()
+        self.stats = {
+            "puts" : 0,
+            "hits" : 0,
+            "misses" : 0,
+            "expired" : 0,
+            "evicted" : 0
+        }
+
+    def put(self, key, value) :
+        with self.lock :
+            now = time.monotonic()
+            self.items.pop(key, None)
+            self.items[key] = (now, value)
+            self.stats["puts"] += 1
+            self._expire(now)
+            while len(self.items) > self.max_size :
+                self.items.popitem(last=False)
+                self.stats["evicted"] += 1
+            waiters = self.waiters.pop(key, [])
+
+        # 다른 스레드(SeatManager)에서 호출되므로 각 대기자의 이벤트 루프에서 완료 처리
+        for loop, future in waiters :
+            loop.call_soon_threadsafe(_resolve, future, value)
+
+    def get(self, key) :
+        with self.lock :
+            self._expire(time.monotonic())
+            entry = self.items.get(key)
+            if entry is None :
+                self.stats["misses"] += 1
+                return None
+            self.stats["hits"] += 1
+            return entry[1]
+
+    async def wait(self, key, predicate, timeout : float) :
+        """
+        predicate(결과)가 True가 될 때까지 최대 timeout초 대기
+        :return: 결과(시간 초과 시 마지막 결과, 없으면 None)
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while True :
+            with self.lock :
+                self._expire(time.monotonic())
+                entry = self.items.get(key)
+                value = entry[1] if entry else None
+                remaining = deadline - loop.time()
+                if (value is not None and predicate(value)) or remaining <= 0 :
+                    return value
+                future = loop.create_future()
+                self.waiters.setdefault(key, []).append((loop, future))
+
+            try :
+                await asyncio.wait_for(future, remaining)
+            except asyncio.TimeoutError :
+                with self.lock :
+                    waiters = self.waiters.get(key, [])
+                    if (loop, future) in waiters :
+                        waiters.remove((loop, future))
+                    if not waiters :
+                        self.waiters.pop(key, None)
+
+    def _expire(self, now : float) :
+        """앞(가장 오래된 것)부터 ttl이 지난 항목 삭제"""
+        while self.items :
+            saved_at, _ = next(iter(self.items.values()))
+            if now - saved_at < self.ttl :
+                break
+            self.items.popitem(last=False)
+            self.stats["expired"] += 1
+
+    def get_status(self) :
+        with self.lock :
+            now = time.monotonic()
+            self._expire(now)
+            oldest = next(iter(self.items.values()))[0] if self.items else None
+            return {
+                "size" : len(self.items),
+                "max_size" : self.max_size,
+                "ttl" : self.ttl,
+                "oldest_age_seconds" : round(now - oldest, 1) if oldest is not None else None,
+                **self.stats
+            }
+
+def _resolve(future, value) :
+    if not future.done() :
+        future.set_result(value)
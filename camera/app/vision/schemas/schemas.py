@@ -15,4 +15,8 @@ class SeatEvent(BaseModel) :
     usage_id : int | None = None
     camera_id : str | None = None
     items : list | None = None
-    image_base64 : str | None = None
+    image_key : str | None = None
+    # 카메라 스트림이 끊겨 검사하지 못한 유실물 결과
+    camera_down : bool = False
+    # 모델 / 백엔드 / 인코더 오류로 검사하지 못한 유실물 결과
+    detection_failed : bool = False
@@ -1,7 +1,8 @@
 import queue
 import threading
-import requests
 from datetime import datetime
+from vision.image_encoder import ImageEncoder
+from vision.result_store import ResultStore
 from vision.schemas.schemas import SeatEventType
 import math
 
@@ -19,12 +20,12 @@ seat_manager
 5. 유실물 검사 요청 상황 처리
 """
 
-CAMERA_SERVER_URL = 'http://localhost:12454'
-
 class SeatManager :
-    def __init__(self, camera_manager) :
+    def __init__(self, camera_manager, outbox = None, result_config = None, encoder_config = None) :
         # 카메라 id에 매칭된 카메라 객체
         self.camera_manager = camera_manager
+        # 웹서버 전송은 EventOutbox(로컬 기록) -> EventDelivery(별도 asyncio 루프)가 담당
+        self.outbox = outbox
         # 큐에 이벤트 담을 수 있도록 큐 객체 생성
         self.event_queue = queue.Queue()
         self.seat_states = {}
@@ -38,8 +39,17 @@ class SeatManager :
         """
 
         self.runnig = False
-        self.lost_item_results = {}
-        self.result_lock = threading.Lock()
+        # usage_id -> 유실물 검사 결과(ttl / 최대 개수 제한)
+        self.lost_item_results = ResultStore(**(result_config or {}))
+        # 유실물 크롭 JPEG 인코딩 / 보관(내용 hash 기준)
+        # 결과 1건이 이미지 1개를 참조하므로 결과가 남아 있는 동안 image_url이 404가 되지 않도록 결과 수 이상 보관
+        encoder_config = dict(encoder_config or {})
+        max_images = encoder_config.get("max_images", self.lost_item_results.max_size)
+        if max_images < self.lost_item_results.max_size :
+            print(f'[SeatManager] image_encoding.max_images({max_images})를 '
+                  f'lost_item_results.max_size({self.lost_item_results.max_size})로 늘림')
+        encoder_config["max_images"] = max(max_images, self.lost_item_results.max_size)
+        self.image_encoder = ImageEncoder(**encoder_config)
 
     def handle_web_checkin(self, seat_id, usage_id) :
         """웹으로 부터 입실요청 받았을 때 처리하는 메서드"""
@@ -83,14 +93,46 @@ class SeatManager :
             "last_update" : None
         }
 
+    def handle_web_release(self, seat_id, usage_id) :
+        """웹으로 부터 자동 퇴실(이용권 만료) 받았을 때 처리하는 메서드"""
+        current = self.seat_states.get(seat_id)
+
+        # 자리 비어있거나 다른 이용 건이면 무시
+        if not current or current["status"] == "EMPTY" or current["usage_id"] != usage_id :
+            return
+
+        # 카메라에 감지 종료 요청(유실물 검사 없음)
+        self.camera_manager.stop_tracking(seat_id)
+
+        self.seat_states[seat_id] = {
+            "status" : "EMPTY",
+            "usage_id" : None,
+            "in_out_times" : {"in_time" : None, "out_time" : None},
+            "last_update" : None
+        }
 
     def push_event(self, event) :
         """카메라로부터 이벤트 전달 받는 메서드"""
         self.event_queue.put(event)
 
+    def push_lost_item(self, event, image) :
+        """
+        유실물이 감지된 LOST_ITEM 이벤트를 크롭 이미지와 같이 전달 받는 메서드
+        JPEG 인코딩은 인코더 스레드에서 처리하고 끝나면 이미지 key를 붙여서 이벤트 큐로 전달
+        (image는 프레임 버퍼를 가리킬 수 있으므로 복사해서 넘김)
+        """
+        def encoded(image_key) :
+            event.image_key = image_key
+            self.push_event(event)
+
+        self.image_encoder.submit(image.copy(), encoded, event.camera_id or "")
+
     def start(self) :
         """seat_manger 시작(백그라운드 실행)"""
         self.running = True
+        if self.outbox is not None :
+            self.outbox.start()
+        self.image_encoder.start()
         threading.Thread(target=self._event_loop, daemon=True).start()
 
     def _event_loop(self) :
@@ -130,30 +172,36 @@ class SeatManager :
 
     def _store_lost_item_result(self, event) :
         usage_id = event.usage_id
-        with self.result_lock :
-            self.lost_item_results[usage_id] = {
-                "done" : True,
-                "seat_id" : event.seat_id,
-                "usage_id" : usage_id,
-                "items" : event.items,
-                "image_base64" : event.image_base64,
-                "detected_at" : event.detected_at.isoformat()
-            }
+        key = event.image_key
+        sizes = self.image_encoder.sizes(key) if key else {}
+        self.lost_item_results.put(usage_id, {
+            "done" : True,
+            "seat_id" : event.seat_id,
+            "usage_id" : usage_id,
+            "items" : event.items,
+            "detected_at" : event.detected_at.isoformat(),
+            # 이미지는 /camera/lost-item/image/{key}로 따로 조회(JSON에는 메타데이터만)
+            "image_key" : key,
+            "image_url" : f'/camera/lost-item/image/{key}' if key else None,
+            "thumbnail_url" : f'/camera/lost-item/image/{key}?variant=thumb' if key else None,
+            "image_size" : sizes.get("full", 0),
+            "thumbnail_size" : sizes.get("thumb", 0),
+            "camera_down" : event.camera_down,
+            "detection_failed" : event.detection_failed,
+            # 유실물은 감지했지만 이미지 인코딩에 실패한 경우(items는 그대로 유효)
+            "image_missing" : bool(event.items) and not key
+        })
 
     def _notify_web(self, event) :
-        """check inout 이벤트 발생 시 웹으로 전달"""
+        """check inout 이벤트 발생 시 웹으로 전달(outbox에 넣고 바로 반환)"""
         payload = {
             'seat_id': event.seat_id,
             'event_type': event.event_type.value if hasattr(event.event_type, "value") else str(event.event_type),
             'detected_at': event.detected_at.isoformat(),
-            'minutes': event.minutes,
+            'minutes': event.minutes or 0,
             'usage_id': event.usage_id,
         }
-        try :
-            requests.post(
-                f'{CAMERA_SERVER_URL}/camera/event',
-                json=payload,
-                timeout=3)
-            
-        except Exception as e :
-            print('[ERROR] 웹 서버 전달 실패 : ', e)
+        if self.outbox is None :
+            print('[ERROR] 웹 서버 전송기 없음 : ', payload)
+            return
+        self.outbox.append(payload)
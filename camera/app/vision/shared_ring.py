@@ -0,0 +1,77 @@
+import queue
+import numpy as np
+from multiprocessing import shared_memory
+
+##########################################################################
+# 공유 메모리 링 버퍼
+# - 부모 프로세스가 slots x slot_bytes 크기의 shared_memory 1개를 만들고 자식(카메라 샤드)이 붙어서 사용
+# - 빈 슬롯 번호는 free 큐로 관리 : 쓰는 쪽이 꺼내서 쓰고, 읽는 쪽이 다 쓰면 반납
+# - 큐로는 (슬롯 번호, shape, dtype)만 보내고 이미지 바이트는 복사 한 번으로 전달
+# - 쓰는 쪽 프로세스가 죽으면 꺼내 간 슬롯이 반납되지 않으므로 부모가 reset으로 회수
+##########################################################################
+
+class SharedRing :
+    def __init__(self, free, slots : int = 16, slot_bytes : int = 4 * 1024 * 1024, name : str | None = None) :
+        """
+        :param free: 빈 슬롯 번호 큐(multiprocessing Queue), 생성하는 쪽이 전달
+        :param slots: 슬롯 개수
+        :param slot_bytes: 슬롯 1개 크기(byte), 넘는 이미지는 write()가 None 반환
+        :param name: 붙을 shared_memory 이름(None이면 새로 생성)
+        """
+        self.free = free
+        self.slots = slots
+        self.slot_bytes = slot_bytes
+        self.owner = name is None
+
+        if self.owner :
+            self.shm = shared_memory.SharedMemory(create=True, size=slots * slot_bytes)
+            for slot in range(slots) :
+                free.put(slot)
+        else :
+            # spawn으로 만든 자식은 부모의 resource tracker를 같이 쓰므로 정리는 부모의 close()가 담당
+            self.shm = shared_memory.SharedMemory(name=name)
+
+    def __reduce__(self) :
+        # 자식 프로세스에는 이름만 넘기고 같은 메모리에 다시 붙음
+        return SharedRing, (self.free, self.slots, self.slot_bytes, self.shm.name)
+
+    def write(self, image : np.ndarray, timeout : float = 1.0) :
+        """
+        빈 슬롯에 이미지 복사
+        :return: (slot, shape, dtype) | None(슬롯 크기 초과 / 빈 슬롯 없음)
+        """
+        if image.nbytes > self.slot_bytes :
+            return None
+        try :
+            slot = self.free.get(timeout=timeout)
+        except queue.Empty :
+            return None
+
+        self._view(slot, image.shape, image.dtype)[...] = image
+        return slot, image.shape, image.dtype.str
+
+    def read(self, slot : int, shape, dtype) -> np.ndarray :
+        """슬롯 내용(복사 없는 view, release 전까지만 유효)"""
+        return self._view(slot, shape, np.dtype(dtype))
+
+    def release(self, slot : int) :
+        self.free.put(slot)
+
+    def reset(self, free) :
+        """
+        만든 쪽(부모) 전용 : 빈 슬롯 큐를 새로 만든 free로 바꾸고 모든 슬롯 다시 등록
+        - 슬롯을 쓰는 프로세스가 없고 읽는 쪽이 전달받은 슬롯을 모두 반납한 뒤에 호출
+        - 이전 큐는 버림(남아 있는 슬롯 번호를 꺼내는 대신 새로 채워서 중복 등록 방지)
+        :param free: 새 빈 슬롯 번호 큐(이후 자식 프로세스에는 이 큐가 전달됨)
+        """
+        self.free = free
+        for slot in range(self.slots) :
+            free.put(slot)
+
+    def _view(self, slot, shape, dtype) :
+        return np.ndarray(shape, dtype=dtype, buffer=self.shm.buf, offset=slot * self.slot_bytes)
+
+    def close(self) :
+        self.shm.close()
+        if self.owner :
+            self.shm.unlink()
@@ -0,0 +1,123 @@
+import random
+import threading
+import time
+from vision.metrics import metrics
+
+##########################################################################
+# 스트림 상태 관리(카메라 1대 = 1개, FrameGrabber가 사용)
+# - connecting : 열었고 첫 프레임 대기 중
+# - streaming  : 프레임 정상 수신
+# - degraded   : degraded_after초 이상 프레임이 없음(읽기 실패 / 지연), 아직 재연결은 안 함
+# - down       : stall_timeout초 이상 프레임이 없음 -> 지수 backoff + jitter로 다시 열기
+# - 디코딩 스레드가 read()에서 멈춰 있어도 상태 조회 시 마지막 프레임 시각으로 판정
+##########################################################################
+
+CONNECTING = "connecting"
+STREAMING = "streaming"
+DEGRADED = "degraded"
+DOWN = "down"
+STATES = (CONNECTING, STREAMING, DEGRADED, DOWN)
+
+class StreamSupervisor :
+    def __init__(self, camera_id : str = "",
+                 degraded_after : float = 2.0,
+                 stall_timeout : float = 10.0,
+                 base_backoff : float = 1.0,
+                 max_backoff : float = 30.0) :
+        """
+        :param camera_id: 지표 라벨
+        :param degraded_after: 프레임이 없을 때 degraded로 보는 시간(초)
+        :param stall_timeout: 프레임이 없을 때 down으로 보고 다시 여는 시간(초)
+        :param base_backoff: 첫 재연결 대기(초), 실패할 때마다 2배
+        :param max_backoff: 재연결 대기 상한(초)
+        """
+        self.camera_id = camera_id
+        self.degraded_after = degraded_after
+        self.stall_timeout = stall_timeout
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+
+        self.lock = threading.Lock()
+        self.state = CONNECTING
+        self.state_since = time.monotonic()
+        # 마지막 정상 프레임 시각(연결 직후에는 연결 시각 : 첫 프레임까지 stall_timeout 유예)
+        self.last_ok = self.state_since
+        self.attempts = 0
+        self.transitions = {state : 0 for state in STATES}
+        self.stats = {
+            "reconnects" : 0,
+            "reconnect_failures" : 0
+        }
+
+    def on_frame(self, now : float) :
+        """프레임(또는 grab) 성공"""
+        with self.lock :
+            self.last_ok = now
+            self.attempts = 0
+            self._set(STREAMING, now)
+
+    def on_failure(self, now : float) -> bool :
+        """
+        읽기 실패
+        :return: 다시 열어야 하면 True
+        """
+        with self.lock :
+            age = now - self.last_ok
+            if age >= self.stall_timeout :
+                self._set(DOWN, now)
+                return True
+            if age >= self.degraded_after and self.state == STREAMING :
+                self._set(DEGRADED, now)
+            return False
+
+    def on_reconnect(self, opened : bool, now : float) :
+        """다시 열기 결과"""
+        with self.lock :
+            self.attempts += 1
+            if opened :
+                self.stats["reconnects"] += 1
+                self.last_ok = now
+                self._set(CONNECTING, now)
+            else :
+                self.stats["reconnect_failures"] += 1
+                self._set(DOWN, now)
+        metrics.inc("camera_reconnects_total", camera=self.camera_id, result="ok" if opened else "failed")
+
+    def backoff(self) -> float :
+        """다음 재연결까지 대기(초) : 지수 backoff + jitter"""
+        with self.lock :
+            delay = min(self.max_backoff, self.base_backoff * 2 ** self.attempts)
+        return delay * random.uniform(0.5, 1.0)
+
+    def current_state(self, now : float | None = None) -> str :
+        """마지막 프레임 시각까지 반영한 현재 상태(디코딩 스레드가 멈춰 있어도 down으로 보임)"""
+        now = time.monotonic() if now is None else now
+        with self.lock :
+            age = now - self.last_ok
+            if self.state != DOWN and age >= self.stall_timeout :
+                self._set(DOWN, now)
+            elif self.state == STREAMING and age >= self.degraded_after :
+                self._set(DEGRADED, now)
+            return self.state
+
+    def _set(self, state : str, now : float) :
+        """lock 안에서 호출 : 상태가 바뀔 때만 전환 횟수 기록"""
+        if state == self.state :
+            return
+        print(f'[{self.camera_id}] 스트림 상태 {self.state} -> {state}')
+        self.state = state
+        self.state_since = now
+        self.transitions[state] += 1
+        metrics.inc("camera_stream_transitions_total", camera=self.camera_id, state=state)
+
+    def get_status(self) :
+        now = time.monotonic()
+        state = self.current_state(now)
+        with self.lock :
+            return {
+                "state" : state,
+                "state_seconds" : round(now - self.state_since, 1),
+                "last_frame_age_seconds" : round(now - self.last_ok, 1),
+                "transitions" : dict(self.transitions),
+                **self.stats
+            }
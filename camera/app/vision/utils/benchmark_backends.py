@@ -0,0 +1,133 @@
+import argparse
+import json
+import os
+import time
+import cv2
+import numpy as np
+from vision.model_registry import PERSON_MODEL_PATH, LOST_ITEM_MODEL_PATH
+from vision.utils.detectors import load_detector
+
+# -----------------------------
+# 추론 백엔드 지연시간 비교 리포트
+# 실행(camera/app 에서) :
+#   python -m vision.utils.benchmark_backends --source sample.mp4 --frames 100
+#   python -m vision.utils.benchmark_backends --backends torch,onnx,openvino --json report.json
+# - 같은 프레임으로 백엔드별 1장당 추론 시간(p50 / p95 / 평균)을 측정
+# - torch 결과 대비 bbox 일치율(IoU >= 0.5)도 같이 출력해서 결과가 같은지 확인
+# -----------------------------
+
+MODELS = {
+    "person" : (PERSON_MODEL_PATH, {"imgsz" : 768, "conf" : 0.2, "iou" : 0.3, "classes" : [0]}),
+    "lost_item" : (LOST_ITEM_MODEL_PATH, {}),
+}
+
+def load_frames(source, count) :
+    """이미지 폴더 / 영상 파일 / RTSP 에서 프레임 로드, source가 없으면 임의 프레임"""
+    if not source :
+        rng = np.random.default_rng(0)
+        return [rng.integers(0, 255, (1080, 1920, 3), dtype=np.uint8) for _ in range(count)]
+
+    if os.path.isdir(source) :
+        names = sorted(n for n in os.listdir(source) if n.lower().endswith((".jpg", ".jpeg", ".png")))
+        frames = [cv2.imread(os.path.join(source, n)) for n in names[:count]]
+        return [f for f in frames if f is not None]
+
+    cap = cv2.VideoCapture(0 if source.isdigit() else source)
+    frames = []
+    while len(frames) < count :
+        ret, frame = cap.read()
+        if not ret :
+            break
+        frames.append(frame)
+    cap.release()
+    return frames
+
+def box_iou(a, b) :
+    """(N, 4) x (M, 4) IoU 행렬"""
+    if len(a) == 0 or len(b) == 0 :
+        return np.zeros((len(a), len(b)), dtype=np.float32)
+    x1 = np.maximum(a[:, None, 0], b[None, :, 0])
+    y1 = np.maximum(a[:, None, 1], b[None, :, 1])
+    x2 = np.minimum(a[:, None, 2], b[None, :, 2])
+    y2 = np.minimum(a[:, None, 3], b[None, :, 3])
+    inter = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+    area_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+    area_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    return inter / (area_a[:, None] + area_b[None, :] - inter + 1e-9)
+
+def match_rate(reference, boxes, threshold : float = 0.5) :
+    """기준 bbox 중 IoU threshold 이상으로 대응되는 bbox가 있는 비율"""
+    if len(reference) == 0 :
+        return 1.0 if len(boxes) == 0 else 0.0
+    return float((box_iou(reference, boxes).max(axis=1, initial=0) >= threshold).mean())
+
+def run_backend(pt_path, backend, frames, kwargs, warmup) :
+    """백엔드 1개 측정 : (프레임별 지연시간 ms, 프레임별 (N, 6) [x1, y1, x2, y2, conf, cls])"""
+    model = load_detector(pt_path, backend)
+    for frame in frames[:warmup] :
+        model(frame, verbose=False, **kwargs)
+
+    latencies, outputs = [], []
+    for frame in frames :
+        started = time.perf_counter()
+        result = model(frame, verbose=False, **kwargs)[0]
+        latencies.append((time.perf_counter() - started) * 1000)
+        outputs.append(result.boxes.data.cpu().numpy())
+    return np.array(latencies), outputs
+
+def summarize(latencies, outputs, reference, baseline_ms) :
+    p50 = float(np.percentile(latencies, 50))
+    summary = {
+        "p50_ms" : round(p50, 2),
+        "p95_ms" : round(float(np.percentile(latencies, 95)), 2),
+        "mean_ms" : round(float(latencies.mean()), 2),
+        "fps" : round(1000 / p50, 1) if p50 else None,
+        "speedup_vs_torch" : round(baseline_ms / p50, 2) if baseline_ms and p50 else None,
+    }
+    if reference is not None :
+        summary["box_agreement"] = round(float(np.mean([match_rate(r[:, :4], o[:, :4])
+                                                         for r, o in zip(reference, outputs)])), 3)
+    return summary
+
+def main() :
+    parser = argparse.ArgumentParser(description="detector backend latency report")
+    parser.add_argument("--source", default="", help="이미지 폴더 / 영상 파일 / RTSP (없으면 임의 프레임)")
+    parser.add_argument("--frames", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--models", default="person,lost_item")
+    parser.add_argument("--backends", default="torch,onnx,openvino")
+    parser.add_argument("--json", default="", help="결과 저장 경로")
+    args = parser.parse_args()
+
+    frames = load_frames(args.source, args.frames)
+    if not frames :
+        raise RuntimeError(f"프레임을 읽을 수 없습니다 : {args.source}")
+    print(f"frames : {len(frames)} ({frames[0].shape[1]}x{frames[0].shape[0]})")
+
+    report = {}
+    for name in args.models.split(",") :
+        pt_path, kwargs = MODELS[name]
+        report[name] = {}
+        reference, baseline_ms = None, None
+
+        # torch를 먼저 돌려서 기준값으로 사용
+        backends = sorted(args.backends.split(","), key=lambda b : b != "torch")
+        for backend in backends :
+            latencies, outputs = run_backend(pt_path, backend, frames, kwargs, args.warmup)
+            if backend == "torch" :
+                reference, baseline_ms = outputs, float(np.percentile(latencies, 50))
+            report[name][backend] = summarize(latencies, outputs, reference if backend != "torch" else None, baseline_ms)
+
+        print(f"\n[{name}] {pt_path}")
+        print(f"{'backend':<10}{'p50(ms)':>10}{'p95(ms)':>10}{'mean(ms)':>10}{'fps':>8}{'speedup':>9}{'agree':>8}")
+        for backend, s in report[name].items() :
+            print(f"{backend:<10}{s['p50_ms']:>10}{s['p95_ms']:>10}{s['mean_ms']:>10}{s['fps']:>8}"
+                  f"{str(s['speedup_vs_torch']):>9}{str(s.get('box_agreement', '-')):>8}")
+
+    if args.json :
+        with open(args.json, "w", encoding="utf-8") as f :
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"[OK] saved -> {args.json}")
+
+if __name__ == "__main__":
+    main()
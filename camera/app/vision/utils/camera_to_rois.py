@@ -7,6 +7,8 @@ from datetime import datetime
 # 설정
 # -----------------------------
 OUTPUT_JSON = "camera_config.generated.json"
+# 캡처한 프레임은 INT8 보정용으로도 저장(quantize_detectors.py와 같은 vision/models/calib)
+CALIB_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "models", "calib")
 WINDOW_NAME = "ROI Labeler (drag to draw)"
 FONT = cv2.FONT_HERSHEY_SIMPLEX
 
@@ -158,6 +160,11 @@ def main():
         cap.release()
         cv2.destroyWindow("Capture")
 
+        # 캡처 프레임을 INT8 보정 데이터로 저장
+        calib_dir = os.path.join(CALIB_DIR, camera_id)
+        os.makedirs(calib_dir, exist_ok=True)
+        cv2.imwrite(os.path.join(calib_dir, datetime.now().strftime("%Y%m%d_%H%M%S") + ".jpg"), frame)
+
     h, w = frame.shape[:2]
     param = {"img": frame, "w": w, "h": h, "mode": mode}
 
@@ -1,30 +1,76 @@
 import cv2
+import os
+import numpy as np
+from ultralytics import YOLO
 
-def detect_person_boxes(model, frame) :
-    """ 사람 감지만 하고 BBOX만 리턴"""
-    results = model(frame, imgsz=768, conf=0.2, iou=0.3)[0]
+# 추론 백엔드 : torch(.pt 그대로) | onnx(ONNX Runtime) | openvino(OpenVINO IR)
+#             | onnx_int8 / openvino_int8(INT8 양자화, vision.utils.quantize_detectors 로 생성)
+DETECTOR_BACKENDS = ("torch", "onnx", "openvino", "onnx_int8", "openvino_int8")
+INT8_BACKENDS = ("onnx_int8", "openvino_int8")
 
-    boxes = []
-    for box in results.boxes :
-        if int(box.cls[0]) == 0:
-            x1, y1, x2, y2 = box.xyxy[0].tolist()
-            boxes.append((x1,y1,x2,y2))
+def exported_model_path(pt_path, backend) :
+    """ .pt 옆에 캐시되는 변환 모델 경로"""
+    stem = os.path.splitext(pt_path)[0]
+    if backend == "onnx" :
+        return f"{stem}.onnx"
+    if backend == "openvino" :
+        return f"{stem}_openvino_model"
+    if backend == "onnx_int8" :
+        return f"{stem}_int8.onnx"
+    if backend == "openvino_int8" :
+        return f"{stem}_int8_openvino_model"
+    return pt_path
+
+def load_detector(pt_path, backend="torch") :
+    """ 백엔드에 맞는 YOLO 모델 로드(처음 한 번만 변환해서 .pt 옆에 저장)"""
+    if backend not in DETECTOR_BACKENDS :
+        raise ValueError(f"지원하지 않는 detector backend : {backend}")
+
+    if backend == "torch" :
+        return YOLO(pt_path)
+
+    path = exported_model_path(pt_path, backend)
+
+    # INT8은 보정(calibration) 프레임이 필요해서 자동 변환하지 않음
+    if backend in INT8_BACKENDS :
+        if not os.path.exists(path) :
+            raise FileNotFoundError(f"{path} 없음 : python -m vision.utils.quantize_detectors build 로 먼저 생성하세요.")
+        return YOLO(path, task="detect")
 
-    return boxes
+    if not os.path.exists(path) :
+        print(f"[detectors] {pt_path} -> {backend} 변환 중...")
+        # 배치 크기 / imgsz(ROI 크롭)가 바뀌므로 dynamic shape로 변환
+        path = YOLO(pt_path).export(format=backend, dynamic=True)
 
-def detect_loss_items(model, frame) :
-    """ 유실물 감지하는 함수"""
-    results = model(frame)[0]
+    return YOLO(path, task="detect")
 
-    items = []
-    for box in results.boxes :
-        cls_id = int(box.cls[0])
-        name = model.names[cls_id]
+def detect_person_boxes_batch(model, frames, imgsz=768) :
+    """ 여러 카메라 프레임(또는 ROI 크롭)을 한 번에 추론하고 프레임별 사람 BBOX 배열((K, 4) float32) 리턴"""
+    if not frames :
+        return []
 
-        x1, y1, x2, y2 = box.xyxy[0].tolist()
-        items.append({
-            "name" : name,
-            "box" : (x1, y1, x2, y2)
-        })
+    # 사람(class 0)만 추론 단계에서 필터링
+    results = model(frames, imgsz=imgsz, conf=0.2, iou=0.3, classes=[0], verbose=False)
+
+    return [result.boxes.xyxy.cpu().numpy().astype(np.float32, copy=False) for result in results]
+
+def detect_loss_items_batch(model, frames) :
+    """ 여러 좌석 크롭을 한 번에 추론하고 크롭별 유실물 목록 리턴"""
+    if not frames :
+        return []
+
+    results = model(frames, verbose=False)
+
+    batch = []
+    for result in results :
+        items = []
+        for box in result.boxes :
+            cls_id = int(box.cls[0])
+            x1, y1, x2, y2 = box.xyxy[0].tolist()
+            items.append({
+                "name" : model.names[cls_id],
+                "box" : (x1, y1, x2, y2)
+            })
+        batch.append(items)
 
-    return items
\ No newline at end of file
+    return batch
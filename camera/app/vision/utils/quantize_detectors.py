@@ -0,0 +1,277 @@
+import argparse
+import json
+import os
+import time
+import cv2
+import numpy as np
+from ultralytics import YOLO
+from vision.camera_initializer import CONFIG_PATH, load_camera_config
+from vision.model_registry import MODELS_DIR, PERSON_MODEL_PATH, LOST_ITEM_MODEL_PATH
+from vision.occupancy_engine import OccupancyEngine
+from vision.utils.benchmark_backends import box_iou, run_backend
+from vision.utils.detectors import exported_model_path, load_detector
+
+# -----------------------------
+# INT8 양자화(PTQ) 도구
+# 실행(camera/app 에서) :
+#   1) 보정 프레임 수집 : python -m vision.utils.quantize_detectors collect --per-camera 200
+#   2) INT8 모델 생성   : python -m vision.utils.quantize_detectors build --backends onnx_int8,openvino_int8
+#   3) 정확도/지연 비교 : python -m vision.utils.quantize_detectors report --json int8_report.json
+# - 보정 프레임은 우리 카메라 영상(camera_config.json의 source, camera_to_rois.py 캡처)에서 샘플링
+# - 리포트 : FP32 대비 mAP50 / 좌석 점유 판정 일치율 / 프레임당 지연시간
+# - 생성된 모델은 camera_config.json의 "detector_backend" : "onnx_int8" | "openvino_int8" 로 사용
+# -----------------------------
+
+CALIB_DIR = os.path.join(MODELS_DIR, "calib")
+HOLDOUT = 5   # 프레임 5장 중 1장은 보정에 쓰지 않고 리포트용으로 남김
+
+MODELS = {
+    "person" : (PERSON_MODEL_PATH, {"imgsz" : 768, "conf" : 0.2, "iou" : 0.3, "classes" : [0]}),
+    "lost_item" : (LOST_ITEM_MODEL_PATH, {}),
+}
+
+# -----------------------------
+# 1) 보정 프레임 수집
+# -----------------------------
+def collect(per_camera, interval) :
+    """camera_config.json 의 카메라마다 interval 초 간격으로 프레임 저장"""
+    for cam in load_camera_config(CONFIG_PATH) :
+        source = cam["source"]
+        cap = cv2.VideoCapture(int(source) if str(source).isdigit() else source)
+        if not cap.isOpened() :
+            print(f"[SKIP] {cam['camera_id']} 열기 실패 : {source}")
+            continue
+
+        out_dir = os.path.join(CALIB_DIR, cam["camera_id"])
+        os.makedirs(out_dir, exist_ok=True)
+
+        saved, last = 0, 0.0
+        while saved < per_camera :
+            ret, frame = cap.read()
+            if not ret :
+                break
+            now = time.monotonic()
+            if now - last < interval :
+                continue
+            last = now
+            cv2.imwrite(os.path.join(out_dir, f"{int(time.time() * 1000)}.jpg"), frame)
+            saved += 1
+        cap.release()
+        print(f"[OK] {cam['camera_id']} : {saved} frames -> {out_dir}")
+
+def calibration_images() :
+    """보정용 / 리포트용 이미지 경로 분리"""
+    paths = []
+    for root, _, names in os.walk(CALIB_DIR) :
+        paths += [os.path.join(root, n) for n in names if n.lower().endswith((".jpg", ".jpeg", ".png"))]
+    paths.sort()
+    calib = [p for i, p in enumerate(paths) if i % HOLDOUT != 0]
+    holdout = [p for i, p in enumerate(paths) if i % HOLDOUT == 0]
+    return calib, holdout
+
+# -----------------------------
+# 2) INT8 모델 생성
+# -----------------------------
+def letterbox(frame, imgsz) :
+    """YOLO 입력 형태(1, 3, imgsz, imgsz) float32 로 변환"""
+    h, w = frame.shape[:2]
+    ratio = imgsz / max(h, w)
+    nh, nw = int(round(h * ratio)), int(round(w * ratio))
+    canvas = np.full((imgsz, imgsz, 3), 114, dtype=np.uint8)
+    top, left = (imgsz - nh) // 2, (imgsz - nw) // 2
+    canvas[top:top + nh, left:left + nw] = cv2.resize(frame, (nw, nh), interpolation=cv2.INTER_LINEAR)
+    blob = cv2.cvtColor(canvas, cv2.COLOR_BGR2RGB).transpose(2, 0, 1)[None].astype(np.float32) / 255.0
+    return np.ascontiguousarray(blob)
+
+def build_onnx_int8(pt_path, calib_paths, imgsz) :
+    """FP32 ONNX -> ONNX Runtime 정적 양자화(QDQ)"""
+    from onnxruntime import InferenceSession
+    from onnxruntime.quantization import CalibrationDataReader, QuantFormat, QuantType, quantize_static
+
+    fp32_path = exported_model_path(pt_path, "onnx")
+    load_detector(pt_path, "onnx")   # FP32 ONNX가 없으면 변환
+    input_name = InferenceSession(fp32_path, providers=["CPUExecutionProvider"]).get_inputs()[0].name
+
+    class FrameReader(CalibrationDataReader) :
+        def __init__(self) :
+            self.paths = iter(calib_paths)
+
+        def get_next(self) :
+            for path in self.paths :
+                frame = cv2.imread(path)
+                if frame is not None :
+                    return {input_name : letterbox(frame, imgsz)}
+            return None
+
+    out_path = exported_model_path(pt_path, "onnx_int8")
+    quantize_static(fp32_path, out_path, FrameReader(),
+                    quant_format=QuantFormat.QDQ,
+                    activation_type=QuantType.QUInt8,
+                    weight_type=QuantType.QInt8,
+                    per_channel=True)
+    return out_path
+
+def build_openvino_int8(pt_path, calib_paths, imgsz) :
+    """Ultralytics OpenVINO export(int8=True) : NNCF 보정에 수집한 프레임 사용"""
+    # 라벨 없이 이미지 목록만 있는 데이터셋 yaml 생성
+    list_path = os.path.abspath(os.path.join(CALIB_DIR, "calib.txt"))
+    with open(list_path, "w", encoding="utf-8") as f :
+        f.write("\n".join(os.path.abspath(p) for p in calib_paths))
+
+    names = YOLO(pt_path).names
+    yaml_path = os.path.join(CALIB_DIR, "calib.yaml")
+    with open(yaml_path, "w", encoding="utf-8") as f :
+        f.write(f"train: {list_path}\nval: {list_path}\nnames:\n")
+        f.writelines(f"  {k}: {v}\n" for k, v in names.items())
+
+    return YOLO(pt_path).export(format="openvino", int8=True, data=yaml_path,
+                                imgsz=imgsz, dynamic=True, fraction=1.0)
+
+def build(models, backends) :
+    calib_paths, _ = calibration_images()
+    if not calib_paths :
+        raise RuntimeError(f"보정 프레임이 없습니다 : {CALIB_DIR} (collect 먼저 실행)")
+
+    for name in models :
+        pt_path, kwargs = MODELS[name]
+        imgsz = kwargs.get("imgsz", 640)
+        for backend in backends :
+            if backend == "onnx_int8" :
+                path = build_onnx_int8(pt_path, calib_paths, imgsz)
+            elif backend == "openvino_int8" :
+                path = build_openvino_int8(pt_path, calib_paths, imgsz)
+            else :
+                raise ValueError(f"INT8 backend 아님 : {backend}")
+            print(f"[OK] {name} {backend} -> {path}")
+
+# -----------------------------
+# 3) FP32 대비 리포트
+# -----------------------------
+def average_precision(references, predictions, threshold : float = 0.5) :
+    """FP32 결과를 정답으로 보고 INT8 결과의 mAP50 계산(클래스별 AP 평균)"""
+    classes = {int(c) for ref in references for c in ref[:, 5]}
+    if not classes :
+        return 1.0
+
+    aps = []
+    for cls in classes :
+        scores, hits, total = [], [], 0
+        for ref, pred in zip(references, predictions) :
+            gt = ref[ref[:, 5] == cls, :4]
+            pr = pred[pred[:, 5] == cls]
+            pr = pr[np.argsort(-pr[:, 4])]
+            total += len(gt)
+
+            matched = np.zeros(len(gt), dtype=bool)
+            ious = box_iou(pr[:, :4], gt)
+            for i in range(len(pr)) :
+                scores.append(pr[i, 4])
+                j = int(ious[i].argmax()) if len(gt) else -1
+                hit = j >= 0 and ious[i, j] >= threshold and not matched[j]
+                if hit :
+                    matched[j] = True
+                hits.append(hit)
+
+        if total == 0 :
+            continue
+        order = np.argsort(-np.array(scores))
+        tp = np.cumsum(np.array(hits, dtype=np.float64)[order])
+        recall = tp / total
+        precision = tp / np.arange(1, len(tp) + 1)
+        # precision envelope 아래 넓이
+        precision = np.maximum.accumulate(precision[::-1])[::-1] if len(precision) else precision
+        aps.append(float(np.sum(np.diff(np.concatenate([[0.0], recall])) * precision)))
+
+    return float(np.mean(aps)) if aps else 1.0
+
+def occupancy_agreement(references, predictions, frames) :
+    """camera_config.json 좌석 ROI 기준 사람 있음/없음 판정이 FP32와 같은 비율"""
+    cams = load_camera_config(CONFIG_PATH)
+    seat_rois = {seat_id : roi for cam in cams for seat_id, roi in cam["seat_rois"].items()}
+    if not seat_rois :
+        return None
+
+    same, total = 0, 0
+    for ref, pred, frame in zip(references, predictions, frames) :
+        h, w = frame.shape[:2]
+        pixel_rois = {}
+        for seat_id, (x1, y1, x2, y2) in seat_rois.items() :
+            if max(x1, y1, x2, y2) <= 1.0 :
+                x1, y1, x2, y2 = x1 * w, y1 * h, x2 * w, y2 * h
+            pixel_rois[seat_id] = (x1, y1, x2, y2)
+        engine = OccupancyEngine(pixel_rois)
+        ref_inside = engine.overlap(ref[:, :4]).any(axis=1)
+        pred_inside = engine.overlap(pred[:, :4]).any(axis=1)
+        same += int((ref_inside == pred_inside).sum())
+        total += len(ref_inside)
+    return same / total if total else None
+
+def report(models, fp32_backend, backends, warmup, json_path) :
+    _, holdout = calibration_images()
+    frames = [f for f in (cv2.imread(p) for p in holdout) if f is not None]
+    if not frames :
+        raise RuntimeError(f"리포트용 프레임이 없습니다 : {CALIB_DIR}")
+    print(f"holdout frames : {len(frames)}")
+
+    result = {}
+    for name in models :
+        pt_path, kwargs = MODELS[name]
+        ref_latency, references = run_backend(pt_path, fp32_backend, frames, kwargs, warmup)
+        ref_p50 = float(np.percentile(ref_latency, 50))
+        result[name] = {fp32_backend : {"p50_ms" : round(ref_p50, 2),
+                                        "p95_ms" : round(float(np.percentile(ref_latency, 95)), 2)}}
+
+        for backend in backends :
+            latencies, outputs = run_backend(pt_path, backend, frames, kwargs, warmup)
+            p50 = float(np.percentile(latencies, 50))
+            entry = {
+                "p50_ms" : round(p50, 2),
+                "p95_ms" : round(float(np.percentile(latencies, 95)), 2),
+                "speedup" : round(ref_p50 / p50, 2) if p50 else None,
+                "map50_vs_fp32" : round(average_precision(references, outputs), 3),
+            }
+            if name == "person" :
+                agreement = occupancy_agreement(references, outputs, frames)
+                entry["occupancy_agreement"] = round(agreement, 4) if agreement is not None else None
+            result[name][backend] = entry
+
+        print(f"\n[{name}] FP32 = {fp32_backend}")
+        print(f"{'backend':<15}{'p50(ms)':>10}{'p95(ms)':>10}{'speedup':>9}{'mAP50':>8}{'occupancy':>11}")
+        for backend, s in result[name].items() :
+            print(f"{backend:<15}{s['p50_ms']:>10}{s['p95_ms']:>10}{str(s.get('speedup', '-')):>9}"
+                  f"{str(s.get('map50_vs_fp32', '-')):>8}{str(s.get('occupancy_agreement', '-')):>11}")
+
+    if json_path :
+        with open(json_path, "w", encoding="utf-8") as f :
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(f"[OK] saved -> {json_path}")
+
+def main() :
+    parser = argparse.ArgumentParser(description="INT8 detector quantization")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_collect = sub.add_parser("collect", help="카메라에서 보정 프레임 수집")
+    p_collect.add_argument("--per-camera", type=int, default=200)
+    p_collect.add_argument("--interval", type=float, default=1.0, help="저장 간격(초)")
+
+    p_build = sub.add_parser("build", help="INT8 모델 생성")
+    p_build.add_argument("--models", default="person,lost_item")
+    p_build.add_argument("--backends", default="onnx_int8,openvino_int8")
+
+    p_report = sub.add_parser("report", help="FP32 대비 정확도 / 지연시간 리포트")
+    p_report.add_argument("--models", default="person,lost_item")
+    p_report.add_argument("--fp32", default="torch", help="기준 FP32 backend")
+    p_report.add_argument("--backends", default="onnx,onnx_int8,openvino,openvino_int8")
+    p_report.add_argument("--warmup", type=int, default=3)
+    p_report.add_argument("--json", default="")
+
+    args = parser.parse_args()
+    if args.command == "collect" :
+        collect(args.per_camera, args.interval)
+    elif args.command == "build" :
+        build(args.models.split(","), args.backends.split(","))
+    else :
+        report(args.models.split(","), args.fp32, args.backends.split(","), args.warmup, args.json)
+
+if __name__ == "__main__":
+    main()
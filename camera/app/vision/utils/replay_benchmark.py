@@ -0,0 +1,539 @@
+import argparse
+import json
+import math
+import resource
+import threading
+import time
+from datetime import datetime
+import cv2
+import numpy as np
+from vision.camera_initializer import CONFIG_PATH, load_camera_config, load_service_config
+from vision.camera_manager import CameraManager
+from vision.model_registry import model_registry
+from vision.seat_manager import SeatManager
+
+# -----------------------------
+# 오프라인 재생 / 스케일 벤치마크
+# 실행(camera/app 에서) :
+#   python -m vision.utils.replay_benchmark --cameras 4 --seats 8 --duration 60
+#   python -m vision.utils.replay_benchmark --video a.mp4,b.mp4 --seats 6 --backend onnx --json replay.json
+#   python -m vision.utils.replay_benchmark --video a.mp4 --config vision/config/camera_config.json
+# - 실제 카메라 없이 녹화 영상(반복 재생) 또는 합성 프레임을 source로 넣어
+#   CameraManager / CameraWorker / SeatManager를 그대로 실행
+# - N 카메라 x M 좌석, 시나리오대로 입실 / 퇴실 요청
+# - 처리량(분석 프레임/초), 단계별 지연시간(p50 / p95 / p99), CPU / RSS, 좌석별 CHECK_IN / CHECK_OUT 리포트
+# - 합성 프레임 모드(기본)는 YOLO 대신 색 검출기(scripted)로 사람 bbox를 찾음
+#   -> 모델 없이 파이프라인 자체 비용 측정, 시나리오 기준 기대 이벤트 수와 비교 가능
+#   -> --backend torch 등을 주면 합성 프레임도 실제 모델로 추론(지연시간만 의미 있음)
+# - 화면 없이(headless) CPU 전용 리눅스에서 실행 가능
+# -----------------------------
+
+PERSON_COLOR = (0, 0, 255)   # 합성 프레임의 "사람" 색(BGR)
+
+# -----------------------------
+# 재생용 캡처(cv2.VideoCapture 대체)
+# -----------------------------
+class PacedCapture :
+    """fps에 맞춰 프레임을 내보내는 캡처 기본 클래스(FrameGrabber의 cap으로 사용)"""
+    def __init__(self, fps, timer=None) :
+        self.fps = fps
+        self.timer = timer
+        self.next_ts = time.monotonic()
+        self.opened = True
+
+    def _pace(self) :
+        """실제 카메라처럼 다음 프레임 시각까지 대기(밀리면 따라잡지 않고 현재 시각 기준으로)"""
+        now = time.monotonic()
+        if self.next_ts > now :
+            time.sleep(self.next_ts - now)
+        elif now - self.next_ts > 1.0 / self.fps :
+            self.next_ts = now
+        self.next_ts += 1.0 / self.fps
+
+    def read(self, image=None) :
+        self._pace()
+        started = time.perf_counter()
+        ret, frame = self._decode(image)
+        if self.timer is not None :
+            self.timer.record("decode", time.perf_counter() - started)
+        return ret, frame
+
+    def grab(self) :
+        self._pace()
+        return True
+
+    def set(self, prop, value) :
+        return False
+
+    def isOpened(self) :
+        return self.opened
+
+    def release(self) :
+        self.opened = False
+
+class VideoReplayCapture(PacedCapture) :
+    """녹화 영상을 fps에 맞춰 반복 재생"""
+    def __init__(self, path, fps=None, timer=None) :
+        self.cap = cv2.VideoCapture(path)
+        if not self.cap.isOpened() :
+            raise RuntimeError(f"영상을 열 수 없습니다 : {path}")
+        super().__init__(fps or self.cap.get(cv2.CAP_PROP_FPS) or 15.0, timer)
+
+    def _decode(self, image) :
+        ret, frame = self.cap.read(image) if image is not None else self.cap.read()
+        if not ret :
+            # 끝까지 재생하면 처음부터 다시
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = self.cap.read(image) if image is not None else self.cap.read()
+        return ret, frame
+
+    def grab(self) :
+        self._pace()
+        if self.cap.grab() :
+            return True
+        self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+        return self.cap.grab()
+
+    def get(self, prop) :
+        return self.cap.get(prop)
+
+    def release(self) :
+        super().release()
+        self.cap.release()
+
+class SyntheticCapture(PacedCapture) :
+    """고정 배경 + 시나리오에 따라 좌석에 나타나는 사람(단색 사각형) 합성"""
+    def __init__(self, width, height, fps, scene, seed=0, timer=None) :
+        """
+        :param scene: 호출 시 현재 화면에 있어야 할 사람 bbox 목록을 돌려주는 함수
+        """
+        super().__init__(fps, timer)
+        self.width = width
+        self.height = height
+        self.scene = scene
+
+        # 사람 색과 겹치지 않는 흑백 질감 배경
+        rng = np.random.default_rng(seed)
+        noise = rng.integers(60, 180, (height // 8 + 1, width // 8 + 1), dtype=np.uint8)
+        gray = cv2.resize(noise, (width, height), interpolation=cv2.INTER_LINEAR)
+        self.background = cv2.cvtColor(gray, cv2.COLOR_GRAY2BGR)
+
+    def _decode(self, image) :
+        if image is None or image.shape != self.background.shape :
+            image = np.empty_like(self.background)
+        np.copyto(image, self.background)
+        for x1, y1, x2, y2 in self.scene() :
+            cv2.rectangle(image, (x1, y1), (x2, y2), PERSON_COLOR, thickness=-1)
+        return True, image
+
+    def get(self, prop) :
+        if prop == cv2.CAP_PROP_FRAME_WIDTH :
+            return float(self.width)
+        if prop == cv2.CAP_PROP_FRAME_HEIGHT :
+            return float(self.height)
+        if prop == cv2.CAP_PROP_FPS :
+            return float(self.fps)
+        return 0.0
+
+# -----------------------------
+# 합성 프레임용 검출기(YOLO 결과 형태 흉내)
+# -----------------------------
+class _Array :
+    def __init__(self, array) :
+        self.array = array
+
+    def cpu(self) :
+        return self
+
+    def numpy(self) :
+        return self.array
+
+class _Boxes :
+    def __init__(self, xyxy) :
+        self.xyxy = _Array(xyxy)
+
+    def __iter__(self) :
+        # 유실물 감지(detect_loss_items_batch)용 : 검출 결과 없음
+        return iter(())
+
+class _Result :
+    def __init__(self, xyxy) :
+        self.boxes = _Boxes(xyxy)
+
+class ScriptedDetector :
+    """PERSON_COLOR 영역을 사람 bbox로 반환하는 검출기(모델 비용 없이 파이프라인만 측정)"""
+    names = {0 : "person"}
+
+    def __init__(self, detect_people : bool = True, min_area : int = 64) :
+        self.detect_people = detect_people
+        self.min_area = min_area
+
+    def __call__(self, frames, **kwargs) :
+        if isinstance(frames, np.ndarray) :
+            frames = [frames]
+        return [_Result(self._detect(frame)) for frame in frames]
+
+    def _detect(self, frame) :
+        if not self.detect_people :
+            return np.empty((0, 4), dtype=np.float32)
+        mask = cv2.inRange(frame, (0, 0, 200), (60, 60, 255))
+        _, _, stats, _ = cv2.connectedComponentsWithStats(mask)
+        stats = stats[1:]
+        stats = stats[stats[:, 4] >= self.min_area]
+        x, y, w, h = (stats[:, k].astype(np.float32) for k in range(4))
+        return np.stack([x, y, x + w, y + h], axis=1).reshape(-1, 4)
+
+# -----------------------------
+# 측정
+# -----------------------------
+class StageTimer :
+    """단계별 소요 시간 수집"""
+    def __init__(self) :
+        self.samples = {}
+        self.lock = threading.Lock()
+
+    def record(self, stage, seconds) :
+        with self.lock :
+            self.samples.setdefault(stage, []).append(seconds)
+
+    def wrap(self, obj, attr, stage) :
+        """obj.attr 호출 시간을 stage로 기록하도록 인스턴스 메서드 교체"""
+        func = getattr(obj, attr)
+
+        def timed(*args, **kwargs) :
+            started = time.perf_counter()
+            try :
+                return func(*args, **kwargs)
+            finally :
+                self.record(stage, time.perf_counter() - started)
+
+        setattr(obj, attr, timed)
+
+    def summary(self) :
+        with self.lock :
+            samples = {stage : np.array(values) * 1000 for stage, values in self.samples.items()}
+        return {stage : {
+                    "count" : int(len(values)),
+                    "p50_ms" : round(float(np.percentile(values, 50)), 3),
+                    "p95_ms" : round(float(np.percentile(values, 95)), 3),
+                    "p99_ms" : round(float(np.percentile(values, 99)), 3),
+                    "max_ms" : round(float(values.max()), 3),
+                } for stage, values in samples.items() if len(values)}
+
+class TimedModel :
+    """모델 호출(배치 추론) 시간 측정용 래퍼"""
+    def __init__(self, model, timer) :
+        self.model = model
+        self.timer = timer
+
+    def __call__(self, *args, **kwargs) :
+        started = time.perf_counter()
+        try :
+            return self.model(*args, **kwargs)
+        finally :
+            self.timer.record("detect", time.perf_counter() - started)
+
+    def __getattr__(self, name) :
+        return getattr(self.model, name)
+
+class RecordingSeatManager(SeatManager) :
+    """웹서버 전송 대신 좌석별 이벤트 기록"""
+    def __init__(self, camera_manager, timer) :
+        super().__init__(camera_manager)
+        self.timer = timer
+        self.counts = {}
+        self.counts_lock = threading.Lock()
+
+    def push_event(self, event) :
+        with self.counts_lock :
+            seat_counts = self.counts.setdefault(event.seat_id, {})
+            key = event.event_type.value
+            seat_counts[key] = seat_counts.get(key, 0) + 1
+        super().push_event(event)
+
+    def _notify_web(self, event) :
+        # 이벤트 생성 ~ 전송 직전까지(큐 대기 포함)
+        self.timer.record("event_queue", (datetime.now() - event.detected_at).total_seconds())
+
+def rss_mb() :
+    """현재 RSS(MB)"""
+    try :
+        with open("/proc/self/status") as f :
+            for line in f :
+                if line.startswith("VmRSS:") :
+                    return int(line.split()[1]) / 1024
+    except OSError :
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+# -----------------------------
+# 시나리오
+# -----------------------------
+def grid_rois(seats) :
+    """좌석을 격자로 배치한 정규화 ROI 목록(서로 겹치지 않게 여백)"""
+    cols = math.ceil(math.sqrt(seats))
+    rows = math.ceil(seats / cols)
+    rois = []
+    for i in range(seats) :
+        r, c = divmod(i, cols)
+        x1, y1 = c / cols, r / rows
+        w, h = 1 / cols, 1 / rows
+        rois.append((round(x1 + w * 0.1, 4), round(y1 + h * 0.1, 4),
+                     round(x1 + w * 0.9, 4), round(y1 + h * 0.9, 4)))
+    return rois
+
+def seat_plan(duration, rng) :
+    """
+    좌석 1개의 시나리오(초) : 입실 -> 착석 -> 자리 비움 -> 복귀 -> 떠남 -> 퇴실
+    :return: (check_in, check_out, [(착석 시작, 끝), ...])
+    """
+    check_in = rng.uniform(0.0, 0.1) * duration
+    leave = check_in + rng.uniform(0.3, 0.4) * duration
+    back = leave + rng.uniform(0.1, 0.15) * duration
+    present = [(check_in + 0.02 * duration, leave), (back, 0.8 * duration)]
+    return check_in, 0.92 * duration, present
+
+class Scenario :
+    def __init__(self, cameras, duration, seed) :
+        """
+        :param cameras: [{"camera_id", "seat_rois"}, ...]
+        """
+        self.duration = duration
+        self.started = None
+        rng = np.random.default_rng(seed)
+
+        self.plans = {}
+        for cam in cameras :
+            for seat_id in cam["seat_rois"] :
+                self.plans[seat_id] = seat_plan(duration, rng)
+
+    def elapsed(self) :
+        return None if self.started is None else time.monotonic() - self.started
+
+    def scene(self, seat_rois, width, height) :
+        """카메라 1대의 합성 화면 함수 : 지금 착석 중인 좌석 ROI 안쪽에 사람 bbox"""
+        pixel_rois = {seat_id : (x1 * width, y1 * height, x2 * width, y2 * height)
+                      for seat_id, (x1, y1, x2, y2) in seat_rois.items()}
+
+        def boxes() :
+            t = self.elapsed()
+            if t is None :
+                return []
+            result = []
+            for seat_id, (x1, y1, x2, y2) in pixel_rois.items() :
+                if any(start <= t < end for start, end in self.plans[seat_id][2]) :
+                    mx, my = (x2 - x1) * 0.25, (y2 - y1) * 0.25
+                    result.append((int(x1 + mx), int(y1 + my), int(x2 - mx), int(y2 - my)))
+            return result
+
+        return boxes
+
+    def actions(self) :
+        """시간순 (시각, 동작, seat_id, usage_id) 목록"""
+        actions = []
+        for seat_id, (check_in, check_out, _) in self.plans.items() :
+            usage_id = seat_id * 10 + 1
+            actions.append((check_in, "checkin", seat_id, usage_id))
+            actions.append((check_out, "checkout", seat_id, usage_id))
+        return sorted(actions)
+
+    def expected(self, seat_id) :
+        """착석 구간마다 CHECK_IN / CHECK_OUT 1번씩(퇴실 전에 떠나므로)"""
+        present = self.plans[seat_id][2]
+        return {"CHECK_IN" : len(present), "CHECK_OUT" : len(present)}
+
+# -----------------------------
+# 실행
+# -----------------------------
+def build_cameras(args) :
+    """카메라 설정 목록 : --config의 카메라(ROI / 옵션) 또는 격자 ROI로 생성"""
+    if args.config :
+        cameras = load_camera_config(args.config)
+    else :
+        seat_rois = grid_rois(args.seats)
+        cameras = []
+        for c in range(args.cameras) :
+            cameras.append({
+                "camera_id" : f"replay-{c + 1}",
+                "seat_rois" : {c * args.seats + i + 1 : roi for i, roi in enumerate(seat_rois)},
+            })
+
+    for cam in cameras :
+        cam["inference_mode"] = args.inference_mode or cam.get("inference_mode", "full")
+        if args.motion_gate is not None :
+            cam["motion_gate"] = {"enabled" : args.motion_gate == "on"}
+        if args.detect_interval :
+            cam["tracker"] = {"enabled" : True, "detect_interval" : args.detect_interval}
+        cam["detector_backend"] = args.backend or cam.get("detector_backend", "torch")
+    return cameras
+
+def attach_sources(cameras, args, scenario, timer) :
+    videos = [v for v in args.video.split(",") if v]
+    for index, cam in enumerate(cameras) :
+        if videos :
+            cam["source"] = VideoReplayCapture(videos[index % len(videos)], args.fps, timer)
+        else :
+            width, height = map(int, args.size.split("x"))
+            scene = scenario.scene(cam["seat_rois"], width, height)
+            cam["source"] = SyntheticCapture(width, height, args.fps, scene, seed=index, timer=timer)
+
+def instrument(camera_manager, timer) :
+    engine = camera_manager.inference_engine
+    timer.wrap(engine, "_tick", "tick")
+    for backend, model in list(engine.person_models.items()) :
+        engine.person_models[backend] = TimedModel(model, timer)
+
+    for worker in camera_manager.camera_workers.values() :
+        timer.wrap(worker, "take_frame_for_inference", "take_frame")
+        timer.wrap(worker, "needs_inference", "motion_gate")
+        timer.wrap(worker, "inference_regions", "regions")
+        timer.wrap(worker, "on_person_boxes", "occupancy")
+
+def run(args) :
+    timer = StageTimer()
+    cameras = build_cameras(args)
+    scenario = Scenario(cameras, args.duration, args.seed)
+    attach_sources(cameras, args, scenario, timer)
+
+    # 합성 프레임 + scripted : 모델 대신 색 검출기 등록
+    if any(cam["detector_backend"] == "scripted" for cam in cameras) :
+        model_registry.put("person", "scripted", ScriptedDetector())
+        model_registry.put("lost_item", "scripted", ScriptedDetector(detect_people=False))
+
+    service_config = load_service_config(args.service_config)
+    seat_manager = RecordingSeatManager(None, timer)
+    camera_manager = CameraManager(cameras, seat_manager,
+                                   inference_config=service_config.get("inference"),
+                                   governor_config=service_config.get("governor"),
+                                   occupancy_config=service_config.get("occupancy"),
+                                   stream_config=service_config.get("stream"))
+    seat_manager.camera_manager = camera_manager
+    seat_manager.start()
+    instrument(camera_manager, timer)
+
+    seat_count = sum(len(cam["seat_rois"]) for cam in cameras)
+    print(f"cameras : {len(cameras)}, seats : {seat_count}, duration : {args.duration}s")
+
+    # 시나리오 재생
+    actions = scenario.actions()
+    rss_samples = [rss_mb()]
+    cpu_started, wall_started = time.process_time(), time.monotonic()
+    scenario.started = wall_started
+    while True :
+        elapsed = scenario.elapsed()
+        while actions and actions[0][0] <= elapsed :
+            _, action, seat_id, usage_id = actions.pop(0)
+            if action == "checkin" :
+                seat_manager.handle_web_checkin(seat_id, usage_id)
+            elif args.checkout == "release" :
+                seat_manager.handle_web_release(seat_id, usage_id)
+            else :
+                seat_manager.handle_web_checkout(seat_id, usage_id)
+
+        if elapsed >= args.duration :
+            break
+        rss_samples.append(rss_mb())
+        next_at = actions[0][0] if actions else args.duration
+        time.sleep(min(1.0, max(0.01, next_at - elapsed)))
+
+    wall = time.monotonic() - wall_started
+    cpu = time.process_time() - cpu_started
+
+    engine = camera_manager.inference_engine
+    engine.stop()
+    for worker in camera_manager.camera_workers.values() :
+        worker.grabber.stop()
+
+    return build_report(args, cameras, scenario, camera_manager, seat_manager, timer, wall, cpu, rss_samples)
+
+def build_report(args, cameras, scenario, camera_manager, seat_manager, timer, wall, cpu, rss_samples) :
+    engine_stats = camera_manager.inference_engine.stats
+    stages = timer.summary()
+    taken = stages.get("motion_gate", {}).get("count", 0)
+
+    synthetic = not args.video
+    seats = {}
+    for cam in cameras :
+        for seat_id in cam["seat_rois"] :
+            counts = dict(seat_manager.counts.get(seat_id, {}))
+            if synthetic :
+                counts["expected"] = scenario.expected(seat_id)
+            seats[seat_id] = counts
+
+    report = {
+        "cameras" : len(cameras),
+        "seats" : sum(len(cam["seat_rois"]) for cam in cameras),
+        "duration_s" : round(wall, 2),
+        "throughput" : {
+            "frames_taken_per_s" : round(taken / wall, 2),
+            "frames_inferred_per_s" : round(engine_stats["frames"] / wall, 2),
+            "images_per_s" : round(engine_stats["images"] / wall, 2),
+            "batches" : engine_stats["batches"],
+        },
+        "stages" : stages,
+        "resources" : {
+            "cpu_cores_used" : round(cpu / wall, 2),
+            "rss_mb_mean" : round(float(np.mean(rss_samples)), 1),
+            "rss_mb_max" : round(float(np.max(rss_samples)), 1),
+        },
+        "governor" : camera_manager.governor.get_status(),
+        "trackers" : {cam_id : worker.tracker.get_status() for cam_id, worker in camera_manager.camera_workers.items()
+                      if worker.tracker is not None},
+        "seat_events" : seats,
+    }
+    if synthetic :
+        report["mismatched_seats"] = sorted(seat_id for seat_id, counts in seats.items()
+                                            if any(counts.get(k, 0) != v for k, v in counts["expected"].items()))
+    return report
+
+def print_report(report) :
+    print(f"\nthroughput : {report['throughput']}")
+    print(f"resources  : {report['resources']}")
+    print(f"\n{'stage':<14}{'count':>8}{'p50(ms)':>10}{'p95(ms)':>10}{'p99(ms)':>10}{'max(ms)':>10}")
+    for stage, s in sorted(report["stages"].items()) :
+        print(f"{stage:<14}{s['count']:>8}{s['p50_ms']:>10}{s['p95_ms']:>10}{s['p99_ms']:>10}{s['max_ms']:>10}")
+
+    print(f"\n{'seat':<8}{'CHECK_IN':>10}{'CHECK_OUT':>11}{'LOST_ITEM':>11}{'expected':>12}")
+    for seat_id, counts in report["seat_events"].items() :
+        expected = counts.get("expected")
+        expected = f"{expected['CHECK_IN']}/{expected['CHECK_OUT']}" if expected else "-"
+        print(f"{seat_id:<8}{counts.get('CHECK_IN', 0):>10}{counts.get('CHECK_OUT', 0):>11}"
+              f"{counts.get('LOST_ITEM', 0):>11}{expected:>12}")
+    if "mismatched_seats" in report :
+        print(f"\nmismatched seats : {report['mismatched_seats'] or '없음'}")
+
+def main() :
+    parser = argparse.ArgumentParser(description="camera pipeline replay / scale benchmark")
+    parser.add_argument("--video", default="", help="녹화 영상 경로(쉼표 구분, 카메라 수보다 적으면 반복 사용), 없으면 합성 프레임")
+    parser.add_argument("--config", default="", help="카메라 / 좌석 ROI를 가져올 camera_config.json(없으면 격자 ROI 생성)")
+    parser.add_argument("--service-config", default=CONFIG_PATH, help="inference / governor 설정")
+    parser.add_argument("--cameras", type=int, default=2)
+    parser.add_argument("--seats", type=int, default=6, help="카메라당 좌석 수")
+    parser.add_argument("--duration", type=float, default=60.0, help="시나리오 길이(초)")
+    parser.add_argument("--fps", type=float, default=15.0, help="재생 fps(영상은 0이면 원본 fps)")
+    parser.add_argument("--size", default="1280x720", help="합성 프레임 크기")
+    parser.add_argument("--backend", default="", help="scripted | torch | onnx | openvino ... (합성 프레임 기본 scripted)")
+    parser.add_argument("--inference-mode", default="", help="full | roi_union | roi_tiles")
+    parser.add_argument("--motion-gate", choices=["on", "off"], default=None)
+    parser.add_argument("--detect-interval", type=int, default=0, help="사람 추적기 사용 시 감지 주기(프레임), 0이면 추적기 없음")
+    parser.add_argument("--checkout", choices=["checkout", "release"], default="checkout",
+                        help="퇴실 방식 : checkout(유실물 검사) | release(자동 퇴실)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", default="", help="결과 저장 경로")
+    args = parser.parse_args()
+
+    if not args.backend and not args.video :
+        args.backend = "scripted"
+    if args.video and args.backend == "scripted" :
+        parser.error("scripted 검출기는 합성 프레임에서만 사용할 수 있습니다.")
+
+    report = run(args)
+    print_report(report)
+
+    if args.json :
+        with open(args.json, "w", encoding="utf-8") as f :
+            json.dump(report, f, ensure_ascii=False, indent=2, default=str)
+        print(f"[OK] saved -> {args.json}")
+
+if __name__ == "__main__":
+    main()
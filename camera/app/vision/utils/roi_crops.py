@@ -0,0 +1,74 @@
+import math
+import numpy as np
+
+##########################################################################
+# ROI 크롭 영역 계산
+# - 감지 중인 좌석 ROI들만 포함하는 영역(union / tile)을 구해서 그 부분만 추론
+# - 좌석 ROI 밖으로 걸친 사람도 잡을 수 있도록 margin만큼 확장
+# - 크롭 크기에 맞춰 imgsz를 줄여서 전체 프레임과 같은 해상도 비율로 추론
+##########################################################################
+
+def _expand(roi, margin, width, height) :
+    """ROI를 가로/세로 margin 비율만큼 확장하고 프레임 안으로 자름"""
+    x1, y1, x2, y2 = roi
+    mx = (x2 - x1) * margin
+    my = (y2 - y1) * margin
+    return (max(0, int(x1 - mx)), max(0, int(y1 - my)),
+            min(width, int(math.ceil(x2 + mx))), min(height, int(math.ceil(y2 + my))))
+
+def _area(region) :
+    x1, y1, x2, y2 = region
+    return max(0, x2 - x1) * max(0, y2 - y1)
+
+def _merge(a, b) :
+    return (min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3]))
+
+def union_region(rois, frame_shape, margin : float = 0.2) :
+    """모든 ROI를 감싸는 영역 1개"""
+    height, width = frame_shape[:2]
+    regions = [_expand(roi, margin, width, height) for roi in rois]
+    if not regions :
+        return []
+
+    region = regions[0]
+    for other in regions[1:] :
+        region = _merge(region, other)
+    return [region]
+
+def tile_regions(rois, frame_shape, margin : float = 0.2, merge_ratio : float = 1.3) :
+    """
+    가까운 ROI끼리 묶은 영역 여러 개
+    :param merge_ratio: 합친 영역 넓이가 두 영역 넓이 합의 merge_ratio배 이하이면 합침
+    """
+    height, width = frame_shape[:2]
+    regions = [_expand(roi, margin, width, height) for roi in rois]
+
+    # 더 이상 합칠 수 없을 때까지 가장 이득이 큰 쌍부터 합침
+    while len(regions) > 1 :
+        best = None
+        for i in range(len(regions)) :
+            for j in range(i + 1, len(regions)) :
+                merged = _merge(regions[i], regions[j])
+                waste = _area(merged) - merge_ratio * (_area(regions[i]) + _area(regions[j]))
+                if waste <= 0 and (best is None or waste < best[0]) :
+                    best = (waste, i, j, merged)
+        if best is None :
+            break
+
+        _, i, j, merged = best
+        regions = [r for k, r in enumerate(regions) if k not in (i, j)] + [merged]
+
+    return regions
+
+def crop_imgsz(region, frame_shape, base_imgsz : int = 768, min_imgsz : int = 160) :
+    """전체 프레임을 base_imgsz로 줄이는 비율 그대로 크롭의 imgsz 계산(32 배수)"""
+    height, width = frame_shape[:2]
+    x1, y1, x2, y2 = region
+    scale = max(x2 - x1, y2 - y1) / max(width, height)
+    imgsz = int(math.ceil(base_imgsz * scale / 32)) * 32
+    return max(min_imgsz, min(base_imgsz, imgsz))
+
+def offset_boxes(boxes, region) :
+    """크롭 좌표계 bbox 배열((K, 4))을 전체 프레임 좌표로 변환"""
+    ox, oy = region[0], region[1]
+    return np.asarray(boxes, dtype=np.float32).reshape(-1, 4) + np.array([ox, oy, ox, oy], dtype=np.float32)
@@ -0,0 +1,30 @@
+from vision.camera_manager import diff_camera_configs
+
+def cam(cam_id, seat_rois, **options) :
+    return {"camera_id" : cam_id, "source" : f'rtsp://{cam_id}', "seat_rois" : seat_rois, **options}
+
+def configs(*cams) :
+    return {cfg["camera_id"] : cfg for cfg in cams}
+
+def test_no_change() :
+    old = configs(cam("cam-1", {1 : (0, 0, 1, 1)}))
+    assert not any(diff_camera_configs(old, configs(cam("cam-1", {1 : (0, 0, 1, 1)}))).values())
+
+def test_added_and_removed() :
+    old = configs(cam("cam-1", {1 : (0, 0, 1, 1)}))
+    new = configs(cam("cam-2", {2 : (0, 0, 1, 1)}))
+    assert diff_camera_configs(old, new) == {"added" : ["cam-2"], "removed" : ["cam-1"],
+                                             "restarted" : [], "rois_updated" : []}
+
+def test_roi_only_change_does_not_restart() :
+    old = configs(cam("cam-1", {1 : (0, 0, 1, 1)}), cam("cam-2", {2 : (0, 0, 1, 1)}))
+    new = configs(cam("cam-1", {1 : (0, 0, 0.5, 1), 3 : (0.5, 0, 1, 1)}), cam("cam-2", {2 : (0, 0, 1, 1)}))
+    assert diff_camera_configs(old, new)["rois_updated"] == ["cam-1"]
+    assert diff_camera_configs(old, new)["restarted"] == []
+
+def test_other_option_change_restarts() :
+    old = configs(cam("cam-1", {1 : (0, 0, 1, 1)}))
+    new = configs(cam("cam-1", {1 : (0, 0, 0.5, 1)}, inference_mode="roi_tiles"))
+    summary = diff_camera_configs(old, new)
+    assert summary["restarted"] == ["cam-1"]
+    assert summary["rois_updated"] == []
@@ -0,0 +1,67 @@
+import time
+from vision.event_outbox import EventOutbox
+
+class FakeDelivery :
+    """EventDelivery 대신 전송 요청만 기록"""
+    def __init__(self) :
+        self.submitted = []
+        self.on_delivered = None
+        self.on_dropped = None
+
+    def start(self) :
+        pass
+
+    def submit(self, payload) :
+        self.submitted.append(payload)
+
+def wait_until(condition, timeout = 5.0) :
+    deadline = time.monotonic() + timeout
+    while not condition() :
+        assert time.monotonic() < deadline, "timeout"
+        time.sleep(0.01)
+
+def start_outbox(path) :
+    delivery = FakeDelivery()
+    outbox = EventOutbox(delivery, path=str(path), commit_interval=0.01)
+    outbox.start()
+    return outbox, delivery
+
+def test_append_commits_then_submits_with_event_id(tmp_path) :
+    outbox, delivery = start_outbox(tmp_path / "outbox.db")
+    for usage_id in (1, 2) :
+        outbox.append({"seat_id" : 10, "usage_id" : usage_id, "minutes" : 5})
+
+    wait_until(lambda : len(delivery.submitted) == 2)
+    event_ids = [payload["event_id"] for payload in delivery.submitted]
+    assert event_ids[0].startswith(f'1:{outbox.epoch}:')
+    assert event_ids[1].startswith(f'2:{outbox.epoch}:')
+    assert outbox.stats["backlog"] == 2
+
+def test_acked_events_are_not_replayed(tmp_path) :
+    path = tmp_path / "outbox.db"
+    outbox, delivery = start_outbox(path)
+    for usage_id in (1, 2, 3) :
+        outbox.append({"seat_id" : 10, "usage_id" : usage_id, "minutes" : 5})
+    wait_until(lambda : len(delivery.submitted) == 3)
+
+    # 웹서버가 받은 이벤트는 전송기가 on_delivered로 알려줌
+    delivery.on_delivered(delivery.submitted[:2])
+    wait_until(lambda : outbox.stats["backlog"] == 1)
+
+    # 재시작 : 남은 이벤트만 같은 event_id로 다시 전송(웹서버가 중복 반영을 막을 수 있도록)
+    restarted, redelivery = start_outbox(path)
+    assert restarted.epoch == outbox.epoch
+    assert redelivery.submitted == [delivery.submitted[2]]
+    assert restarted.stats["replayed"] == 1
+
+def test_dropped_events_redelivered_later(tmp_path) :
+    delivery = FakeDelivery()
+    outbox = EventOutbox(delivery, path=str(tmp_path / "outbox.db"), commit_interval=0.01, redeliver_delay=0.05)
+    outbox.start()
+    outbox.append({"seat_id" : 10, "usage_id" : 1, "minutes" : 5})
+    wait_until(lambda : len(delivery.submitted) == 1)
+
+    delivery.on_dropped(delivery.submitted[:1])
+    wait_until(lambda : len(delivery.submitted) == 2)
+    assert delivery.submitted[1] == delivery.submitted[0]
+    assert outbox.stats["redelivered"] == 1
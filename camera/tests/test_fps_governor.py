@@ -0,0 +1,40 @@
+from vision.fps_governor import FpsGovernor
+
+def make_governor(**kwargs) :
+    config = {"min_fps" : 1.0, "max_fps" : 5.0, "pending_boost" : 2.0, "cpu_target" : 0.7, "cpu_count" : 4}
+    config.update(kwargs)
+    return FpsGovernor(**config)
+
+def test_pending_boost_applies_at_full_scale() :
+    governor = make_governor(pending_max_fps=10.0)
+    governor.record("cam1", 0.01, 0.0, pending=False)
+    assert governor.target_fps["cam1"] == 5.0
+
+    governor.record("cam1", 0.01, 0.2, pending=True)
+    assert governor.target_fps["cam1"] == 10.0
+
+    governor.record("cam1", 0.01, 0.3, pending=False)
+    assert governor.target_fps["cam1"] == 5.0
+
+def test_pending_boost_limited_by_pending_max_fps() :
+    governor = make_governor(pending_boost=4.0, pending_max_fps=8.0)
+    governor.record("cam1", 0.01, 0.0, pending=True)
+    assert governor.target_fps["cam1"] == 8.0
+
+def test_pending_max_fps_defaults_to_boosted_max_fps() :
+    governor = make_governor()
+    assert governor.pending_max_fps == 10.0
+
+def test_pending_boost_over_cost_cap() :
+    # CPU 예산(0.7 * 4코어) / 추론 1초 = 2.8fps까지만 평상시 분석
+    governor = make_governor(pending_max_fps=10.0)
+    governor.record("cam1", 1.0, 0.0, pending=False)
+    assert abs(governor.target_fps["cam1"] - 2.8) < 1e-6
+
+    governor.record("cam1", 1.0, 1.0, pending=True)
+    assert abs(governor.target_fps["cam1"] - 5.6) < 1e-6
+
+def test_min_fps_when_cost_exceeds_budget() :
+    governor = make_governor()
+    governor.record("cam1", 10.0, 0.0, pending=False)
+    assert governor.target_fps["cam1"] == 1.0
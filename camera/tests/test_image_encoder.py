@@ -0,0 +1,52 @@
+import numpy as np
+from vision.image_encoder import ImageEncoder
+
+def scene() :
+    y, x = np.mgrid[0:240, 0:320]
+    return np.stack([(x * 0.6) % 256, (y * 0.9) % 256, ((x + y) * 0.3) % 256], axis=-1).astype(np.uint8)
+
+def noisy(image, seed, amplitude=3) :
+    # 프레임마다 다른 센서 노이즈(±amplitude)
+    noise = np.random.default_rng(seed).integers(-amplitude, amplitude + 1, image.shape)
+    return np.clip(image.astype(np.int16) + noise, 0, 255).astype(np.uint8)
+
+def test_identical_crop_is_deduplicated() :
+    encoder = ImageEncoder()
+    image = scene()
+    assert encoder._encode(image, "cam-1") == encoder._encode(image.copy(), "cam-1")
+    assert encoder.stats["encoded"] == 1
+    assert encoder.stats["deduplicated"] == 1
+
+def test_noisy_crops_of_same_scene_reuse_jpeg() :
+    encoder = ImageEncoder()
+    first = encoder._encode(noisy(scene(), seed=1), "cam-1")
+    second = encoder._encode(noisy(scene(), seed=2), "cam-1")
+
+    # 픽셀이 달라 URL key는 다르지만 JPEG는 한 번만 인코딩해서 같이 사용
+    assert first != second
+    assert encoder.get(first) is encoder.get(second)
+    assert encoder.stats["encoded"] == 1
+    assert encoder.stats["reused_similar"] == 1
+
+def test_small_new_item_is_encoded_again() :
+    encoder = ImageEncoder()
+    encoder._encode(noisy(scene(), seed=1), "cam-1")
+    with_item = scene()
+    with_item[100:108, 150:158] = 20
+    encoder._encode(noisy(with_item, seed=2), "cam-1")
+    assert encoder.stats["encoded"] == 2
+    assert encoder.stats["reused_similar"] == 0
+
+def test_reuse_similar_disabled_encodes_every_crop() :
+    encoder = ImageEncoder(reuse_similar=False)
+    encoder._encode(noisy(scene(), seed=1), "cam-1")
+    encoder._encode(noisy(scene(), seed=2), "cam-1")
+    assert encoder.stats["encoded"] == 2
+
+def test_evicted_image_is_not_reused() :
+    encoder = ImageEncoder(max_images=1)
+    encoder._encode(noisy(scene(), seed=1), "cam-1")
+    encoder._encode(np.zeros((240, 320, 3), dtype=np.uint8), "cam-1")
+    encoder._encode(noisy(scene(), seed=2), "cam-1")
+    assert encoder.stats["encoded"] == 3
+    assert encoder.similar.keys() <= encoder.images.keys()
@@ -0,0 +1,22 @@
+from vision.metrics import MetricsRegistry
+
+def test_label_values_are_escaped() :
+    registry = MetricsRegistry()
+    registry.inc("camera_events_total", camera='lobby "A"\\1\nB')
+
+    text = registry.render({"camera_shard_up" : [({"shard" : "0"}, 1)]})
+    assert 'camera_events_total{camera="lobby \\"A\\"\\\\1\\nB"} 1' in text
+    assert 'camera_shard_up{shard="0"} 1' in text
+    # 라벨 값의 줄바꿈이 sample을 두 줄로 나누지 않음
+    assert all(line.startswith(("#", "camera_")) for line in text.splitlines())
+
+def test_histogram_buckets_are_cumulative() :
+    registry = MetricsRegistry()
+    for value in (0.002, 0.02, 2.0) :
+        registry.observe("camera_stage_seconds", value, buckets=(0.01, 0.1, 1.0), stage="decode")
+
+    text = registry.render()
+    assert 'camera_stage_seconds_bucket{le="0.01",stage="decode"} 1' in text
+    assert 'camera_stage_seconds_bucket{le="1.0",stage="decode"} 2' in text
+    assert 'camera_stage_seconds_bucket{le="+Inf",stage="decode"} 3' in text
+    assert 'camera_stage_seconds_count{stage="decode"} 3' in text
@@ -0,0 +1,42 @@
+import numpy as np
+from vision.motion_gate import MotionGate
+
+LEFT = (0, 0, 320, 480)
+RIGHT = (320, 0, 640, 480)
+
+def frame(left = 0, right = 0) :
+    image = np.zeros((480, 640, 3), dtype=np.uint8)
+    image[:, :320] = left
+    image[:, 320:] = right
+    return image
+
+def test_first_frame_infers_every_seat() :
+    gate = MotionGate(threshold=6.0, refresh_interval=5.0)
+    assert gate.select(frame(), [1, 2], [LEFT, RIGHT], 0.0) == {1, 2}
+
+def test_only_changed_rois_are_inferred() :
+    gate = MotionGate(threshold=6.0, refresh_interval=5.0)
+    gate.select(frame(), [1, 2], [LEFT, RIGHT], 0.0)
+
+    assert gate.select(frame(left=3), [1, 2], [LEFT, RIGHT], 0.1) == set()
+    assert gate.select(frame(left=3, right=100), [1, 2], [LEFT, RIGHT], 0.2) == {2}
+    assert gate.get_status()["frames_skipped"] == 1
+
+def test_slow_change_accumulates_against_reference() :
+    gate = MotionGate(threshold=6.0, refresh_interval=100.0)
+    gate.select(frame(), [1], [LEFT], 0.0)
+
+    # 프레임마다 조금씩 밝아져도 마지막으로 추론한 화면과 비교하므로 결국 감지
+    selected = [gate.select(frame(left=level), [1], [LEFT], level * 0.1) for level in range(1, 10)]
+    assert selected[:6] == [set()] * 6
+    assert {1} in selected
+
+def test_refresh_interval_and_forced_seats() :
+    gate = MotionGate(threshold=6.0, refresh_interval=5.0)
+    gate.select(frame(), [1, 2], [LEFT, RIGHT], 0.0)
+
+    assert gate.select(frame(), [1, 2], [LEFT, RIGHT], 1.0, forced=(2,)) == {2}
+    assert gate.select(frame(), [1, 2], [LEFT, RIGHT], 5.0) == {1}
+
+    gate.forget(2)
+    assert gate.select(frame(), [1, 2], [LEFT, RIGHT], 5.5) == {2}
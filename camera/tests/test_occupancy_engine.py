@@ -0,0 +1,75 @@
+import pytest
+from vision.occupancy_engine import OccupancyEngine
+from vision.schemas.schemas import SeatEventType
+
+ROI = (100, 100, 300, 300)
+PERSON = [[150, 120, 250, 400]]
+
+def run(engine, fps, start, end, present) :
+    """start ~ end초를 fps로 분석 : present(t)가 True면 좌석 안에 사람 bbox, [(t, event_type)]"""
+    active = engine.mask([1])
+    events = []
+    frame = 0
+    while True :
+        t = start + frame / fps
+        if t >= end :
+            return events
+        boxes = PERSON if present(t) else []
+        events += [(t, event.event_type) for event in engine.update(boxes, active, timestamp=t)]
+        frame += 1
+
+@pytest.mark.parametrize("fps", [0.5, 30.0])
+def test_dwell_checks_in_and_out_after_dwell_seconds(fps) :
+    engine = OccupancyEngine({1 : ROI}, dwell_seconds=3.0, min_ratio=0.8)
+
+    events = run(engine, fps, 0.0, 10.0, lambda t : True)
+    assert [event for _, event in events] == [SeatEventType.CHECK_IN]
+    # 첫 결과부터 3초가 지난 첫 프레임에서 판정
+    assert 3.0 <= events[0][0] < 3.0 + 1 / fps + 1e-9
+
+    events = run(engine, fps, 10.0, 20.0, lambda t : False)
+    assert [event for _, event in events] == [SeatEventType.CHECK_OUT]
+    assert 13.0 <= events[0][0] < 13.0 + 1 / fps + 1e-9
+
+@pytest.mark.parametrize("fps", [0.5, 30.0])
+def test_dwell_cancelled_when_person_leaves_early(fps) :
+    engine = OccupancyEngine({1 : ROI}, dwell_seconds=3.0, min_ratio=0.8)
+    active = engine.mask([1])
+
+    # 1.5초만 앉았다가 떠남 : 허용 시간(0.6초)보다 오래 비어 있으면 판정 취소
+    events = run(engine, fps, 0.0, 1.5, lambda t : True)
+    assert events == []
+    assert engine.has_pending(active)
+
+    events = run(engine, fps, 2.0, 10.0, lambda t : False)
+    assert events == []
+    assert not engine.has_pending(active)
+    assert engine.state(1) == "EMPTY"
+
+@pytest.mark.parametrize("fps", [0.5, 30.0])
+def test_dwell_restarts_stale_judgement(fps) :
+    # 허용 시간 2.5초 : 2초 간격으로 있다 / 없다가 반복되어도 취소되지 않음
+    engine = OccupancyEngine({1 : ROI}, dwell_seconds=10.0, min_ratio=0.75)
+    active = engine.mask([1])
+
+    # 12초 동안 절반만 앉아 있음 : 10초가 지나도 비율(0.75) 미달 -> 판정하지 않고 12초부터 다시 판정
+    events = run(engine, fps, 0.0, 12.0, lambda t : int(t / 2 + 1e-9) % 2 == 0)
+    assert events == []
+    assert engine.has_pending(active)
+
+    events = run(engine, fps, 12.0, 30.0, lambda t : True)
+    assert [event for _, event in events] == [SeatEventType.CHECK_IN]
+    assert 22.0 <= events[0][0] < 22.0 + 1 / fps + 1e-9
+
+def test_frame_threshold_without_dwell() :
+    engine = OccupancyEngine({1 : ROI}, threshold=3)
+    active = engine.mask([1])
+
+    assert engine.update(PERSON, active, timestamp=0.0) == []
+    assert engine.update([], active, timestamp=0.1) == []
+    assert engine.counter(1) == 0
+
+    for i in range(2) :
+        assert engine.update(PERSON, active, timestamp=0.2 + i) == []
+    events = engine.update(PERSON, active, timestamp=5.0)
+    assert [event.event_type for event in events] == [SeatEventType.CHECK_IN]
@@ -0,0 +1,63 @@
+import numpy as np
+from vision.person_tracker import PersonTracker
+
+def walking_box(t, speed=100.0) :
+    """x 방향으로 speed px/s로 걷는 사람 bbox"""
+    x = 100 + speed * t
+    return [x, 100, x + 80, 300]
+
+def test_detection_runs_every_interval() :
+    tracker = PersonTracker(detect_interval=3, max_coast=1.0)
+    assert tracker.detection_due(0.0)
+    tracker.update([walking_box(0.0)], 0.0)
+    assert not tracker.detection_due(0.1)
+    tracker.predict(0.1)
+    assert not tracker.detection_due(0.2)
+    tracker.predict(0.2)
+    assert tracker.detection_due(0.3)
+
+def test_detection_due_after_max_coast() :
+    tracker = PersonTracker(detect_interval=100, max_coast=1.0)
+    tracker.update([walking_box(0.0)], 0.0)
+    assert not tracker.detection_due(0.5)
+    assert tracker.detection_due(1.0)
+
+def test_missed_detection_coasts_then_expires() :
+    tracker = PersonTracker(detect_interval=1, max_coast=1.0)
+    for i in range(5) :
+        tracker.update([[100, 100, 180, 300]], i * 0.1)
+
+    # 잠깐 감지 누락 : 예측 bbox 유지
+    boxes = tracker.update([], 0.6)
+    assert len(boxes) == 1
+    np.testing.assert_allclose(boxes[0], [100, 100, 180, 300], atol=2.0)
+
+    # max_coast가 지나면 삭제
+    assert len(tracker.update([], 1.5)) == 0
+    assert tracker.tracks == []
+
+def test_matched_track_keeps_id() :
+    tracker = PersonTracker(detect_interval=1)
+    for i in range(10) :
+        tracker.update([walking_box(i * 0.1)], i * 0.1)
+    assert len(tracker.tracks) == 1
+    assert tracker.stats["tracks_created"] == 1
+
+def test_track_outside_regions_stops_and_expires() :
+    tracker = PersonTracker(detect_interval=1, max_coast=1.0)
+    for i in range(10) :
+        tracker.update([walking_box(i * 0.1)], i * 0.1)
+    last = tracker.tracks[0].box()
+
+    # 사람이 추론 영역 밖으로 나감 : 예측 bbox가 속도대로 계속 움직이지 않아야 함
+    regions = [(1000, 0, 1200, 400)]
+    boxes = tracker.update([], 1.0, regions)
+    assert len(boxes) == 1
+    np.testing.assert_allclose(boxes[0], last, atol=1e-3)
+    boxes = tracker.predict(1.5)
+    np.testing.assert_allclose(boxes[0], last, atol=1e-3)
+
+    # 마지막 감지 후 max_coast가 지나면 삭제(영역 밖이어도)
+    for i in range(11, 100) :
+        tracker.update([], i * 0.1, regions)
+    assert tracker.tracks == []
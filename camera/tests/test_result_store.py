@@ -0,0 +1,55 @@
+import asyncio
+import threading
+import time
+from vision.result_store import ResultStore
+
+def done(value) :
+    return value.get("done") is True
+
+def test_wait_returns_as_soon_as_result_is_done() :
+    store = ResultStore()
+    store.put(1, {"done" : False})
+
+    def finish() :
+        time.sleep(0.1)
+        store.put(1, {"done" : True, "items" : ["bag"]})
+
+    threading.Thread(target=finish).start()
+    started = time.monotonic()
+    result = asyncio.run(store.wait(1, done, timeout=5.0))
+    assert result == {"done" : True, "items" : ["bag"]}
+    assert time.monotonic() - started < 2.0
+    assert store.waiters == {}
+
+def test_wait_ignores_results_that_are_not_done() :
+    store = ResultStore()
+
+    async def scenario() :
+        waiting = asyncio.create_task(store.wait(1, done, timeout=5.0))
+        await asyncio.sleep(0.05)
+        store.put(1, {"done" : False})
+        await asyncio.sleep(0.05)
+        assert not waiting.done()
+        store.put(1, {"done" : True})
+        return await waiting
+
+    assert asyncio.run(scenario()) == {"done" : True}
+
+def test_wait_timeout_returns_last_result() :
+    store = ResultStore()
+    store.put(1, {"done" : False})
+    assert asyncio.run(store.wait(1, done, timeout=0.1)) == {"done" : False}
+    assert asyncio.run(store.wait(2, done, timeout=0.1)) is None
+    assert store.waiters == {}
+
+def test_ttl_and_max_size() :
+    store = ResultStore(ttl=0.1, max_size=2)
+    for key in range(3) :
+        store.put(key, key)
+    assert store.get(0) is None
+    assert store.get(2) == 2
+    assert store.stats["evicted"] == 1
+
+    time.sleep(0.15)
+    assert store.get(2) is None
+    assert store.stats["expired"] == 2
@@ -0,0 +1,30 @@
+import numpy as np
+from vision.utils.roi_crops import crop_imgsz, offset_boxes, tile_regions, union_region
+
+FRAME = (720, 1280, 3)
+
+def test_union_region_covers_rois_with_margin() :
+    rois = [(100, 100, 200, 200), (400, 300, 500, 400)]
+    assert union_region(rois, FRAME, margin=0.2) == [(80, 80, 520, 420)]
+    assert union_region([], FRAME) == []
+
+def test_regions_clipped_to_frame() :
+    assert union_region([(0, 0, 100, 100)], FRAME, margin=0.5) == [(0, 0, 150, 150)]
+    assert union_region([(1200, 650, 1280, 720)], FRAME, margin=0.5) == [(1160, 615, 1280, 720)]
+
+def test_tile_regions_merges_neighbours_only() :
+    rois = [(100, 100, 200, 200), (210, 100, 310, 200), (1000, 500, 1100, 600)]
+    regions = tile_regions(rois, FRAME, margin=0.0)
+    assert sorted(regions) == [(100, 100, 310, 200), (1000, 500, 1100, 600)]
+
+def test_crop_imgsz_keeps_full_frame_scale() :
+    assert crop_imgsz((0, 0, 1280, 720), FRAME, base_imgsz=768) == 768
+    assert crop_imgsz((0, 0, 640, 360), FRAME, base_imgsz=768) == 384
+    # 32 배수로 올림, 최소 min_imgsz
+    assert crop_imgsz((0, 0, 300, 100), FRAME, base_imgsz=768) == 192
+    assert crop_imgsz((0, 0, 10, 10), FRAME, base_imgsz=768, min_imgsz=160) == 160
+
+def test_offset_boxes_to_frame_coordinates() :
+    boxes = offset_boxes([[10, 20, 30, 40]], (100, 200, 500, 600))
+    assert boxes.tolist() == [[110, 220, 130, 240]]
+    assert offset_boxes(np.empty((0, 4)), (100, 200, 500, 600)).shape == (0, 4)
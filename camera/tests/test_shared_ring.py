@@ -0,0 +1,38 @@
+import queue
+import numpy as np
+from vision.shared_ring import SharedRing
+
+def make_ring(slots=3) :
+    return SharedRing(queue.Queue(), slots=slots, slot_bytes=64)
+
+def test_write_read_release() :
+    ring = make_ring()
+    try :
+        image = np.arange(12, dtype=np.uint8).reshape(3, 4)
+        slot, shape, dtype = ring.write(image)
+        assert (ring.read(slot, shape, dtype) == image).all()
+        assert ring.free.qsize() == 2
+        ring.release(slot)
+        assert ring.free.qsize() == 3
+    finally :
+        ring.close()
+
+def test_write_fails_without_free_slot() :
+    ring = make_ring(slots=1)
+    try :
+        assert ring.write(np.zeros(4, dtype=np.uint8)) is not None
+        assert ring.write(np.zeros(4, dtype=np.uint8), timeout=0.01) is None
+    finally :
+        ring.close()
+
+def test_reset_reclaims_slots_taken_by_dead_writer() :
+    ring = make_ring()
+    try :
+        # 슬롯을 꺼내고 반납하지 못한 채 죽은 프로세스
+        ring.write(np.zeros(4, dtype=np.uint8))
+        ring.write(np.zeros(4, dtype=np.uint8))
+        ring.reset(queue.Queue())
+        assert sorted(ring.free.get_nowait() for _ in range(3)) == [0, 1, 2]
+        assert ring.free.empty()
+    finally :
+        ring.close()